@@ -0,0 +1,84 @@
+"""
+Benchmarks the CSV engines of `common_utils.load_csv_data`.
+
+A synthetic WaveMatrix export is written to a temporary directory: the five
+channels of the 'wavematrix' profile plus a number of unused channels, as in a
+wide 1 kHz export. Each engine then loads it with the profile's column
+sources, and the best wall-clock time of several repeats is reported.
+
+Usage:
+    python benchmarks/benchmark_csv_engines.py [--rows N] [--extra-channels N] [--repeats N]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from matmech import common_utils, config_defaults
+
+
+def write_synthetic_wavematrix_file(
+    file_path: str, rows: int, extra_channels: int, chunk_rows: int = 1_000_000
+) -> None:
+    """Writes a synthetic WaveMatrix CSV export sampled at 1 kHz, in chunks."""
+    rng = np.random.default_rng(0)
+    sources = config_defaults.SOFTWARE_PROFILES["wavematrix"]["column_sources"]
+    for start in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - start)
+        t = (start + np.arange(n)) / 1000.0
+        data: Dict[str, np.ndarray] = {
+            sources["time"]["raw_col"]: t,
+            sources["position"]["raw_col"]: 0.01 * t,
+            sources["force"]["raw_col"]: 5.0 * np.sin(0.1 * t) + rng.normal(0, 0.01, n),
+            sources["rotation"]["raw_col"]: 0.5 * t,
+            sources["torque"]["raw_col"]: 2.0 * np.sin(0.05 * t) + rng.normal(0, 0.01, n),
+        }
+        for i in range(extra_channels):
+            data[f"Aux {i + 1} (V)"] = rng.normal(0, 1, n)
+        pd.DataFrame(data).to_csv(
+            file_path, mode="w" if start == 0 else "a", header=start == 0,
+            index=False, float_format="%.6g",
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--extra-channels", type=int, default=15)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
+    sources = config_defaults.SOFTWARE_PROFILES["wavematrix"]["column_sources"]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "synthetic_wavematrix.csv")
+        print(f"Writing {args.rows:,} rows x {5 + args.extra_channels} channels...")
+        write_synthetic_wavematrix_file(file_path, args.rows, args.extra_channels)
+        print(f"File size: {os.path.getsize(file_path) / 1024**2:,.1f} MB\n")
+
+        print(f"{'engine':<16}{'best time (s)':>14}{'rows/s':>16}")
+        for engine in common_utils.CSV_ENGINES:
+            resolved = common_utils.resolve_csv_engine(engine)
+            if resolved != engine:
+                print(f"{engine:<16}{'skipped (not installed)':>30}")
+                continue
+            timings = []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                df = common_utils.load_csv_data(file_path, column_sources=sources, engine=engine)
+                timings.append(time.perf_counter() - start)
+                assert len(df) == args.rows
+                del df
+            best = min(timings)
+            print(f"{engine:<16}{best:>14.2f}{args.rows / best:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
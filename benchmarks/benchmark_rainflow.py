@@ -0,0 +1,83 @@
+"""
+Benchmarks the stages of `rainflow` counting on a long variable-amplitude history.
+
+A synthetic load history is generated: a 1 Hz sine sampled at 1 kHz whose
+amplitude drifts slowly, plus random noise, as in a variable-amplitude fatigue
+test. Reversal extraction, cycle counting and histogram binning are timed
+separately (best of several repeats). For reference, the sequential stack
+kernel alone is timed on the first reversals and extrapolated to all of them;
+this is the cost of counting without the vectorized passes.
+
+Usage:
+    python benchmarks/benchmark_rainflow.py [--samples N] [--reference-reversals N] [--repeats N]
+"""
+
+import argparse
+import time
+from typing import Callable, Tuple
+
+import numpy as np
+
+from matmech import rainflow
+from matmech.cyclic_analysis import find_turning_points
+
+
+def synthetic_load_history(samples: int) -> np.ndarray:
+    """Returns a variable-amplitude force history (N) sampled at 1 kHz."""
+    rng = np.random.default_rng(0)
+    t = np.arange(samples) / 1000.0
+    amplitude = 1000.0 * (1.0 + 0.5 * np.sin(2 * np.pi * t / 600.0))
+    return amplitude * np.sin(2 * np.pi * t) + rng.normal(0, 50.0, samples)
+
+
+def best_time(func: Callable[[], object], repeats: int) -> Tuple[float, object]:
+    """Returns the best wall-clock time of `repeats` calls and the last result."""
+    timings, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=10_000_000)
+    parser.add_argument("--reference-reversals", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Generating {args.samples:,} samples...")
+    force = synthetic_load_history(args.samples)
+    hysteresis = 0.01 * float(force.max() - force.min())
+    kernel = rainflow._stack_kernel()
+    kernel_name = "numba" if kernel is not rainflow._four_point_stack else "pure Python"
+    kernel(np.zeros(4))  # Compile outside the timings
+
+    t_reversals, turning = best_time(lambda: find_turning_points(force, hysteresis), args.repeats)
+    reversals = force[turning]
+    t_count, (ranges, means, counts) = best_time(
+        lambda: rainflow.count_cycles(reversals), args.repeats
+    )
+    t_histogram, _ = best_time(
+        lambda: rainflow.rainflow_histogram(ranges, means, counts), args.repeats
+    )
+
+    print(f"{len(reversals):,} reversals, {counts.sum():,.1f} cycles\n")
+    print(f"{'stage':<28}{'best time (s)':>14}")
+    print(f"{'reversal extraction':<28}{t_reversals:>14.3f}")
+    print(f"{'cycle counting':<28}{t_count:>14.3f}")
+    print(f"{'histogram':<28}{t_histogram:>14.3f}")
+    print(f"{'total':<28}{t_reversals + t_count + t_histogram:>14.3f}\n")
+
+    subset = reversals[: args.reference_reversals]
+    t_reference, _ = best_time(lambda: kernel(subset), 1)
+    estimate = t_reference * len(reversals) / max(len(subset), 1)
+    print(
+        f"Sequential {kernel_name} kernel only: {t_reference:.3f} s for {len(subset):,} "
+        f"reversals (~{estimate:.1f} s for all)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,21 @@ __version__ = "1.0.0"
 It includes modules for:
 
 It includes modules for:
-- `workflow`: Orchestrates the entire data analysis process.
+- `workflow`: Orchestrates the entire data analysis process, for one file or a batch.
 - `common_utils`: General utility functions like data loading and splitting.
 - `axial_analysis`: Functions for calculating axial material properties.
 - `torsional_analysis`: Functions for calculating torsional material properties.
+- `cyclic_analysis`: Cycle detection and per-cycle metrics for cyclic phases.
+- `rainflow`: Rainflow cycle counting of variable-amplitude load histories.
 - `plotting_tools`: Functions for generating static and animated plots.
+- `linear_fit`: Prefix-sum line fits over x-windows of a curve.
 - `config_defaults`: Default configurations and registries for software profiles,
   data columns, and plot settings.
+- `data_cache`: On-disk cache of standardized data.
+- `data_quality`: Spike and dropout detection and repair.
+- `signal_processing`: Zero-phase channel filtering and decimation.
+- `resampling`: Interpolation onto uniform time and strain grids.
+- `event_detection`: Automatic detection of phase end times.
+- `batch_analysis`: Vectorized analysis of many specimens at once and lot mean curves.
+- `property_extraction`: Scalar mechanical properties of each analyzed phase.
 """
@@ -1,77 +1,325 @@
 """
 This module provides functions for calculating axial material properties
-such as axial stress and axial strain from raw force and displacement data.
+such as axial stress and axial strain from raw force and displacement data,
+and optionally the tangent and secant modulus along the curve and the true
+stress and true strain up to the onset of necking.
+
+`compute_axial_properties` works on column arrays and writes the derived
+columns into new or preallocated arrays without copying its input;
+`calculate_axial_properties` wraps it for DataFrames.
 """
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Mapping, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from matmech import linear_fit, signal_processing
+from matmech.common_utils import attach_columns, output_buffer
 from matmech.constants import (
     AXIAL_STRAIN_COL,
     AXIAL_STRESS_MPA_COL,
     AXIAL_STRESS_PA_COL,
     FORCE_COL,
     POSITION_COL,
+    SECANT_MODULUS_COL,
+    TANGENT_MODULUS_COL,
+    TRUE_STRAIN_COL,
+    TRUE_STRESS_COL,
 )
 
+# The relative drop of the engineering stress below its maximum that bounds the
+# plateau over which the maximum (the onset of necking) is located.
+NECKING_PLATEAU_FRACTION = 0.002
+
 
-def calculate_axial_properties(df: pd.DataFrame, geometry: Dict[str, Any]) -> pd.DataFrame:
+def axial_cross_sectional_area_m2(geometry: Dict[str, Any]) -> Optional[float]:
     """
-    Calculates and adds Axial Stress and/or Axial Strain columns to the DataFrame.
+    Returns the cross-sectional area used for axial stress.
 
     Args:
-        df (pd.DataFrame): The input DataFrame containing 'Force (N)' and 'Displacement (mm)'.
-        geometry (Dict[str, Any]): A dictionary containing geometry parameters,
-                                   e.g., 'axial_width_mm', 'axial_thickness_mm', 'gauge_length_mm'.
+        geometry (Dict[str, Any]): A dictionary containing 'axial_width_mm' and
+                                   'axial_thickness_mm'.
 
     Returns:
-        pd.DataFrame: The DataFrame with 'Axial Stress (Pa)', 'Axial Stress (MPa)',
-                      and/or 'Axial Strain' columns added.
+        Optional[float]: The area in m², or None (with a logged reason) if it is
+                         missing from the geometry or zero.
     """
-    df_processed = df.copy()
-
-    # Calculate Axial Stress
     try:
         width_m = geometry["axial_width_mm"] / 1000.0
         thickness_m = geometry["axial_thickness_mm"] / 1000.0
-        cross_sectional_area_m2 = width_m * thickness_m
-
-        if cross_sectional_area_m2 == 0:
-            logging.error("Cross-sectional area is zero, cannot calculate axial stress.")
-        else:
-            df_processed[AXIAL_STRESS_PA_COL] = df_processed[
-                FORCE_COL
-            ] / cross_sectional_area_m2
-            df_processed[AXIAL_STRESS_MPA_COL] = (
-                df_processed[AXIAL_STRESS_PA_COL] / 1e6
-            )
-            logging.info("Axial stress calculated.")
     except KeyError:
         logging.warning(
             "Could not calculate axial stress. Required keys 'axial_width_mm' or "
             "'axial_thickness_mm' missing from geometry."
         )
+        return None
+
+    cross_sectional_area_m2 = width_m * thickness_m
+    if cross_sectional_area_m2 == 0:
+        logging.error("Cross-sectional area is zero, cannot calculate axial stress.")
+        return None
+    return cross_sectional_area_m2
+
+
+def axial_gauge_length_mm(geometry: Dict[str, Any]) -> Optional[float]:
+    """
+    Returns the gauge length used for axial strain.
+
+    Args:
+        geometry (Dict[str, Any]): A dictionary containing 'gauge_length_mm'.
+
+    Returns:
+        Optional[float]: The gauge length in mm, or None (with a logged reason) if
+                         it is missing from the geometry or zero.
+    """
+    try:
+        gauge_length_mm = geometry["gauge_length_mm"]
+    except KeyError:
+        logging.warning(
+            "Could not calculate axial strain from displacement. 'gauge_length_mm' "
+            "missing from geometry."
+        )
+        return None
+
+    if gauge_length_mm == 0:
+        logging.error("Gauge length is zero, cannot calculate axial strain.")
+        return None
+    return gauge_length_mm
+
+
+def compute_axial_properties(
+    columns: Mapping[str, Any],
+    geometry: Dict[str, Any],
+    out: Optional[Dict[str, np.ndarray]] = None,
+    modulus_window: Optional[int] = None,
+    true_stress_strain: bool = False,
+    necking_window: int = 25,
+) -> Dict[str, np.ndarray]:
+    """
+    Computes Axial Stress and/or Axial Strain arrays from force and displacement.
+
+    If `modulus_window` is set, the Tangent Modulus (the local slope of stress
+    over strain, from a least-squares fit over `modulus_window` samples around
+    each sample) and the Secant Modulus (stress / strain) are computed as well.
+    If `true_stress_strain` is set, the True Stress and True Strain are computed
+    up to the onset of necking (see `find_necking_onset`) and are NaN after it.
+
+    The inputs are only read. Each derived column is written exactly once, into
+    the matching array of `out` if one is provided, or into a new array.
+
+    Args:
+        columns (Mapping[str, Any]): The input columns by standard name, e.g. a
+                                     DataFrame or a dictionary of arrays with
+                                     'Force (N)' and 'Displacement (mm)'.
+        geometry (Dict[str, Any]): A dictionary containing geometry parameters,
+                                   e.g., 'axial_width_mm', 'axial_thickness_mm', 'gauge_length_mm'.
+        out (Optional[Dict[str, np.ndarray]]): Preallocated output arrays keyed by
+                                               derived column name.
+        modulus_window (Optional[int]): The number of samples per tangent modulus
+                                        fit. None skips both modulus columns.
+        true_stress_strain (bool): Whether to compute the true stress and strain columns.
+        necking_window (int): The number of samples of the moving average of the
+                              engineering stress used to detect necking.
+
+    Returns:
+        Dict[str, np.ndarray]: The 'Axial Stress (Pa)', 'Axial Stress (MPa)',
+                               'Axial Strain', 'Tangent Modulus (MPa)',
+                               'Secant Modulus (MPa)', 'True Stress (MPa)' and/or
+                               'True Strain' arrays that could be calculated.
+    """
+    derived: Dict[str, np.ndarray] = {}
+
+    # Calculate Axial Stress
+    cross_sectional_area_m2 = axial_cross_sectional_area_m2(geometry)
+    if cross_sectional_area_m2 is not None:
+        if FORCE_COL not in columns:
+            logging.warning(f"Could not calculate axial stress. '{FORCE_COL}' missing from data.")
+        else:
+            force = np.asarray(columns[FORCE_COL])
+            stress_pa = output_buffer(out, AXIAL_STRESS_PA_COL, force)
+            np.divide(force, cross_sectional_area_m2, out=stress_pa)
+            stress_mpa = output_buffer(out, AXIAL_STRESS_MPA_COL, force)
+            np.divide(stress_pa, 1e6, out=stress_mpa)
+            derived[AXIAL_STRESS_PA_COL] = stress_pa
+            derived[AXIAL_STRESS_MPA_COL] = stress_mpa
+            logging.info("Axial stress calculated.")
 
     # Calculate Axial Strain if not already present
-    if AXIAL_STRAIN_COL not in df_processed.columns:
-        try:
-            gauge_length_m = geometry["gauge_length_mm"] / 1000.0
-            displacement_m = df_processed[POSITION_COL] / 1000.0
-            if gauge_length_m == 0:
-                logging.error("Gauge length is zero, cannot calculate axial strain.")
-            else:
-                df_processed[AXIAL_STRAIN_COL] = (
-                    displacement_m / gauge_length_m
-                )
-                logging.info("Axial strain calculated from displacement.")
-        except KeyError:
+    if AXIAL_STRAIN_COL in columns:
+        logging.info("Using pre-calculated axial strain found in data.")
+    else:
+        gauge_length_mm = axial_gauge_length_mm(geometry)
+        if gauge_length_mm is not None and POSITION_COL not in columns:
             logging.warning(
-                "Could not calculate axial strain from displacement. 'gauge_length_mm' "
-                "missing from geometry."
+                f"Could not calculate axial strain from displacement. '{POSITION_COL}' "
+                "missing from data."
             )
+        elif gauge_length_mm is not None:
+            # Displacement and gauge length are both in mm, so no conversion is needed.
+            displacement_mm = np.asarray(columns[POSITION_COL])
+            strain = output_buffer(out, AXIAL_STRAIN_COL, displacement_mm)
+            np.divide(displacement_mm, gauge_length_mm, out=strain)
+            derived[AXIAL_STRAIN_COL] = strain
+            logging.info("Axial strain calculated from displacement.")
+
+    if modulus_window is not None:
+        derived.update(_compute_moduli(columns, derived, modulus_window, out))
+    if true_stress_strain:
+        derived.update(_compute_true_stress_strain(columns, derived, necking_window, out))
+
+    return derived
+
+
+def _stress_and_strain(
+    columns: Mapping[str, Any], derived: Dict[str, np.ndarray]
+) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """Returns the engineering stress (MPa) and strain, preferring pre-calculated strain."""
+    stress_mpa = derived.get(AXIAL_STRESS_MPA_COL)
+    strain = derived.get(AXIAL_STRAIN_COL)
+    if strain is None and AXIAL_STRAIN_COL in columns:
+        strain = np.asarray(columns[AXIAL_STRAIN_COL])
+    return stress_mpa, strain
+
+
+def _compute_moduli(
+    columns: Mapping[str, Any],
+    derived: Dict[str, np.ndarray],
+    modulus_window: int,
+    out: Optional[Dict[str, np.ndarray]],
+) -> Dict[str, np.ndarray]:
+    """Computes the tangent and secant modulus (MPa) from the stress and strain columns."""
+    stress_mpa, strain = _stress_and_strain(columns, derived)
+    if stress_mpa is None or strain is None:
+        logging.warning("Could not calculate modulus curves. Axial stress or strain is unavailable.")
+        return {}
+
+    tangent = output_buffer(out, TANGENT_MODULUS_COL, stress_mpa)
+    tangent[...] = linear_fit.rolling_slope(strain, stress_mpa, modulus_window)
+    secant = output_buffer(out, SECANT_MODULUS_COL, stress_mpa)
+    secant.fill(np.nan)
+    np.divide(stress_mpa, strain, out=secant, where=strain != 0)
+    logging.info(f"Tangent and secant modulus calculated ({modulus_window}-sample window).")
+    return {TANGENT_MODULUS_COL: tangent, SECANT_MODULUS_COL: secant}
+
+
+def find_necking_onset(
+    true_strain: np.ndarray,
+    stress_mpa: np.ndarray,
+    window: int,
+    plateau_fraction: float = NECKING_PLATEAU_FRACTION,
+) -> Optional[int]:
+    """
+    Finds the onset of necking with the Considère criterion dσ/dε = σ.
+
+    For true stress and strain the criterion is met where the engineering
+    stress (the load) is at its maximum. The engineering stress is smoothed by
+    a moving average over `window` samples, and the plateau around its maximum
+    is taken as the samples within `plateau_fraction` of it (or within four
+    times the noise of the smoothed curve, if that is larger). The maximum is
+    located by a least-squares parabola through the stress over that plateau,
+    which averages the noise of all of its samples instead of picking a noisy
+    extreme. Necking is only detected if the stress falls below the plateau
+    afterwards, so a curve that still hardens at its end has no onset.
+
+    Args:
+        true_strain (np.ndarray): The true strain values, in sample order.
+        stress_mpa (np.ndarray): The engineering stress values, in sample order.
+        window (int): The number of samples of the moving average.
+        plateau_fraction (float): The relative stress drop that bounds the plateau.
+
+    Returns:
+        Optional[int]: The index of the first necked sample, or None if the
+                       stress does not fall after its maximum.
+    """
+    valid = np.flatnonzero(np.isfinite(true_strain) & np.isfinite(stress_mpa))
+    if len(valid) < max(window, 3):
+        return None
+    x, y = true_strain[valid], stress_mpa[valid]
+
+    smooth = signal_processing.moving_average(y, window)
+    top = smooth.max()
+    # The median step between samples estimates the noise of one sample.
+    noise = float(np.median(np.abs(np.diff(y))))
+    drop = max(plateau_fraction * abs(top), 4 * noise / np.sqrt(window))
+    plateau = np.flatnonzero(smooth >= top - drop)
+    first, stop = int(plateau[0]), int(plateau[-1]) + 1
+    if stop >= len(y):
+        return None
+
+    curvature, slope, _ = np.polyfit(x[first:stop], y[first:stop], 2)
+    if curvature < 0:
+        peak_strain = -slope / (2 * curvature)
     else:
-        logging.info("Using pre-calculated axial strain found in data.")
+        peak_strain = x[first + int(np.argmax(smooth[first:stop]))]
+    onset = first + int(np.argmax(x[first:stop + 1] >= peak_strain))
+    return int(valid[onset])
+
+
+def _compute_true_stress_strain(
+    columns: Mapping[str, Any],
+    derived: Dict[str, np.ndarray],
+    necking_window: int,
+    out: Optional[Dict[str, np.ndarray]],
+) -> Dict[str, np.ndarray]:
+    """Computes true stress (MPa) and strain up to necking, with NaN after it."""
+    stress_mpa, strain = _stress_and_strain(columns, derived)
+    if stress_mpa is None or strain is None:
+        logging.warning("Could not calculate true stress and strain. Axial stress or strain is unavailable.")
+        return {}
+
+    # Uniform deformation at constant volume: ε_t = ln(1 + e), σ_t = s (1 + e)
+    true_strain = output_buffer(out, TRUE_STRAIN_COL, stress_mpa)
+    np.log1p(strain, out=true_strain)
+    true_stress = output_buffer(out, TRUE_STRESS_COL, stress_mpa)
+    np.multiply(stress_mpa, 1.0 + strain, out=true_stress)
+
+    onset = find_necking_onset(true_strain, stress_mpa, necking_window)
+    if onset is None:
+        logging.info("True stress and strain calculated; no necking detected.")
+    else:
+        true_strain[onset:] = np.nan
+        true_stress[onset:] = np.nan
+        logging.info(
+            f"True stress and strain calculated up to the onset of necking at "
+            f"engineering strain {strain[onset]:.4g}."
+        )
+    return {TRUE_STRESS_COL: true_stress, TRUE_STRAIN_COL: true_strain}
+
+
+def calculate_axial_properties(
+    df: pd.DataFrame,
+    geometry: Dict[str, Any],
+    modulus_window: Optional[int] = None,
+    true_stress_strain: bool = False,
+    necking_window: int = 25,
+) -> pd.DataFrame:
+    """
+    Calculates and adds Axial Stress and/or Axial Strain columns to the DataFrame.
 
-    return df_processed
+    The returned DataFrame shares the input columns with `df` instead of copying them.
+
+    Args:
+        df (pd.DataFrame): The input DataFrame containing 'Force (N)' and 'Displacement (mm)'.
+        geometry (Dict[str, Any]): A dictionary containing geometry parameters,
+                                   e.g., 'axial_width_mm', 'axial_thickness_mm', 'gauge_length_mm'.
+        modulus_window (Optional[int]): If set, 'Tangent Modulus (MPa)' and
+                                        'Secant Modulus (MPa)' columns are added, with
+                                        the tangent fitted over this many samples.
+        true_stress_strain (bool): If True, 'True Stress (MPa)' and 'True Strain'
+                                   columns are added, up to the onset of necking.
+        necking_window (int): The number of samples of the stress smoothing for necking detection.
+
+    Returns:
+        pd.DataFrame: The DataFrame with 'Axial Stress (Pa)', 'Axial Stress (MPa)',
+                      and/or 'Axial Strain' columns added.
+    """
+    derived = compute_axial_properties(
+        df,
+        geometry,
+        modulus_window=modulus_window,
+        true_stress_strain=true_stress_strain,
+        necking_window=necking_window,
+    )
+    return attach_columns(df, derived)
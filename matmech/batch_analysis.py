@@ -0,0 +1,385 @@
+"""
+This module provides batched analysis of many specimens at once.
+
+A material lot is usually tested as tens to hundreds of coupons that share a
+test recipe but each have their own geometry. Instead of analyzing them one by
+one, `stack_columns` aligns their channels into 2-D arrays (one row per
+specimen, padded with NaN), and `compute_batch_properties` applies the axial
+or torsional formulas to all rows in one broadcast operation. The geometry
+factors come from the same functions the single-specimen analysis uses, so
+both paths give identical results.
+
+`aggregate_curves` summarizes the same curve (e.g. stress vs. strain) of a
+lot: each specimen is resampled onto a shared x grid (`resampling`), and the
+mean, standard deviation and percentile envelopes are reduced over the
+specimen axis of one 2-D array.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from matmech import config_defaults, resampling
+from matmech.axial_analysis import axial_cross_sectional_area_m2, axial_gauge_length_mm
+from matmech.common_utils import attach_columns
+from matmech.constants import (
+    AXIAL_STRAIN_COL,
+    AXIAL_STRESS_MPA_COL,
+    AXIAL_STRESS_PA_COL,
+    BAND_COUNT_COL,
+    BAND_MEAN_COL,
+    BAND_PERCENTILE_COL_FORMAT,
+    BAND_STD_COL,
+    BRANCH_COL,
+    FORCE_COL,
+    POSITION_COL,
+    ROTATION_COL,
+    SHEAR_STRAIN_COL,
+    SHEAR_STRESS_MPA_COL,
+    SHEAR_STRESS_PA_COL,
+    TORQUE_COL,
+)
+from matmech.torsional_analysis import torsional_rect_factors
+
+# Derived columns as (2-D values, per-specimen validity) pairs.
+BatchResult = Dict[str, Tuple[np.ndarray, np.ndarray]]
+
+
+def _factor_array(factors: Sequence[Optional[float]]) -> np.ndarray:
+    """Converts per-specimen geometry factors to a column vector, with NaN for None."""
+    return np.array([np.nan if f is None else f for f in factors], dtype=float)[:, np.newaxis]
+
+
+def _batch_axial(stacked: Dict[str, np.ndarray], geometries: Sequence[Dict[str, Any]]) -> BatchResult:
+    """Computes axial stress and strain for all specimens (see `compute_axial_properties`)."""
+    area = _factor_array([axial_cross_sectional_area_m2(g) for g in geometries])
+    gauge_length = _factor_array([axial_gauge_length_mm(g) for g in geometries])
+
+    stress_pa = stacked[FORCE_COL] / area
+    stress_mpa = np.divide(stress_pa, 1e6)
+    stress_valid = np.isfinite(area[:, 0])
+    derived = {
+        AXIAL_STRESS_PA_COL: (stress_pa, stress_valid),
+        AXIAL_STRESS_MPA_COL: (stress_mpa, stress_valid),
+    }
+    # Displacement is optional: specimens with an extensometer may not record it.
+    if POSITION_COL in stacked:
+        position = stacked[POSITION_COL]
+        strain_valid = np.isfinite(gauge_length[:, 0]) & ~np.isnan(position).all(axis=1)
+        derived[AXIAL_STRAIN_COL] = (position / gauge_length, strain_valid)
+    return derived
+
+
+def _batch_torsional(stacked: Dict[str, np.ndarray], geometries: Sequence[Dict[str, Any]]) -> BatchResult:
+    """Computes shear stress and strain for all specimens (see `compute_torsional_properties_rect`)."""
+    factors = [torsional_rect_factors(g) for g in geometries]
+    strain_per_deg = _factor_array([f[0] for f in factors])
+    denominator = _factor_array([f[1] for f in factors])
+
+    shear_strain = stacked[ROTATION_COL] * strain_per_deg
+    shear_stress_pa = stacked[TORQUE_COL] / denominator
+    shear_stress_mpa = np.divide(shear_stress_pa, 1e6)
+    strain_valid, stress_valid = np.isfinite(strain_per_deg[:, 0]), np.isfinite(denominator[:, 0])
+    return {
+        SHEAR_STRAIN_COL: (shear_strain, strain_valid),
+        SHEAR_STRESS_PA_COL: (shear_stress_pa, stress_valid),
+        SHEAR_STRESS_MPA_COL: (shear_stress_mpa, stress_valid),
+    }
+
+
+# Maps an analysis type to its batched implementation, the columns it needs and
+# the columns it uses if present (stacked as NaN rows for specimens without them).
+BATCH_ANALYSIS_REGISTRY: Dict[
+    str, Tuple[Callable[..., BatchResult], Tuple[str, ...], Tuple[str, ...]]
+] = {
+    "AXIAL": (_batch_axial, (FORCE_COL,), (POSITION_COL,)),
+    "TORSIONAL": (_batch_torsional, (ROTATION_COL, TORQUE_COL), ()),
+}
+
+
+def stack_columns(
+    frames: Sequence[pd.DataFrame],
+    column_names: Sequence[str],
+    optional_column_names: Sequence[str] = (),
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """
+    Stacks the same columns of several specimens into 2-D arrays.
+
+    Args:
+        frames (Sequence[pd.DataFrame]): The standardized data of each specimen.
+        column_names (Sequence[str]): The columns to stack.
+        optional_column_names (Sequence[str]): Columns to stack if at least one
+                                               specimen has them. The rows of the
+                                               other specimens are NaN.
+
+    Returns:
+        Tuple[Dict[str, np.ndarray], np.ndarray]: One array of shape
+            (n_specimens, longest length) per column, with shorter specimens
+            padded with NaN, and the length of each specimen.
+
+    Raises:
+        KeyError: If a specimen does not have one of the `column_names`.
+    """
+    lengths = np.array([len(frame) for frame in frames], dtype=np.intp)
+    width = int(lengths.max()) if len(lengths) else 0
+    stacked: Dict[str, np.ndarray] = {}
+    for name in column_names:
+        for i, frame in enumerate(frames):
+            if name not in frame.columns:
+                raise KeyError(
+                    f"Specimen {i} has no column '{name}'. "
+                    f"Available columns: {frame.columns.tolist()}"
+                )
+    for name in [*column_names, *optional_column_names]:
+        present = [i for i, frame in enumerate(frames) if name in frame.columns]
+        if not present:
+            continue
+        dtype = np.result_type(*(frames[i][name].dtype for i in present), np.float32)
+        block = np.full((len(frames), width), np.nan, dtype=dtype)
+        for i in present:
+            block[i, : lengths[i]] = frames[i][name].to_numpy()
+        stacked[name] = block
+    return stacked, lengths
+
+
+def compute_batch_properties(
+    stacked: Dict[str, np.ndarray], geometries: Sequence[Dict[str, Any]], analysis_type: str
+) -> BatchResult:
+    """
+    Computes the derived columns of one analysis type for all specimens at once.
+
+    Args:
+        stacked (Dict[str, np.ndarray]): The 2-D input columns from `stack_columns`.
+        geometries (Sequence[Dict[str, Any]]): The geometry of each specimen, in row order.
+        analysis_type (str): A key of `BATCH_ANALYSIS_REGISTRY` ('AXIAL' or 'TORSIONAL').
+
+    Returns:
+        BatchResult: For each derived column, the 2-D values and a boolean array
+                     marking the specimens whose geometry allowed the calculation.
+                     Rows of the other specimens are NaN.
+
+    Raises:
+        ValueError: If the analysis type is unknown.
+    """
+    if analysis_type not in BATCH_ANALYSIS_REGISTRY:
+        raise ValueError(
+            f"No batch analysis registered for type '{analysis_type}'. "
+            f"Available types: {list(BATCH_ANALYSIS_REGISTRY)}"
+        )
+    batch_func, _, _ = BATCH_ANALYSIS_REGISTRY[analysis_type]
+    return batch_func(stacked, geometries)
+
+
+def analyze_batch(
+    frames: Sequence[pd.DataFrame], geometries: Sequence[Dict[str, Any]], analysis_type: str
+) -> List[pd.DataFrame]:
+    """
+    Analyzes many specimens of the same phase type in one vectorized pass.
+
+    This is the batched equivalent of calling the registered analysis function
+    (e.g. `calculate_axial_properties`) once per specimen. Each returned
+    DataFrame shares its input columns with the specimen's data, and its
+    derived columns are views into the batch arrays.
+
+    Args:
+        frames (Sequence[pd.DataFrame]): The standardized data of each specimen.
+        geometries (Sequence[Dict[str, Any]]): The geometry of each specimen.
+        analysis_type (str): A key of `BATCH_ANALYSIS_REGISTRY` ('AXIAL' or 'TORSIONAL').
+
+    Returns:
+        List[pd.DataFrame]: The analyzed data of each specimen, in input order.
+
+    Raises:
+        ValueError: If the numbers of specimens and geometries differ, or the
+                    analysis type is unknown.
+        KeyError: If a specimen lacks a column required by the analysis type.
+    """
+    if len(frames) != len(geometries):
+        raise ValueError(
+            f"Got {len(frames)} specimen(s) but {len(geometries)} geometry dictionaries."
+        )
+    if analysis_type not in BATCH_ANALYSIS_REGISTRY:
+        raise ValueError(
+            f"No batch analysis registered for type '{analysis_type}'. "
+            f"Available types: {list(BATCH_ANALYSIS_REGISTRY)}"
+        )
+    if not frames:
+        return []
+
+    _, required_columns, optional_columns = BATCH_ANALYSIS_REGISTRY[analysis_type]
+    stacked, lengths = stack_columns(frames, required_columns, optional_columns)
+    derived = compute_batch_properties(stacked, geometries, analysis_type)
+    logging.info(f"Batch {analysis_type.lower()} analysis computed for {len(frames)} specimen(s).")
+
+    results = []
+    for i, frame in enumerate(frames):
+        # As in the single-specimen analysis, pre-calculated axial strain is kept.
+        columns = {
+            name: values[i, : lengths[i]]
+            for name, (values, valid) in derived.items()
+            if valid[i] and not (name == AXIAL_STRAIN_COL and name in frame.columns)
+        }
+        results.append(attach_columns(frame, columns))
+    return results
+
+
+def resample_specimens(
+    frames: Sequence[pd.DataFrame],
+    x_col: str,
+    y_col: str,
+    grid: np.ndarray,
+    branch: int = 0,
+    hysteresis_fraction: float = 0.01,
+) -> np.ndarray:
+    """
+    Resamples the same curve of several specimens onto a shared x grid.
+
+    Each curve is split into monotonic branches (`resampling.resample_on_grid`)
+    and the requested branch is kept, e.g. the loading branch (0) of a
+    load-unload test.
+
+    Args:
+        frames (Sequence[pd.DataFrame]): The analyzed data of each specimen.
+        x_col (str): The column of the shared grid, e.g. 'Axial Strain'.
+        y_col (str): The column to resample, e.g. 'Axial Stress (MPa)'.
+        grid (np.ndarray): The x values, in increasing order.
+        branch (int): The 0-based monotonic branch of each curve to keep.
+        hysteresis_fraction (float): The smallest reversal of x that starts a new
+                                     branch, as a fraction of the specimen's x range.
+
+    Returns:
+        np.ndarray: An array of shape (n_specimens, len(grid)), NaN where a
+                    specimen's branch does not cover the grid value.
+
+    Raises:
+        KeyError: If a specimen lacks one of the columns.
+    """
+    grid = np.asarray(grid, dtype=float)
+    values = np.full((len(frames), len(grid)), np.nan)
+    for i, frame in enumerate(frames):
+        for name in (x_col, y_col):
+            if name not in frame.columns:
+                raise KeyError(
+                    f"Specimen {i} has no column '{name}'. "
+                    f"Available columns: {frame.columns.tolist()}"
+                )
+        x = frame[x_col].to_numpy(dtype=float)
+        if not np.isfinite(x).any():
+            continue
+        hysteresis = hysteresis_fraction * float(np.nanmax(x) - np.nanmin(x))
+        curve = resampling.resample_on_grid(frame[[x_col, y_col]], x_col, grid, hysteresis)
+        curve = curve[curve[BRANCH_COL] == branch]
+        positions = np.searchsorted(grid, curve[x_col].to_numpy(dtype=float))
+        values[i, positions] = curve[y_col].to_numpy(dtype=float)
+    return values
+
+
+def aggregate_curves(
+    frames: Sequence[pd.DataFrame],
+    x_col: str = AXIAL_STRAIN_COL,
+    y_col: str = AXIAL_STRESS_MPA_COL,
+    grid: Optional[np.ndarray] = None,
+    num_points: int = 200,
+    percentiles: Sequence[float] = (5.0, 95.0),
+    branch: int = 0,
+    hysteresis_fraction: float = 0.01,
+    min_specimens: int = 2,
+) -> pd.DataFrame:
+    """
+    Computes the mean curve and scatter bands of the same curve over many specimens.
+
+    Args:
+        frames (Sequence[pd.DataFrame]): The analyzed data of each specimen.
+        x_col (str): The column of the shared grid, e.g. 'Axial Strain'.
+        y_col (str): The column to aggregate, e.g. 'Axial Stress (MPa)'.
+        grid (Optional[np.ndarray]): The x values, in increasing order. If None,
+                                     `num_points` values spanning all specimens are used.
+        num_points (int): The number of grid values when `grid` is None.
+        percentiles (Sequence[float]): The percentiles (0-100) of the envelopes.
+        branch (int): The 0-based monotonic branch of each curve to aggregate.
+        hysteresis_fraction (float): The smallest reversal of x that starts a new
+                                     branch, as a fraction of the specimen's x range.
+        min_specimens (int): The fewest curves a grid value needs for its statistics.
+
+    Returns:
+        pd.DataFrame: One row per grid value with `x_col`, the 'Mean', the sample
+                      standard deviation 'Std', one column per percentile (e.g.
+                      'P5'), and the number of 'Specimens' covering it. The
+                      statistics are NaN where fewer than `min_specimens` curves
+                      cover the grid value.
+
+    Raises:
+        KeyError: If a specimen lacks one of the columns.
+    """
+    if grid is None:
+        lows = [frame[x_col].min() for frame in frames if x_col in frame.columns]
+        highs = [frame[x_col].max() for frame in frames if x_col in frame.columns]
+        if not lows or not np.isfinite(np.nanmin(lows)):
+            grid = np.array([])
+        else:
+            grid = np.linspace(np.nanmin(lows), np.nanmax(highs), num_points)
+    values = resample_specimens(frames, x_col, y_col, grid, branch, hysteresis_fraction)
+
+    # The statistics reduce over the specimen axis; grid values with too few
+    # curves are excluded up front rather than producing empty-slice warnings.
+    covered = np.isfinite(values)
+    counts = covered.sum(axis=0)
+    enough = counts >= max(min_specimens, 1)
+    sub = values[:, enough]
+    mean = np.full(len(grid), np.nan)
+    std = np.full(len(grid), np.nan)
+    envelopes = np.full((len(percentiles), len(grid)), np.nan)
+    if sub.size:
+        mean[enough] = np.nansum(sub, axis=0) / counts[enough]
+        squares = np.nansum((sub - mean[enough]) ** 2, axis=0)
+        std[enough] = np.sqrt(squares / np.maximum(counts[enough] - 1, 1))
+        if len(percentiles):
+            envelopes[:, enough] = np.nanpercentile(sub, percentiles, axis=0)
+
+    band = {x_col: np.asarray(grid, dtype=float), BAND_MEAN_COL: mean, BAND_STD_COL: std}
+    for percentile, envelope in zip(percentiles, envelopes):
+        band[BAND_PERCENTILE_COL_FORMAT.format(percentile)] = envelope
+    band[BAND_COUNT_COL] = counts
+    logging.info(
+        f"Aggregated '{y_col}' vs. '{x_col}' of {len(frames)} specimen(s) "
+        f"on {len(grid)} grid points."
+    )
+    return pd.DataFrame(band)
+
+
+def aggregate_phase_results(
+    results: Sequence[Dict[str, Any]],
+    phase_name: str,
+    x_col: str = AXIAL_STRAIN_COL,
+    y_col: str = AXIAL_STRESS_MPA_COL,
+    **band_options: Any,
+) -> pd.DataFrame:
+    """
+    Computes the mean curve and scatter bands of one phase over workflow results.
+
+    Args:
+        results (Sequence[Dict[str, Any]]): The return values of
+                        `workflow.run_analysis_workflow`, one per specimen.
+        phase_name (str): The phase to aggregate.
+        x_col (str): The column of the shared grid.
+        y_col (str): The column to aggregate.
+        **band_options: Overrides for `config_defaults.DEFAULT_BAND_OPTIONS`, or a `grid`.
+
+    Returns:
+        pd.DataFrame: The band from `aggregate_curves`. Specimens without data for
+                      the phase or the columns are skipped with a warning.
+    """
+    frames = []
+    for i, result in enumerate(results):
+        frame = result.get("phases", {}).get(phase_name)
+        if frame is None or frame.empty or x_col not in frame.columns or y_col not in frame.columns:
+            logging.warning(
+                f"Specimen {i} has no '{y_col}' vs. '{x_col}' data for phase "
+                f"'{phase_name}'. Skipping it."
+            )
+            continue
+        frames.append(frame)
+    options = {**config_defaults.DEFAULT_BAND_OPTIONS, **band_options}
+    return aggregate_curves(frames, x_col, y_col, **options)
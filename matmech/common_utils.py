@@ -1,33 +1,818 @@
 """
 This module provides common utility functions used across the analysis library,
-such as loading data from CSV files and splitting DataFrames by time points.
+such as loading data from CSV files, standardizing raw channels, and splitting
+DataFrames by time points (either in memory or chunk by chunk).
 """
 
+import bz2
+import contextlib
+import csv
+import gzip
+import io
 import logging
+import lzma
 import os
-from typing import Any, List
+import time
+import zipfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+from matmech import config_defaults
+from matmech.constants import DEFAULT_CSV_ENGINE, DEFAULT_INGEST_DTYPE
+from matmech.signal_processing import ChunkPipeline
 
-def load_csv_data(file_path: str, **kwargs: Any) -> pd.DataFrame:
+# The parsers accepted by `load_csv_data`.
+CSV_ENGINES = ("pandas", "pyarrow", "numpy-loadtxt")
+
+# Leading bytes and file extensions of the supported compression formats, using
+# pandas' names for each format.
+_COMPRESSION_MAGIC_NUMBERS = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"PK\x03\x04", "zip"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+_COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zip": "zip",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+
+
+def detect_compression(file_path: str) -> Optional[str]:
+    """
+    Detects the compression format of a data file.
+
+    The leading magic bytes are checked first, so mislabeled files are still
+    read correctly. The file extension is only used for files too short to
+    carry a magic number.
+
+    Args:
+        file_path (str): The full path to the file.
+
+    Returns:
+        Optional[str]: 'gzip', 'bz2', 'xz', 'zip' or 'zstd', or None for an
+                       uncompressed file.
+    """
+    with open(file_path, "rb") as f:
+        head = f.read(6)
+    for magic, compression in _COMPRESSION_MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return compression
+    if len(head) < 6:
+        return _COMPRESSION_EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+    return None
+
+
+@contextlib.contextmanager
+def open_data_file(file_path: str) -> Iterator[TextIO]:
+    """
+    Opens a possibly compressed data file as a text stream.
+
+    The file is decompressed on the fly while it is read, so no decompressed
+    copy is ever written to disk. Zstandard support requires the optional
+    'zstandard' package.
+
+    Args:
+        file_path (str): The full path to the file.
+
+    Yields:
+        TextIO: A text stream over the decompressed contents.
+
+    Raises:
+        ImportError: If the file is Zstandard-compressed and 'zstandard' is not installed.
+        ValueError: If a zip archive does not contain exactly one file.
+    """
+    compression = detect_compression(file_path)
+    text_options = {"encoding": "utf-8-sig", "errors": "replace", "newline": ""}
+    with contextlib.ExitStack() as stack:
+        if compression == "gzip":
+            f = stack.enter_context(gzip.open(file_path, "rt", **text_options))
+        elif compression == "bz2":
+            f = stack.enter_context(bz2.open(file_path, "rt", **text_options))
+        elif compression == "xz":
+            f = stack.enter_context(lzma.open(file_path, "rt", **text_options))
+        elif compression == "zip":
+            archive = stack.enter_context(zipfile.ZipFile(file_path))
+            names = archive.namelist()
+            if len(names) != 1:
+                raise ValueError(
+                    f"Zip archive '{os.path.basename(file_path)}' must contain exactly one file, "
+                    f"found {len(names)}."
+                )
+            f = stack.enter_context(io.TextIOWrapper(archive.open(names[0]), **text_options))
+        elif compression == "zstd":
+            try:
+                import zstandard
+            except ImportError as e:
+                raise ImportError(
+                    "Reading Zstandard-compressed files requires the 'zstandard' package. "
+                    "Install it with: pip install zstandard"
+                ) from e
+            raw = stack.enter_context(open(file_path, "rb"))
+            reader = stack.enter_context(zstandard.ZstdDecompressor().stream_reader(raw))
+            f = stack.enter_context(io.TextIOWrapper(reader, **text_options))
+        else:
+            f = stack.enter_context(open(file_path, "r", **text_options))
+        yield f
+
+
+def build_read_options(
+    column_sources: Dict[str, Dict[str, Any]], use_float32: bool = False
+) -> Dict[str, Any]:
+    """
+    Builds the column-pruning and dtype options for reading a raw data file.
+
+    Only the 'raw_col' entries of the software profile's column sources are
+    requested from the parser, so unused channels are never materialized.
+    Each column is read with the dtype declared in its source entry ('dtype'),
+    falling back to float32 when `use_float32` is set, or to the default
+    ingest dtype otherwise.
+
+    Args:
+        column_sources (Dict[str, Dict[str, Any]]): The 'column_sources' mapping of
+                                                    the resolved software profile.
+        use_float32 (bool): If True, columns without an explicit 'dtype' are read
+                            as float32 instead of float64.
+
+    Returns:
+        Dict[str, Any]: A dictionary with 'usecols' and 'dtype' entries suitable
+                        for pandas.read_csv.
+    """
+    default_dtype = "float32" if use_float32 else DEFAULT_INGEST_DTYPE
+    dtypes = {
+        source_info["raw_col"]: source_info.get("dtype", default_dtype)
+        for source_info in column_sources.values()
+    }
+    # A callable keeps missing columns from raising here; the workflow reports
+    # them individually once the file has been read.
+    return {"usecols": lambda col: col in dtypes, "dtype": dtypes}
+
+
+def resolve_csv_engine(engine: str) -> str:
+    """
+    Validates a CSV engine name, falling back when its dependency is missing.
+
+    Args:
+        engine (str): One of `CSV_ENGINES`.
+
+    Returns:
+        str: The engine to use. "pyarrow" falls back to "pandas" with a warning
+             if the optional pyarrow package is not installed.
+
+    Raises:
+        ValueError: If the engine name is unknown.
+    """
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"Unknown CSV engine '{engine}'. Choose one of: {', '.join(CSV_ENGINES)}.")
+    if engine == "pyarrow":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            logging.warning(
+                "CSV engine 'pyarrow' requested but pyarrow is not installed. "
+                "Falling back to 'pandas'. Install it with: pip install pyarrow"
+            )
+            return "pandas"
+    return engine
+
+
+def _read_csv_loadtxt(
+    file_path: str, dtypes: Optional[Dict[str, Any]], header_line: int = 0, **kwargs: Any
+) -> pd.DataFrame:
+    """Reads an all-numeric CSV file with numpy.loadtxt, keeping only `dtypes` columns if given."""
+    header = _read_header_fields(file_path, header_line)
+    names = [col for col in header if dtypes is None or col in dtypes]
+    if not names:
+        return pd.DataFrame()
+    with open_data_file(file_path) as f:
+        # Skip the preamble and the header, counting non-blank lines as pandas does.
+        skipped = 0
+        while skipped <= header_line:
+            line = f.readline()
+            if not line:
+                break
+            skipped += bool(line.strip())
+        data = np.loadtxt(
+            f,
+            delimiter=",",
+            usecols=[header.index(col) for col in names],
+            ndmin=2,
+            **kwargs,
+        )
+    return pd.DataFrame(
+        {
+            col: data[:, i].astype(dtypes[col] if dtypes else data.dtype, copy=False)
+            for i, col in enumerate(names)
+        }
+    )
+
+
+def load_csv_data(
+    file_path: str,
+    column_sources: Optional[Dict[str, Dict[str, Any]]] = None,
+    use_float32: bool = False,
+    engine: str = DEFAULT_CSV_ENGINE,
+    header_line: int = 0,
+    **kwargs: Any,
+) -> pd.DataFrame:
     """
     Loads a generic CSV file into a pandas DataFrame.
 
+    When `column_sources` is given, only the columns referenced by the software
+    profile are parsed, each with its declared dtype (see `build_read_options`).
+    Compressed files (gzip, bz2, xz, zip, zstd) are detected from their magic
+    bytes or extension and decompressed while they are parsed.
+
+    The parser is chosen with `engine`:
+    - "pandas": pandas' default single-threaded C parser.
+    - "pyarrow": pandas' PyArrow parser, which parses blocks on all cores. Falls
+      back to "pandas" if pyarrow is not installed.
+    - "numpy-loadtxt": numpy.loadtxt. Only for files whose columns are all numeric.
+
     Args:
         file_path (str): The full path to the CSV file.
-        **kwargs (Any): Additional keyword arguments to pass to pandas.read_csv.
+        column_sources (Optional[Dict[str, Dict[str, Any]]]): The 'column_sources'
+                        mapping of the resolved software profile. If None, every
+                        column is loaded with pandas' inferred dtypes.
+        use_float32 (bool): If True, columns without an explicit 'dtype' are read
+                            as float32. Only used together with `column_sources`.
+        engine (str): The CSV parsing engine, one of `CSV_ENGINES`.
+        header_line (int): The number of non-blank preamble lines before the
+                           column header (see `find_header_line`).
+        **kwargs (Any): Additional keyword arguments to pass to pandas.read_csv
+                        (or to numpy.loadtxt for the "numpy-loadtxt" engine).
 
     Returns:
         pd.DataFrame: The loaded data.
 
     Raises:
         FileNotFoundError: If the specified file_path does not exist.
+        ValueError: If the engine name is unknown.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Data file not found at: {file_path}")
+    engine = resolve_csv_engine(engine)
+    logging.info(f"Loading data from: {os.path.basename(file_path)} (engine: {engine})")
+
+    read_options = build_read_options(column_sources, use_float32) if column_sources is not None else {}
+    if engine == "numpy-loadtxt":
+        return _read_csv_loadtxt(file_path, read_options.get("dtype"), header_line, **kwargs)
+    kwargs = {"compression": detect_compression(file_path), "header": header_line, **kwargs}
+    if engine == "pyarrow":
+        kwargs = {"engine": "pyarrow", **kwargs}
+        if read_options:
+            # The PyArrow parser needs explicit column names rather than a callable.
+            header = _read_header_fields(file_path, header_line)
+            present = [col for col in header if read_options["usecols"](col)]
+            read_options = {
+                "usecols": present,
+                "dtype": {col: read_options["dtype"][col] for col in present},
+            }
+    return pd.read_csv(file_path, **{**read_options, **kwargs})
+
+
+def read_csv_header(file_path: str, max_lines: int = 1) -> List[List[str]]:
+    """
+    Reads the first line(s) of a CSV file without parsing the data body.
+
+    Compressed files are decompressed only as far as needed to read these lines.
+
+    Args:
+        file_path (str): The full path to the CSV file.
+        max_lines (int): The maximum number of lines to read.
+
+    Returns:
+        List[List[str]]: The fields of each line read, stripped of whitespace.
+
+    Raises:
+        FileNotFoundError: If the specified file_path does not exist.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Data file not found at: {file_path}")
+    lines = []
+    with open_data_file(file_path) as f:
+        for _ in range(max_lines):
+            line = f.readline()
+            if not line:
+                break
+            lines.append(line)
+    return [[field.strip() for field in row] for row in csv.reader(lines)]
+
+
+def _read_header_fields(file_path: str, header_line: int = 0) -> List[str]:
+    """Returns the column names on the given non-blank line of a CSV file, or [] if it is missing."""
+    with open_data_file(file_path) as f:
+        for line in f:
+            if line.strip():
+                if not header_line:
+                    return [field.strip() for field in next(csv.reader([line]))]
+                header_line -= 1
+    return []
+
+
+def detect_software_profile(
+    file_path: str,
+    profiles: Optional[Dict[str, Dict[str, Any]]] = None,
+    max_header_lines: int = 10,
+) -> str:
+    """
+    Identifies the software profile of a data file from its header alone.
+
+    Each of the first `max_header_lines` lines is matched against the
+    'raw_col' entries of every profile, so exports with a short preamble before
+    the column header are also recognized. The profile whose columns are most
+    often found in a single line wins; ties go to the profile with the larger
+    fraction of its columns found, then to the profile listed first.
+
+    Args:
+        file_path (str): The full path to the CSV file.
+        profiles (Optional[Dict[str, Dict[str, Any]]]): The candidate profiles.
+                        Defaults to `config_defaults.SOFTWARE_PROFILES`.
+        max_header_lines (int): The number of leading lines to consider.
+
+    Returns:
+        str: The name of the best matching profile.
+
+    Raises:
+        FileNotFoundError: If the specified file_path does not exist.
+        ValueError: If no profile matches any column of the header.
+    """
+    if profiles is None:
+        profiles = config_defaults.SOFTWARE_PROFILES
+    header_lines = [set(fields) for fields in read_csv_header(file_path, max_header_lines)]
+
+    best_name, best_score = None, (0, 0.0)
+    for name, profile in profiles.items():
+        raw_cols = {info["raw_col"] for info in profile.get("column_sources", {}).values()}
+        if not raw_cols:
+            continue
+        matched = max((len(raw_cols & fields) for fields in header_lines), default=0)
+        score = (matched, matched / len(raw_cols))
+        if score > best_score:
+            best_name, best_score = name, score
+
+    if best_name is None:
+        raise ValueError(
+            f"Could not detect a software profile for '{os.path.basename(file_path)}': "
+            "no header column matches any profile in SOFTWARE_PROFILES."
+        )
+    logging.info(
+        f"Detected software profile '{best_name}' for '{os.path.basename(file_path)}' "
+        f"({best_score[0]} matching columns)."
+    )
+    return best_name
+
+
+def find_header_line(
+    file_path: str, column_sources: Dict[str, Dict[str, Any]], max_header_lines: int = 10
+) -> int:
+    """
+    Locates the column header of a data file that may start with a preamble.
+
+    Of the first `max_header_lines` lines, the first one that contains the most
+    'raw_col' entries of the software profile is the header.
+
+    Args:
+        file_path (str): The full path to the CSV file.
+        column_sources (Dict[str, Dict[str, Any]]): The 'column_sources' mapping of
+                                                    the resolved software profile.
+        max_header_lines (int): The number of leading lines to consider.
+
+    Returns:
+        int: The number of non-blank lines before the header, as pandas' `header`
+             argument counts them. 0 if no line contains a profile column.
+    """
+    raw_cols = {info["raw_col"] for info in column_sources.values()}
+    lines = [fields for fields in read_csv_header(file_path, max_header_lines) if fields]
+    matches = [len(raw_cols & set(fields)) for fields in lines]
+    if not matches or max(matches) == 0:
+        return 0
+    header_line = int(np.argmax(matches))
+    if header_line:
+        logging.info(
+            f"Skipping {header_line} preamble line(s) before the column header of "
+            f"'{os.path.basename(file_path)}'."
+        )
+    return header_line
+
+
+def iter_csv_chunks(
+    file_path: str,
+    chunksize: int,
+    column_sources: Optional[Dict[str, Dict[str, Any]]] = None,
+    use_float32: bool = False,
+    header_line: int = 0,
+    **kwargs: Any,
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads a CSV file lazily, yielding DataFrames of at most `chunksize` rows.
+
+    Accepts the same column-pruning options as `load_csv_data`, so only the
+    profile columns of each chunk are ever parsed. Compressed files are
+    decompressed incrementally as chunks are read.
+
+    Args:
+        file_path (str): The full path to the CSV file.
+        chunksize (int): The maximum number of rows per yielded chunk.
+        column_sources (Optional[Dict[str, Dict[str, Any]]]): The 'column_sources'
+                        mapping of the resolved software profile.
+        use_float32 (bool): If True, columns without an explicit 'dtype' are read
+                            as float32.
+        header_line (int): The number of non-blank preamble lines before the
+                           column header (see `find_header_line`).
+        **kwargs (Any): Additional keyword arguments to pass to pandas.read_csv.
+
+    Yields:
+        pd.DataFrame: Consecutive chunks of the file.
+
+    Raises:
+        FileNotFoundError: If the specified file_path does not exist.
+        ValueError: If `chunksize` is not a positive integer.
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Data file not found at: {file_path}")
-    logging.info(f"Loading data from: {os.path.basename(file_path)}")
-    return pd.read_csv(file_path, **kwargs)
+    if chunksize <= 0:
+        raise ValueError(f"Chunk size must be a positive integer, got {chunksize}.")
+    logging.info(
+        f"Streaming data from: {os.path.basename(file_path)} ({chunksize} rows per chunk)"
+    )
+    kwargs = {"compression": detect_compression(file_path), "header": header_line, **kwargs}
+    if column_sources is not None:
+        kwargs = {**build_read_options(column_sources, use_float32), **kwargs}
+    with pd.read_csv(file_path, chunksize=chunksize, **kwargs) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def follow_csv(
+    file_path: str,
+    column_sources: Optional[Dict[str, Dict[str, Any]]] = None,
+    use_float32: bool = False,
+    poll_interval_s: float = 1.0,
+    idle_timeout_s: Optional[float] = None,
+    max_block_bytes: int = 16 * 1024**2,
+) -> Iterator[pd.DataFrame]:
+    """
+    Follows a CSV file that is still being written, yielding only the new rows.
+
+    A byte offset into the file is kept between polls, so each poll parses only
+    the bytes appended since the previous one and its cost is proportional to
+    the new rows, not to the size of the file. An incomplete trailing line is
+    held back until the writer finishes it. If `column_sources` is given, lines
+    before the first one containing a profile column are skipped as a preamble.
+
+    Args:
+        file_path (str): The full path to the (uncompressed) CSV file.
+        column_sources (Optional[Dict[str, Dict[str, Any]]]): The 'column_sources'
+                        mapping of the resolved software profile, used to prune
+                        columns as in `load_csv_data`.
+        use_float32 (bool): If True, columns without an explicit 'dtype' are read
+                            as float32.
+        poll_interval_s (float): The time to wait before polling again when no
+                                 new data is available.
+        idle_timeout_s (Optional[float]): Stop following once no new data has
+                                          arrived for this long. If None, follow
+                                          until the consumer stops iterating.
+        max_block_bytes (int): The maximum number of bytes parsed per yielded
+                               chunk, which bounds memory while catching up on
+                               a file that is already large.
+
+    Yields:
+        pd.DataFrame: The rows completed since the previous chunk.
+
+    Raises:
+        FileNotFoundError: If the specified file_path does not exist.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Data file not found at: {file_path}")
+    logging.info(f"Following data file: {os.path.basename(file_path)}")
+    read_options = build_read_options(column_sources, use_float32) if column_sources is not None else {}
+
+    raw_cols = {info["raw_col"] for info in (column_sources or {}).values()}
+    header: Optional[List[str]] = None
+    pending = b""
+    last_data_time = time.monotonic()
+
+    with open(file_path, "rb") as f:
+        while True:
+            new_bytes = f.read(max_block_bytes)
+            if new_bytes:
+                last_data_time = time.monotonic()
+                pending += new_bytes
+            elif os.path.getsize(file_path) < f.tell():
+                logging.warning(
+                    f"'{os.path.basename(file_path)}' was truncated while being followed. Stopping."
+                )
+                return
+
+            timed_out = (
+                not new_bytes
+                and idle_timeout_s is not None
+                and time.monotonic() - last_data_time >= idle_timeout_s
+            )
+            if timed_out:
+                # The writer has stopped, so a final line without a newline is complete.
+                complete, pending = pending, b""
+            else:
+                last_newline = pending.rfind(b"\n")
+                complete, pending = pending[: last_newline + 1], pending[last_newline + 1 :]
+
+            while header is None and complete:
+                line, _, complete = complete.partition(b"\n")
+                fields = next(csv.reader([line.decode("utf-8-sig", errors="replace")]), [])
+                fields = [field.strip() for field in fields]
+                if fields and (not raw_cols or raw_cols & set(fields)):
+                    header = fields
+            if header is not None and complete.strip():
+                yield pd.read_csv(io.BytesIO(complete), header=None, names=header, **read_options)
+
+            if timed_out:
+                logging.info(
+                    f"No new data for {idle_timeout_s:g}s. Stopped following "
+                    f"'{os.path.basename(file_path)}'."
+                )
+                return
+            if not new_bytes:
+                time.sleep(poll_interval_s)
+
+
+def standardize_data(
+    raw_df: pd.DataFrame,
+    column_sources: Dict[str, Dict[str, Any]],
+    inversion_flags: Dict[str, bool],
+    tare_options: Dict[str, bool],
+    tare_offsets: Optional[Dict[str, float]] = None,
+) -> pd.DataFrame:
+    """
+    Converts raw channels to standard column names and units.
+
+    For every entry in `column_sources`, the raw column is converted to the
+    default units of its registry entry, inverted if flagged, and tared if
+    flagged. The three steps are folded into a single affine transform that is
+    applied in place, so each channel is written exactly once. Missing raw
+    columns are skipped with a warning.
+
+    Args:
+        raw_df (pd.DataFrame): The raw data as read from the file.
+        column_sources (Dict[str, Dict[str, Any]]): Maps registry keys to their
+                        'raw_col' and 'raw_units'.
+        inversion_flags (Dict[str, bool]): Registry keys whose sign is reversed.
+        tare_options (Dict[str, bool]): Registry keys that are zeroed at the start.
+        tare_offsets (Optional[Dict[str, float]]): Tare values carried between calls.
+                        When a tared key is missing from this dictionary, the first
+                        value of the current data is used and stored in it. Pass the
+                        same dictionary for every chunk of a file so that all chunks
+                        are tared against the first sample of the file.
+
+    Returns:
+        pd.DataFrame: The standardized data, with one column per available source.
+
+    Raises:
+        ValueError: If a unit standardization is not defined in the registry.
+    """
+    if tare_offsets is None:
+        tare_offsets = {}
+
+    # Fold unit conversion, inversion and taring into one (scale, offset) pair per channel.
+    channels: List[Tuple[str, np.ndarray, float, float]] = []
+    for key, source_info in column_sources.items():
+        registry_entry = config_defaults.DATA_COLUMN_REGISTRY[key]
+        standard_name = registry_entry["standard_name"]
+        raw_col, raw_units = source_info["raw_col"], source_info["raw_units"]
+
+        if raw_col not in raw_df.columns:
+            logging.warning(
+                f"Source column '{raw_col}' for '{key}' not in data file. Skipping '{key}'."
+            )
+            continue
+
+        values = raw_df[raw_col].to_numpy()
+        scale, offset = 1.0, 0.0
+
+        # Standardize units
+        if raw_units != registry_entry["default_units"]:
+            if raw_units not in registry_entry["standardize_from"]:
+                raise ValueError(
+                    f"Standardization from '{raw_units}' to "
+                    f"'{registry_entry['default_units']}' not defined for '{key}'."
+                )
+            scale, offset = registry_entry["standardize_from"][raw_units]
+            logging.debug(f"Standardized '{key}' from '{raw_units}' to '{registry_entry['default_units']}'.")
+
+        # Apply inversion if flagged
+        if inversion_flags.get(key, False):
+            scale, offset = -scale, -offset
+            logging.debug(f"Applied inversion to '{key}' channel.")
+
+        # Apply taring if flagged
+        if tare_options.get(key, False):
+            if key not in tare_offsets and len(values):
+                tare_offsets[key] = float(values[0] * scale + offset)
+            if key in tare_offsets:
+                offset -= tare_offsets[key]
+                logging.debug(f"Applied taring to '{key}' channel (normalized to start at zero).")
+            else:
+                logging.warning(f"Attempted to tare '{key}', but the series was empty.")
+
+        channels.append((standard_name, values, float(scale), float(offset)))
+
+    # Write every channel into a row of one preallocated 2-D array per dtype,
+    # in place, and build the DataFrame from those rows without copying them.
+    dtypes = [np.result_type(values.dtype, np.float32) for _, values, _, _ in channels]
+    blocks = {dtype: np.empty((dtypes.count(dtype), len(raw_df)), dtype=dtype) for dtype in set(dtypes)}
+    next_row = dict.fromkeys(blocks, 0)
+    columns: Dict[str, np.ndarray] = {}
+    for (standard_name, values, scale, offset), dtype in zip(channels, dtypes):
+        row = blocks[dtype][next_row[dtype]]
+        next_row[dtype] += 1
+        if scale == 1.0:
+            np.copyto(row, values)
+        else:
+            np.multiply(values, scale, out=row)
+        if offset != 0.0:
+            row += offset
+        columns[standard_name] = row
+
+    return pd.DataFrame(columns, index=raw_df.index, copy=False)
+
+
+def output_buffer(
+    out: Optional[Dict[str, np.ndarray]], name: str, template: np.ndarray
+) -> np.ndarray:
+    """
+    Returns the preallocated output array for a derived column, or allocates one.
+
+    Args:
+        out (Optional[Dict[str, np.ndarray]]): Preallocated output arrays keyed by
+                                               column name, or None.
+        name (str): The name of the derived column.
+        template (np.ndarray): An input array with the length of the output. Its
+                               floating-point dtype (at least float32) is kept.
+
+    Returns:
+        np.ndarray: `out[name]` if provided, otherwise a new uninitialized array.
+
+    Raises:
+        ValueError: If a provided output array does not match the input length.
+    """
+    if out is not None and name in out:
+        buffer = out[name]
+        if buffer.shape != template.shape:
+            raise ValueError(
+                f"Output array for '{name}' has shape {buffer.shape}, expected {template.shape}."
+            )
+        return buffer
+    return np.empty(template.shape, dtype=np.result_type(template.dtype, np.float32))
+
+
+def attach_columns(df: pd.DataFrame, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Returns a new DataFrame with the given arrays added as columns, without copying.
+
+    Both the existing columns of `df` and the new arrays are shared with the
+    result; `df` itself is not modified. Existing columns with the same name
+    are replaced.
+
+    Args:
+        df (pd.DataFrame): The input data.
+        columns (Dict[str, np.ndarray]): The arrays to add, each of length `len(df)`.
+
+    Returns:
+        pd.DataFrame: The combined data.
+    """
+    if not columns:
+        return df.copy(deep=False)
+    kept = df.drop(columns=[name for name in columns if name in df.columns])
+    return pd.concat(
+        [kept, pd.DataFrame(columns, index=df.index, copy=False)], axis=1
+    )
+
+
+def stream_phase_segments(
+    raw_chunks: Iterable[pd.DataFrame],
+    column_sources: Dict[str, Dict[str, Any]],
+    inversion_flags: Dict[str, bool],
+    tare_options: Dict[str, bool],
+    split_points: List[float],
+    time_col: str,
+    preprocessor: Optional[ChunkPipeline] = None,
+) -> Iterator[Tuple[int, pd.DataFrame]]:
+    """
+    Standardizes raw data chunk by chunk and routes the rows to test phases.
+
+    Only one raw chunk is held at a time, so peak memory is bounded by the chunk
+    size rather than the file size. Taring uses the first value of the first
+    chunk for every chunk. If a preprocessor is given, each standardized chunk
+    is checked, filtered, decimated or resampled before routing; the rows it holds back are
+    routed once the stream ends. Phase boundaries follow `split_data_by_time`:
+    each phase covers (previous end time, end time]. Reading stops once a chunk
+    starts after the last split point.
+
+    Args:
+        raw_chunks (Iterable[pd.DataFrame]): Raw data chunks, e.g. from `iter_csv_chunks`.
+        column_sources (Dict[str, Dict[str, Any]]): Maps registry keys to their
+                        'raw_col' and 'raw_units'.
+        inversion_flags (Dict[str, bool]): Registry keys whose sign is reversed.
+        tare_options (Dict[str, bool]): Registry keys that are zeroed at the start.
+        split_points (List[float]): The end time (in seconds) of each phase.
+        time_col (str): The name of the standardized time column.
+        preprocessor (Optional[ChunkPipeline]): Checks, filters, decimates or resamples
+                        the standardized chunks (see `data_quality`, `signal_processing`
+                        and `resampling`).
+
+    Yields:
+        Tuple[int, pd.DataFrame]: The index of the phase in `split_points` and the
+                                  standardized rows of the current chunk that
+                                  belong to it. Empty pieces are not yielded.
+
+    Raises:
+        KeyError: If the time column is missing from the standardized data.
+    """
+    tare_offsets: Dict[str, float] = {}
+    sources = column_sources
+    is_first_chunk = True
+
+    for raw_chunk in raw_chunks:
+        clean_chunk = standardize_data(
+            raw_chunk, sources, inversion_flags, tare_options, tare_offsets
+        )
+        if is_first_chunk:
+            # Report missing columns once, not once per chunk.
+            sources = {
+                key: info for key, info in sources.items() if info["raw_col"] in raw_chunk.columns
+            }
+            if time_col not in clean_chunk.columns:
+                raise KeyError(
+                    f"Required time column '{time_col}' not found in processed data. "
+                    f"Available columns: {clean_chunk.columns.tolist()}"
+                )
+            is_first_chunk = False
+
+        chunk_time = clean_chunk[time_col]
+        ready = clean_chunk if preprocessor is None else preprocessor.process(clean_chunk)
+        yield from _route_rows(ready, split_points, time_col)
+
+        if split_points and not chunk_time.empty and chunk_time.min() > split_points[-1]:
+            logging.info(
+                f"Reached the end of the test recipe at t={split_points[-1]:.2f}s. "
+                "Stopping the data stream."
+            )
+            break
+
+    if preprocessor is not None:
+        yield from _route_rows(preprocessor.flush(), split_points, time_col)
+
+
+def _route_rows(
+    df: pd.DataFrame, split_points: List[float], time_col: str
+) -> Iterator[Tuple[int, pd.DataFrame]]:
+    """Yields the non-empty rows of `df` that belong to each phase, with the phase index."""
+    if df.empty:
+        return
+    for phase_index, selector in enumerate(_segment_selectors(df[time_col], split_points)):
+        piece = df.iloc[selector]
+        if not piece.empty:
+            yield phase_index, piece
+
+
+def _segment_selectors(
+    times: pd.Series, split_points: List[float]
+) -> List[Union[slice, np.ndarray]]:
+    """
+    Finds the rows of each segment (previous split point, split point].
+
+    If time is monotonically non-decreasing, each segment is a contiguous run of
+    rows whose bounds are found by binary search, and a positional slice is
+    returned: O(N) for the monotonicity check plus O(P log N) for P split
+    points. Otherwise a boolean mask is built per segment: O(N * P).
+
+    Args:
+        times (pd.Series): The time values.
+        split_points (List[float]): The end time of each segment.
+
+    Returns:
+        List[Union[slice, np.ndarray]]: One positional slice or boolean mask per
+                                        split point, usable with `DataFrame.iloc`.
+    """
+    values = times.to_numpy()
+    lower_bounds = [0.0] + list(split_points[:-1])
+    if times.is_monotonic_increasing:
+        starts = np.searchsorted(values, lower_bounds, side="right")
+        ends = np.searchsorted(values, split_points, side="right")
+        return [slice(start, max(start, end)) for start, end in zip(starts, ends)]
+
+    logging.debug("Time is not monotonic; segmenting with boolean masks.")
+    return [
+        (values > last_time) & (values <= end_time)
+        for last_time, end_time in zip(lower_bounds, split_points)
+    ]
 
 
 def split_data_by_time(
@@ -39,6 +824,12 @@ def split_data_by_time(
     Each segment includes data from the end of the previous segment (exclusive)
     up to the current split point (inclusive).
 
+    When time is monotonic (the normal case for a test recording), segment
+    bounds are found by binary search and each segment is a slice of `df`
+    rather than a copy; under pandas' copy-on-write, data is only copied if a
+    segment is later modified. Non-monotonic time falls back to boolean masks,
+    which copy the selected rows.
+
     Args:
         df (pd.DataFrame): The input DataFrame to split.
         split_points (List[float]): A list of time points (in seconds) at which
@@ -52,11 +843,8 @@ def split_data_by_time(
     segments: List[pd.DataFrame] = []
     last_time = 0.0
 
-    for end_time in split_points:
-        # Ensure the mask correctly handles the start of the first segment
-        # and subsequent segments without overlapping or missing data.
-        mask = (df[time_col] > last_time) & (df[time_col] <= end_time)
-        segment_df = df.loc[mask].copy()
+    for end_time, selector in zip(split_points, _segment_selectors(df[time_col], split_points)):
+        segment_df = df.iloc[selector]
         segments.append(segment_df)
         logging.info(
             f"Created segment from t={last_time:.2f}s to t={end_time:.2f}s "
@@ -4,8 +4,17 @@ Default configurations and registries for the analysis workflow.
 This module defines:
 - SOFTWARE_PROFILES: Mappings for different testing software data formats.
 - DATA_COLUMN_REGISTRY: Detailed information about standard data columns,
-  including names, labels, units, and conversion functions.
+  including names, labels, units, and affine unit conversion coefficients.
 - DEFAULT_PLOTS: Pre-defined plot configurations for common visualizations.
+- DEFAULT_CACHE_OPTIONS: Defaults for the on-disk standardized data cache.
+- DEFAULT_FOLLOW_OPTIONS: Defaults for following a data file while it is written.
+- DEFAULT_BATCH_OPTIONS: Defaults for analyzing many data files in parallel.
+- DEFAULT_AUTO_SEGMENTATION_OPTIONS: Defaults for detecting phase end times from the data.
+- DEFAULT_AUTO_FIT_OPTIONS: Defaults for detecting the linear region used for modulus fits.
+- DEFAULT_PROPERTY_OPTIONS: Defaults for extracting mechanical properties per phase.
+- FILTER_METHOD_DEFAULTS: Default parameters of each channel filter method.
+- DEFAULT_QUALITY_OPTIONS: Defaults for spike and dropout detection and repair.
+- DEFAULT_BAND_OPTIONS: Defaults for batch mean curves and scatter bands.
 - Constants for standard column names to ensure consistency across the codebase.
 """
 
@@ -16,25 +25,37 @@ from matmech.constants import (
     AXIAL_STRAIN_COL,
     AXIAL_STRESS_MPA_COL,
     AXIAL_STRESS_PA_COL,
+    CYCLE_COL,
+    CYCLE_ENERGY_COL,
+    CYCLE_STIFFNESS_COL,
     DEFAULT_SOFTWARE_TYPE,
     FORCE_COL,
+    PEAK_FORCE_COL,
     POSITION_COL,
     ROTATION_COL,
+    SECANT_MODULUS_COL,
     SHEAR_STRAIN_COL,
     SHEAR_STRESS_MPA_COL,
     SHEAR_STRESS_PA_COL,
+    STRESS_AMPLITUDE_COL,
+    TANGENT_MODULUS_COL,
     TIME_COL,
     TORQUE_COL,
+    TRUE_STRAIN_COL,
+    TRUE_STRESS_COL,
+    VALLEY_FORCE_COL,
 )
 
 # --- Software Profiles ---
 # Defines how raw data columns from different software map to standard columns
-# and any inversion flags needed.
+# and any inversion flags needed. A source may declare the 'dtype' it is read
+# with; time is pinned to float64 so long tests keep their sample resolution
+# when the remaining channels are read as float32.
 SOFTWARE_PROFILES: Dict[str, Dict[str, Any]] = {
     "wavematrix": {
         "description": "Profile for using WaveMatrix testing software.",
         "column_sources": {
-            "time": {"raw_col": "Total Time (s)", "raw_units": "s"},
+            "time": {"raw_col": "Total Time (s)", "raw_units": "s", "dtype": "float64"},
             "position": {"raw_col": "Position (mm)", "raw_units": "mm"},
             "force": {"raw_col": "Force (kN)", "raw_units": "kN"},
             "rotation": {"raw_col": "Rotation (deg)", "raw_units": "deg"},
@@ -45,7 +66,7 @@ SOFTWARE_PROFILES: Dict[str, Dict[str, Any]] = {
     "bluehill": {
         "description": "Profile for using BlueHill testing software.",
         "column_sources": {
-            "time": {"raw_col": "Time (s)", "raw_units": "s"},
+            "time": {"raw_col": "Time (s)", "raw_units": "s", "dtype": "float64"},
             "position": {"raw_col": "Displacement (mm)", "raw_units": "mm"},
             "force": {"raw_col": "Force (kN)", "raw_units": "kN"},
             "axial_strain": {"raw_col": "AVE2 (%)", "raw_units": "percent"},
@@ -54,83 +75,211 @@ SOFTWARE_PROFILES: Dict[str, Dict[str, Any]] = {
     },
 }
 
+# --- Data Cache Options ---
+# Controls the on-disk cache of standardized data (see matmech.data_cache).
+# 'directory' defaults to '.matmech_cache' next to the calling script.
+DEFAULT_CACHE_OPTIONS: Dict[str, Any] = {
+    "enabled": False,
+    "directory": None,
+    "max_size_mb": 1024,
+}
+
+# --- Follow Mode Options ---
+# Controls `workflow.follow_analysis_workflow`: how often the data file is polled,
+# how often updated static plots are written, and how long to wait for new data
+# before the test is considered finished (None waits indefinitely).
+DEFAULT_FOLLOW_OPTIONS: Dict[str, Any] = {
+    "poll_interval_s": 1.0,
+    "plot_interval_s": 30.0,
+    "idle_timeout_s": 300.0,
+}
+
+# --- Batch Options ---
+# Controls `workflow.run_batch_workflow`, which analyzes many data files on a
+# pool of worker processes.
+# - max_workers: Number of worker processes (None: one per CPU core; 1 runs in-process).
+# - file_overrides: Configuration overrides by file name or glob pattern, e.g.
+#   {"A12*.csv": {"geometry": {"axial_width_mm": 9.8}}}, applied in order.
+# - keep_phases: Whether the analyzed phase data of every file is returned to
+#   the caller (always done when "band" plots are configured).
+# - worker_log_level: Logging level of the worker processes, whose messages interleave.
+DEFAULT_BATCH_OPTIONS: Dict[str, Any] = {
+    "max_workers": None,
+    "file_overrides": {},
+    "keep_phases": False,
+    "worker_log_level": "WARNING",
+}
+
+# --- Automatic Phase Detection Options ---
+# Used when a test_recipe phase has "end_time": "auto" (see matmech.event_detection).
+# - command: Registry key of the signal whose rate defines loading/unloading/holding.
+# - rate_threshold: Fraction of the peak absolute rate below which the signal holds.
+# - smoothing_window: Moving-average window (samples) applied before differentiating.
+# - min_phase_duration_s: Shorter runs are merged into the preceding phase.
+# - failure_signal: Registry key of the load signal used to detect failure.
+# - failure_drop: Relative load drop that marks failure (None disables it).
+# - failure_window: Number of samples within which the load must drop.
+DEFAULT_AUTO_SEGMENTATION_OPTIONS: Dict[str, Any] = {
+    "command": "position",
+    "rate_threshold": 0.05,
+    "smoothing_window": 25,
+    "min_phase_duration_s": 1.0,
+    "failure_signal": "force",
+    "failure_drop": None,
+    "failure_window": 5,
+}
+
+# --- Automatic Fit Bounds Options ---
+# Used when a plot has "fit_bounds": "auto" (see linear_fit.find_linear_region).
+# - min_span: Minimum width of the fit window in base x units (None uses min_span_fraction).
+# - min_span_fraction: Minimum width as a fraction of the x-range, if min_span is None.
+# - min_points: Minimum number of points in the fit window.
+# - slope_fraction: Only windows at least this steep, relative to the steepest window,
+#   are considered, so that the stiff elastic region wins over a straight plastic one.
+DEFAULT_AUTO_FIT_OPTIONS: Dict[str, Any] = {
+    "min_span": None,
+    "min_span_fraction": 0.02,
+    "min_points": 10,
+    "slope_fraction": 0.5,
+}
+
+# --- Property Extraction Options ---
+# Controls the per-phase property table of AXIAL/TORSIONAL phases (see
+# matmech.property_extraction), saved as 'mechanical_properties.csv'.
+# - offset_strain: Strain offset of the yield line (0.002 for 0.2% offset yield).
+# - fit_bounds: Strain range of the modulus fit, or "auto" to detect the elastic region.
+# - auto_fit_options: Overrides for DEFAULT_AUTO_FIT_OPTIONS.
+DEFAULT_PROPERTY_OPTIONS: Dict[str, Any] = {
+    "enabled": True,
+    "offset_strain": 0.002,
+    "fit_bounds": "auto",
+    "auto_fit_options": None,
+}
+
+# --- Channel Filter Defaults ---
+# Default parameters of each method of the 'filter_options' preprocessing stage.
+# Windows are in samples; the Butterworth cutoff is in Hz.
+FILTER_METHOD_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "moving_average": {"window": 25},
+    "savgol": {"window": 51, "polyorder": 3},
+    "butterworth": {"cutoff_hz": 50.0, "order": 4},
+}
+
+# --- Data Quality Options ---
+# Controls the spike and dropout check applied to every standardized channel
+# before filtering (see matmech.data_quality). A sample is a spike if it deviates
+# from the rolling median of `window` samples by more than `threshold` noise
+# standard deviations (1.2533 x the mean absolute deviation from the median over
+# `scale_window` samples) and by more than `min_deviation` (per registry key, in
+# standard units; default 0).
+# NaN and infinite samples are dropouts. `repair` is "interpolate" (linear
+# interpolation from the neighboring good samples), "mask" (set to NaN) or
+# "none" (only report them). Only dropout gaps of at most `max_gap` samples
+# between good samples are interpolated; gaps at the start or end of the data
+# and longer gaps are set to NaN.
+DEFAULT_QUALITY_OPTIONS: Dict[str, Any] = {
+    "enabled": True,
+    "window": 7,
+    "scale_window": 51,
+    "threshold": 6.0,
+    "min_deviation": {},
+    "repair": "interpolate",
+    "max_gap": 50,
+}
+
+# --- Batch Band Options ---
+# Controls `batch_analysis.aggregate_curves` and "band" plots: each specimen's
+# curve is resampled onto `num_points` x values spanning all specimens (its
+# monotonic `branch`, found with reversals above `hysteresis_fraction` of its x
+# range), and grid points with fewer than `min_specimens` curves are left NaN.
+DEFAULT_BAND_OPTIONS: Dict[str, Any] = {
+    "num_points": 200,
+    "percentiles": (5.0, 95.0),
+    "branch": 0,
+    "hysteresis_fraction": 0.01,
+    "min_specimens": 2,
+}
+
 # --- Data Column Registry ---
 # Provides detailed information for each standard data column, including:
 # - standard_name: The canonical column name used in processed DataFrames.
 # - label: The default label for plots, including default units.
 # - default_units: The base units for standardization.
-# - conversions: Functions to convert from default_units to other common units.
-# - standardize_from: Functions to convert from raw_units to default_units.
+# - conversions: Affine (scale, offset) coefficients converting from default_units
+#   to other common units, i.e. converted = value * scale + offset.
+# - standardize_from: Affine (scale, offset) coefficients converting from raw_units
+#   to default_units. Keeping these as coefficients rather than functions lets
+#   standardization fuse conversion, inversion and taring into one in-place pass.
 # - auto_scale_options: (Optional) Tuples of (threshold, unit_string) for auto-scaling plots.
 DATA_COLUMN_REGISTRY: Dict[str, Dict[str, Any]] = {
     "time": {
         "standard_name": TIME_COL,
         "label": "Time (s)",
         "default_units": "s",
-        "conversions": {"ms": lambda x: x * 1e3, "min": lambda x: x / 60},
-        "standardize_from": {"ms": lambda x: x / 1e3, "min": lambda x: x * 60},
+        "conversions": {"ms": (1e3, 0.0), "min": (1 / 60, 0.0)},
+        "standardize_from": {"ms": (1e-3, 0.0), "min": (60, 0.0)},
         "auto_scale_options": [(60, "min"), (1, "s"), (1e-3, "ms")],
     },
     "position": {
         "standard_name": POSITION_COL,
         "label": "Displacement (mm)",
         "default_units": "mm",
-        "conversions": {"m": lambda x: x / 1000, "um": lambda x: x * 1000, "in": lambda x: x / 25.4},
-        "standardize_from": {"m": lambda x: x * 1000, "um": lambda x: x / 1000, "in": lambda x: x * 25.4},
+        "conversions": {"m": (1e-3, 0.0), "um": (1000, 0.0), "in": (1 / 25.4, 0.0)},
+        "standardize_from": {"m": (1000, 0.0), "um": (1e-3, 0.0), "in": (25.4, 0.0)},
         "auto_scale_options": [(1000, "m"), (1, "mm"), (1e-3, "um")],
     },
     "displacement": {  # Alias for position, useful for plot configs
         "standard_name": POSITION_COL,
         "label": "Displacement (mm)",
         "default_units": "mm",
-        "conversions": {"m": lambda x: x / 1000, "um": lambda x: x * 1000, "in": lambda x: x / 25.4},
+        "conversions": {"m": (1e-3, 0.0), "um": (1000, 0.0), "in": (1 / 25.4, 0.0)},
     },
     "force": {
         "standard_name": FORCE_COL,
         "label": "Force (N)",
         "default_units": "N",
-        "conversions": {"kN": lambda x: x / 1000, "lbf": lambda x: x * 0.224809},
-        "standardize_from": {"kN": lambda x: x * 1000, "lbf": lambda x: x * 4.44822},
+        "conversions": {"kN": (1e-3, 0.0), "lbf": (0.224809, 0.0)},
+        "standardize_from": {"kN": (1000, 0.0), "lbf": (4.44822, 0.0)},
         "auto_scale_options": [(1e3, "kN"), (1, "N")],
     },
     "torque": {
         "standard_name": TORQUE_COL,
         "label": "Torque (N·m)",
         "default_units": "N·m",
-        "conversions": {"kN·m": lambda x: x / 1000, "lbf·in": lambda x: x * 8.85075},
-        "standardize_from": {"kN·m": lambda x: x * 1000, "lbf·in": lambda x: x / 0.112985},
+        "conversions": {"kN·m": (1e-3, 0.0), "lbf·in": (8.85075, 0.0)},
+        "standardize_from": {"kN·m": (1000, 0.0), "lbf·in": (1 / 0.112985, 0.0)},
         "auto_scale_options": [(1e3, "kN·m"), (1, "N·m")],
     },
     "rotation": {
         "standard_name": ROTATION_COL,
         "label": "Rotation (deg)",
         "default_units": "deg",
-        "conversions": {"rad": lambda x: np.deg2rad(x), "rev": lambda x: x / 360},
-        "standardize_from": {"rad": lambda x: np.rad2deg(x), "rev": lambda x: x * 360},
+        "conversions": {"rad": (np.pi / 180, 0.0), "rev": (1 / 360, 0.0)},
+        "standardize_from": {"rad": (180 / np.pi, 0.0), "rev": (360, 0.0)},
         "auto_scale_options": [(360, "rev"), (1, "deg")],
     },
     "axial_strain": {
         "standard_name": AXIAL_STRAIN_COL,
         "label": "Axial Strain (ε)",
         "default_units": "unitless",
-        "conversions": {"percent": lambda x: x * 100, "microstrain": lambda x: x * 1e6},
-        "standardize_from": {"percent": lambda x: x / 100, "microstrain": lambda x: x / 1e6},
+        "conversions": {"percent": (100, 0.0), "microstrain": (1e6, 0.0)},
+        "standardize_from": {"percent": (0.01, 0.0), "microstrain": (1e-6, 0.0)},
     },
     "axial_stress": {
         "standard_name": AXIAL_STRESS_MPA_COL,
         "label": "Axial Stress (σ) (MPa)",
         "default_units": "MPa",
         "conversions": {
-            "GPa": lambda x: x / 1000,
-            "kPa": lambda x: x * 1000,
-            "psi": lambda x: x * 145.038,
-            "ksi": lambda x: x * 0.145038,
+            "GPa": (1e-3, 0.0),
+            "kPa": (1000, 0.0),
+            "psi": (145.038, 0.0),
+            "ksi": (0.145038, 0.0),
         },
         "standardize_from": {
-            "Pa": lambda x: x / 1e6,
-            "GPa": lambda x: x * 1000,
-            "kPa": lambda x: x / 1000,
-            "psi": lambda x: x / 145.038,
+            "Pa": (1e-6, 0.0),
+            "GPa": (1000, 0.0),
+            "kPa": (1e-3, 0.0),
+            "psi": (1 / 145.038, 0.0),
         },
         "auto_scale_options": [(1000, "GPa"), (1, "MPa"), (1e-3, "kPa")],
     },
@@ -138,16 +287,87 @@ DATA_COLUMN_REGISTRY: Dict[str, Dict[str, Any]] = {
         "standard_name": SHEAR_STRAIN_COL,
         "label": "Shear Strain (γ)",
         "default_units": "unitless",
-        "conversions": {"percent": lambda x: x * 100},
+        "conversions": {"percent": (100, 0.0)},
     },
     "shear_stress": {
         "standard_name": SHEAR_STRESS_MPA_COL,
         "label": "Shear Stress (τ) (MPa)",
         "default_units": "MPa",
-        "conversions": {"GPa": lambda x: x / 1000, "kPa": lambda x: x * 1000},
-        "standardize_from": {"Pa": lambda x: x / 1e6, "GPa": lambda x: x * 1000, "kPa": lambda x: x / 1000},
+        "conversions": {"GPa": (1e-3, 0.0), "kPa": (1000, 0.0)},
+        "standardize_from": {"Pa": (1e-6, 0.0), "GPa": (1000, 0.0), "kPa": (1e-3, 0.0)},
         "auto_scale_options": [(1000, "GPa"), (1, "MPa"), (1e-3, "kPa")],
     },
+    "tangent_modulus": {
+        "standard_name": TANGENT_MODULUS_COL,
+        "label": "Tangent Modulus (E_t) (MPa)",
+        "default_units": "MPa",
+        "conversions": {"GPa": (1e-3, 0.0), "ksi": (0.145038, 0.0)},
+        "standardize_from": {"GPa": (1000, 0.0)},
+        "auto_scale_options": [(1000, "GPa"), (1, "MPa")],
+    },
+    "secant_modulus": {
+        "standard_name": SECANT_MODULUS_COL,
+        "label": "Secant Modulus (E_s) (MPa)",
+        "default_units": "MPa",
+        "conversions": {"GPa": (1e-3, 0.0), "ksi": (0.145038, 0.0)},
+        "standardize_from": {"GPa": (1000, 0.0)},
+        "auto_scale_options": [(1000, "GPa"), (1, "MPa")],
+    },
+    "true_strain": {
+        "standard_name": TRUE_STRAIN_COL,
+        "label": "True Strain (ε_t)",
+        "default_units": "unitless",
+        "conversions": {"percent": (100, 0.0)},
+    },
+    "true_stress": {
+        "standard_name": TRUE_STRESS_COL,
+        "label": "True Stress (σ_t) (MPa)",
+        "default_units": "MPa",
+        "conversions": {"GPa": (1e-3, 0.0), "kPa": (1000, 0.0), "ksi": (0.145038, 0.0)},
+        "auto_scale_options": [(1000, "GPa"), (1, "MPa"), (1e-3, "kPa")],
+    },
+    # Per-cycle columns of CYCLIC phases
+    "cycle": {
+        "standard_name": CYCLE_COL,
+        "label": "Cycle",
+        "default_units": "",
+        "conversions": {},
+    },
+    "peak_force": {
+        "standard_name": PEAK_FORCE_COL,
+        "label": "Peak Force (N)",
+        "default_units": "N",
+        "conversions": {"kN": (1e-3, 0.0), "lbf": (0.224809, 0.0)},
+        "auto_scale_options": [(1e3, "kN"), (1, "N")],
+    },
+    "valley_force": {
+        "standard_name": VALLEY_FORCE_COL,
+        "label": "Valley Force (N)",
+        "default_units": "N",
+        "conversions": {"kN": (1e-3, 0.0), "lbf": (0.224809, 0.0)},
+        "auto_scale_options": [(1e3, "kN"), (1, "N")],
+    },
+    "stress_amplitude": {
+        "standard_name": STRESS_AMPLITUDE_COL,
+        "label": "Stress Amplitude (σ_a) (MPa)",
+        "default_units": "MPa",
+        "conversions": {"GPa": (1e-3, 0.0), "ksi": (0.145038, 0.0)},
+        "auto_scale_options": [(1000, "GPa"), (1, "MPa")],
+    },
+    "secant_stiffness": {
+        "standard_name": CYCLE_STIFFNESS_COL,
+        "label": "Secant Stiffness (N/mm)",
+        "default_units": "N/mm",
+        "conversions": {"kN/mm": (1e-3, 0.0)},
+        "auto_scale_options": [(1e3, "kN/mm"), (1, "N/mm")],
+    },
+    "dissipated_energy": {
+        "standard_name": CYCLE_ENERGY_COL,
+        "label": "Dissipated Energy (mJ)",
+        "default_units": "mJ",
+        "conversions": {"J": (1e-3, 0.0)},
+        "auto_scale_options": [(1e3, "J"), (1, "mJ")],
+    },
 }
 
 # --- Default Plot Configurations ---
@@ -220,6 +440,22 @@ DEFAULT_PLOTS: Dict[str, Dict[str, Any]] = {
         "type": "static",
         "fit_line": True,
     },
+    "true_stress_strain_static": {
+        "x_col": "true_strain",
+        "y_col": "true_stress",
+        "title": "{phase_name} - True Stress vs. True Strain",
+        "output_filename": "{phase_name}_true_stress_strain_static",
+        "phases": ["*"],
+        "type": "static",
+    },
+    "stress_strain_band": {
+        "x_col": "axial_strain",
+        "y_col": "axial_stress",
+        "title": "{phase_name} - Mean Axial Stress vs. Axial Strain",
+        "output_filename": "{phase_name}_axial_stress_strain_band",
+        "phases": ["*"],
+        "type": "band",
+    },
     "stress_strain_animated": {
         "x_col": "axial_strain",
         "y_col": "axial_stress",
@@ -228,6 +464,23 @@ DEFAULT_PLOTS: Dict[str, Dict[str, Any]] = {
         "phases": ["*"],
         "type": "animated",
     },
+    # Requires the phase analysis option 'modulus_window'
+    "tangent_modulus_static": {
+        "x_col": "axial_strain",
+        "y_col": "tangent_modulus",
+        "title": "{phase_name} - Tangent Modulus vs. Axial Strain",
+        "output_filename": "{phase_name}_tangent_modulus_static",
+        "phases": ["*"],
+        "type": "static",
+    },
+    "secant_modulus_static": {
+        "x_col": "axial_strain",
+        "y_col": "secant_modulus",
+        "title": "{phase_name} - Secant Modulus vs. Axial Strain",
+        "output_filename": "{phase_name}_secant_modulus_static",
+        "phases": ["*"],
+        "type": "static",
+    },
     # Torsional Plots
     "time_rotation_static": {
         "x_col": "time",
@@ -278,4 +531,21 @@ DEFAULT_PLOTS: Dict[str, Dict[str, Any]] = {
         "phases": ["*"],
         "type": "animated",
     },
+    # Cyclic Plots
+    "stress_amplitude_cycles_static": {
+        "x_col": "cycle",
+        "y_col": "stress_amplitude",
+        "title": "{phase_name} - Stress Amplitude vs. Cycle",
+        "output_filename": "{phase_name}_stress_amplitude_cycles_static",
+        "phases": ["*"],
+        "type": "static",
+    },
+    "secant_stiffness_cycles_static": {
+        "x_col": "cycle",
+        "y_col": "secant_stiffness",
+        "title": "{phase_name} - Secant Stiffness vs. Cycle",
+        "output_filename": "{phase_name}_secant_stiffness_cycles_static",
+        "phases": ["*"],
+        "type": "static",
+    },
 }
@@ -16,6 +16,70 @@ AXIAL_STRESS_MPA_COL = "Axial Stress (MPa)"
 SHEAR_STRAIN_COL = "Shear Strain (gamma)"
 SHEAR_STRESS_PA_COL = "Shear Stress (tau_Pa)"
 SHEAR_STRESS_MPA_COL = "Shear Stress (tau_MPa)"
+TANGENT_MODULUS_COL = "Tangent Modulus (MPa)"
+SECANT_MODULUS_COL = "Secant Modulus (MPa)"
+TRUE_STRAIN_COL = "True Strain"
+TRUE_STRESS_COL = "True Stress (MPa)"
+
+# --- Per-Cycle Column Name Constants ---
+# The columns of the per-cycle table produced by the CYCLIC analysis.
+CYCLE_COL = "Cycle"
+CYCLE_START_TIME_COL = "Cycle Start Time (s)"
+PEAK_FORCE_COL = "Peak Force (N)"
+VALLEY_FORCE_COL = "Valley Force (N)"
+CYCLE_STIFFNESS_COL = "Secant Stiffness (N/mm)"
+CYCLE_ENERGY_COL = "Dissipated Energy (mJ)"
+PEAK_STRESS_COL = "Peak Stress (MPa)"
+VALLEY_STRESS_COL = "Valley Stress (MPa)"
+STRESS_AMPLITUDE_COL = "Stress Amplitude (MPa)"
+MEAN_STRESS_COL = "Mean Stress (MPa)"
+STRAIN_AMPLITUDE_COL = "Strain Amplitude"
+CYCLE_ENERGY_DENSITY_COL = "Dissipated Energy Density (MJ/m³)"
+
+# --- Rainflow Histogram Column Name Constants ---
+# Bin centers are in the standard units of the counted signal.
+RAINFLOW_RANGE_COL = "Range"
+RAINFLOW_MEAN_COL = "Mean"
+RAINFLOW_COUNT_COL = "Cycles"
+
+# --- Resampling Column Name Constants ---
+# The 0-based monotonic branch of a curve resampled onto a strain (or other) grid.
+BRANCH_COL = "Branch"
+
+# --- Batch Band Column Name Constants ---
+# The columns of a batch mean curve from `batch_analysis.aggregate_curves`, in
+# the units of the aggregated y column. Percentile columns are named with
+# BAND_PERCENTILE_COL_FORMAT, e.g. "P5" and "P95".
+BAND_MEAN_COL = "Mean"
+BAND_STD_COL = "Std"
+BAND_COUNT_COL = "Specimens"
+BAND_PERCENTILE_COL_FORMAT = "P{:g}"
+
+# --- Data Quality Summary Column Name Constants ---
+# The columns of the per-channel summary written as 'data_quality.csv'.
+QUALITY_CHANNEL_COL = "Channel"
+QUALITY_SAMPLES_COL = "Samples"
+QUALITY_SPIKES_COL = "Spikes"
+QUALITY_DROPOUTS_COL = "Dropouts"
+QUALITY_FLAGGED_PCT_COL = "Flagged (%)"
+
+# --- Default Ingest Dtype ---
+# The dtype used for raw channels that do not declare one in their software profile.
+DEFAULT_INGEST_DTYPE = "float64"
+
+# --- Automatic Phase End Time ---
+# A test_recipe 'end_time' with this value is detected from the data instead.
+AUTO_END_TIME = "auto"
+
+# --- Automatic Fit Bounds ---
+# A plot 'fit_bounds' with this value is replaced by the detected linear (elastic) region.
+AUTO_FIT_BOUNDS = "auto"
+
+# --- Default CSV Engine ---
+# The parser used by `common_utils.load_csv_data` unless 'csv_engine' is configured.
+DEFAULT_CSV_ENGINE = "pandas"
 
 # --- Default Software Type ---
 DEFAULT_SOFTWARE_TYPE = "wavematrix"
+# Selects the software profile by matching the data file's header instead.
+AUTO_SOFTWARE_TYPE = "auto"
@@ -0,0 +1,272 @@
+"""
+This module provides cycle detection and per-cycle metrics for cyclic
+(fatigue) test phases.
+
+Cycles are found from the turning points (reversals) of a command signal such
+as displacement. Reversals smaller than a hysteresis band are discarded so
+that signal noise does not create spurious cycles, and every complete
+valley-to-valley span becomes one cycle. The per-cycle peak and valley force,
+stress amplitude, dissipated energy (hysteresis loop area) and secant
+stiffness are then reduced with `np.ufunc.reduceat` over the cycle
+boundaries, so a test with millions of cycles is summarized in a few
+vectorized passes instead of one plot per cycle.
+"""
+
+import logging
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from matmech import config_defaults
+from matmech.axial_analysis import compute_axial_properties
+from matmech.constants import (
+    AXIAL_STRAIN_COL,
+    AXIAL_STRESS_MPA_COL,
+    CYCLE_COL,
+    CYCLE_ENERGY_COL,
+    CYCLE_ENERGY_DENSITY_COL,
+    CYCLE_START_TIME_COL,
+    CYCLE_STIFFNESS_COL,
+    FORCE_COL,
+    MEAN_STRESS_COL,
+    PEAK_FORCE_COL,
+    PEAK_STRESS_COL,
+    POSITION_COL,
+    STRAIN_AMPLITUDE_COL,
+    STRESS_AMPLITUDE_COL,
+    TIME_COL,
+    VALLEY_FORCE_COL,
+    VALLEY_STRESS_COL,
+)
+
+
+def _keep_extrema(values: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """Drops the interior indices whose values are not strict extrema of the indexed sequence."""
+    if len(indices) < 3:
+        return indices
+    v = values[indices]
+    interior = (v[1:-1] - v[:-2]) * (v[2:] - v[1:-1]) < 0
+    return indices[np.concatenate(([True], interior, [True]))]
+
+
+def find_turning_points(values: np.ndarray, hysteresis: float = 0.0) -> np.ndarray:
+    """
+    Finds the turning points (reversals) of a signal, ignoring small reversals.
+
+    The local extrema are found in one vectorized pass (runs of equal values
+    count once). Then, while any two neighboring turning points differ by less
+    than `hysteresis`, the pairs whose range is a local minimum are removed
+    together and the sequence is reduced to its extrema again. Each pass is
+    vectorized, and a noisy signal typically settles after a few passes.
+
+    Args:
+        values (np.ndarray): The signal samples, in time order.
+        hysteresis (float): The smallest reversal (in signal units) that counts.
+
+    Returns:
+        np.ndarray: The sample indices of the turning points, in increasing order.
+                    The first and last samples are always included.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return np.array([], dtype=np.intp)
+
+    # The first sample of every run of equal values.
+    indices = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+    indices = _keep_extrema(values, indices)
+
+    while len(indices) > 2:
+        ranges = np.abs(np.diff(values[indices]))
+        small = ranges < hysteresis
+        if not small.any():
+            break
+        left = np.concatenate(([np.inf], ranges[:-1]))
+        right = np.concatenate((ranges[1:], [np.inf]))
+        pairs = np.flatnonzero(small & (ranges <= left) & (ranges < right))
+        remove = np.zeros(len(indices), dtype=bool)
+        remove[pairs] = True
+        remove[pairs + 1] = True
+        remove[0] = remove[-1] = False
+        indices = _keep_extrema(values, indices[~remove])
+    return indices
+
+
+def find_cycle_boundaries(values: np.ndarray, hysteresis: float = 0.0) -> np.ndarray:
+    """
+    Finds the sample indices where cycles of a signal start.
+
+    A cycle runs from one valley of the signal to the next, so N + 1
+    boundaries delimit N complete cycles. Partial cycles before the first and
+    after the last valley are not included.
+
+    Args:
+        values (np.ndarray): The signal samples, in time order.
+        hysteresis (float): The smallest reversal (in signal units) that counts.
+
+    Returns:
+        np.ndarray: The sample indices of the valleys, in increasing order.
+    """
+    values = np.asarray(values, dtype=float)
+    turning = find_turning_points(values, hysteresis)
+    if len(turning) < 2:
+        return np.array([], dtype=np.intp)
+    v = values[turning]
+    # Turning points alternate, so every point lower than its successor is a
+    # valley; the last point is one if it is lower than its predecessor.
+    is_valley = np.concatenate((v[:-1] < v[1:], [v[-1] < v[-2]]))
+    return turning[is_valley]
+
+
+def _per_cycle(ufunc: np.ufunc, values: np.ndarray, boundaries: np.ndarray) -> np.ndarray:
+    """Reduces `values` over each cycle [boundaries[i], boundaries[i + 1]) with `ufunc`."""
+    return ufunc.reduceat(values[: boundaries[-1]], boundaries[:-1])
+
+
+def loop_areas(x: np.ndarray, y: np.ndarray, boundaries: np.ndarray) -> np.ndarray:
+    """
+    Computes the area enclosed by the y-x loop of each cycle.
+
+    The area is the trapezoidal integral of y dx along the cycle, closed by a
+    straight segment from the cycle's last sample back to its first. For a
+    load-displacement or stress-strain loop it is the energy dissipated in the
+    cycle.
+
+    Args:
+        x (np.ndarray): The x samples (e.g. strain), in time order.
+        y (np.ndarray): The y samples (e.g. stress), in time order.
+        boundaries (np.ndarray): The cycle boundaries from `find_cycle_boundaries`.
+
+    Returns:
+        np.ndarray: The absolute loop area of each cycle (in units of x * y).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    increments = 0.5 * (y[1:] + y[:-1]) * np.diff(x)
+    areas = _per_cycle(np.add, increments, boundaries)
+    start, end = boundaries[:-1], boundaries[1:]
+    areas += 0.5 * (y[end] + y[start]) * (x[start] - x[end])
+    return np.abs(areas)
+
+
+def _range_ratio(
+    y_max: np.ndarray, y_min: np.ndarray, x_max: np.ndarray, x_min: np.ndarray
+) -> np.ndarray:
+    """Returns (y_max - y_min) / (x_max - x_min), with NaN where the x range is zero."""
+    x_range = x_max - x_min
+    ratio = np.full(len(x_range), np.nan)
+    np.divide(y_max - y_min, x_range, out=ratio, where=x_range != 0)
+    return ratio
+
+
+def compute_cycle_metrics(
+    columns: Mapping[str, Any], boundaries: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Computes the per-cycle metrics of the available columns.
+
+    Force and displacement give the peak and valley force, the secant stiffness
+    (force range over displacement range) and the dissipated energy. Axial
+    stress and strain, if present, give the peak, valley, amplitude and mean
+    stress, the strain amplitude and the dissipated energy density.
+
+    Args:
+        columns (Mapping[str, Any]): The phase columns by standard name.
+        boundaries (np.ndarray): The cycle boundaries from `find_cycle_boundaries`
+                                 (at least two).
+
+    Returns:
+        Dict[str, np.ndarray]: One array per metric column, with one value per cycle.
+    """
+    n_cycles = len(boundaries) - 1
+    metrics: Dict[str, np.ndarray] = {CYCLE_COL: np.arange(1, n_cycles + 1)}
+    if TIME_COL in columns:
+        metrics[CYCLE_START_TIME_COL] = np.asarray(columns[TIME_COL], dtype=float)[boundaries[:-1]]
+
+    if FORCE_COL in columns:
+        force = np.asarray(columns[FORCE_COL], dtype=float)
+        peak_force = _per_cycle(np.fmax, force, boundaries)
+        valley_force = _per_cycle(np.fmin, force, boundaries)
+        metrics[PEAK_FORCE_COL] = peak_force
+        metrics[VALLEY_FORCE_COL] = valley_force
+        if POSITION_COL in columns:
+            position = np.asarray(columns[POSITION_COL], dtype=float)
+            metrics[CYCLE_STIFFNESS_COL] = _range_ratio(
+                peak_force,
+                valley_force,
+                _per_cycle(np.fmax, position, boundaries),
+                _per_cycle(np.fmin, position, boundaries),
+            )
+            # N x mm = mJ
+            metrics[CYCLE_ENERGY_COL] = loop_areas(position, force, boundaries)
+
+    if AXIAL_STRESS_MPA_COL in columns and AXIAL_STRAIN_COL in columns:
+        stress = np.asarray(columns[AXIAL_STRESS_MPA_COL], dtype=float)
+        strain = np.asarray(columns[AXIAL_STRAIN_COL], dtype=float)
+        peak_stress = _per_cycle(np.fmax, stress, boundaries)
+        valley_stress = _per_cycle(np.fmin, stress, boundaries)
+        strain_max = _per_cycle(np.fmax, strain, boundaries)
+        strain_min = _per_cycle(np.fmin, strain, boundaries)
+        metrics[PEAK_STRESS_COL] = peak_stress
+        metrics[VALLEY_STRESS_COL] = valley_stress
+        metrics[STRESS_AMPLITUDE_COL] = 0.5 * (peak_stress - valley_stress)
+        metrics[MEAN_STRESS_COL] = 0.5 * (peak_stress + valley_stress)
+        metrics[STRAIN_AMPLITUDE_COL] = 0.5 * (strain_max - strain_min)
+        # MPa x strain = MJ/m³
+        metrics[CYCLE_ENERGY_DENSITY_COL] = loop_areas(strain, stress, boundaries)
+
+    return metrics
+
+
+def calculate_cycle_properties(
+    df: pd.DataFrame,
+    geometry: Dict[str, Any],
+    signal: str = "position",
+    hysteresis: Optional[float] = None,
+    hysteresis_fraction: float = 0.1,
+) -> pd.DataFrame:
+    """
+    Summarizes a cyclic test phase as a table with one row per cycle.
+
+    Axial stress and strain are calculated first (as for an AXIAL phase) if the
+    geometry allows it. Cycles are then detected from the `signal` channel and
+    reduced to the metrics of `compute_cycle_metrics`.
+
+    Args:
+        df (pd.DataFrame): The standardized data of the phase.
+        geometry (Dict[str, Any]): A dictionary containing geometry parameters,
+                                   e.g., 'axial_width_mm', 'axial_thickness_mm', 'gauge_length_mm'.
+        signal (str): The Data Column Registry key of the channel that defines the
+                      cycles, typically the command signal.
+        hysteresis (Optional[float]): The smallest reversal of `signal` (in its
+                                      standard units) that counts. If None,
+                                      `hysteresis_fraction` of the signal's range is used.
+        hysteresis_fraction (float): The hysteresis as a fraction of the signal's range.
+
+    Returns:
+        pd.DataFrame: The per-cycle table, with a 'Cycle' column numbered from 1.
+                      Empty if fewer than one complete cycle is found.
+
+    Raises:
+        KeyError: If the signal is not in the registry or not in the data.
+    """
+    signal_col = config_defaults.DATA_COLUMN_REGISTRY[signal]["standard_name"]
+    if signal_col not in df.columns:
+        raise KeyError(
+            f"Column '{signal_col}' is required for cycle detection. "
+            f"Available columns: {df.columns.tolist()}"
+        )
+
+    values = df[signal_col].to_numpy(dtype=float)
+    if hysteresis is None:
+        hysteresis = hysteresis_fraction * float(np.nanmax(values) - np.nanmin(values))
+    boundaries = find_cycle_boundaries(values, hysteresis)
+    if len(boundaries) < 2:
+        logging.warning(f"No complete cycle found in '{signal_col}' (hysteresis {hysteresis:g}).")
+        return pd.DataFrame()
+
+    columns: Dict[str, Any] = dict(df.items())
+    columns.update(compute_axial_properties(df, geometry))
+    table = pd.DataFrame(compute_cycle_metrics(columns, boundaries))
+    logging.info(f"Detected {len(table)} cycle(s) in '{signal_col}' (hysteresis {hysteresis:g}).")
+    return table
@@ -0,0 +1,212 @@
+"""
+This module provides an on-disk cache for standardized test data.
+
+Parsing and standardizing a large raw export is the most expensive part of a
+workflow run, yet its result only depends on the raw file and on the
+'column_sources', 'inversion_flags' and 'tare_options' in effect. This module
+stores the standardized DataFrame as one `.npy` file per column, keyed by a
+hash of exactly those inputs, so later runs can memory-map it instead of
+re-reading the CSV. The cache is bounded in size; the least recently used
+entries are evicted first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Bump when the on-disk layout changes so that stale entries are never reused.
+CACHE_FORMAT_VERSION = 1
+_META_FILENAME = "meta.json"
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def _hash_file(file_path: str) -> str:
+    """Returns the BLAKE2b digest of a file's contents, read in blocks."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def compute_cache_key(file_path: str, settings: Dict[str, Any]) -> str:
+    """
+    Computes the content-addressed cache key for a data file.
+
+    Args:
+        file_path (str): The full path to the raw data file.
+        settings (Dict[str, Any]): The settings the standardized data depends on
+                                   (e.g. 'column_sources', 'inversion_flags',
+                                   'tare_options'). Must be JSON-serializable.
+
+    Returns:
+        str: A hexadecimal key that changes whenever the file contents or any
+             of the settings change.
+    """
+    payload = json.dumps(
+        {"version": CACHE_FORMAT_VERSION, "settings": settings}, sort_keys=True, default=str
+    )
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(_hash_file(file_path).encode())
+    digest.update(payload.encode())
+    return digest.hexdigest()
+
+
+def load_cached_data(cache_dir: str, key: str) -> Optional[pd.DataFrame]:
+    """
+    Loads a cached standardized DataFrame, memory-mapping its columns.
+
+    The returned columns are read-only views of the cached `.npy` files, so a
+    cache hit costs no parsing and almost no memory until the data is touched.
+
+    Args:
+        cache_dir (str): The cache directory.
+        key (str): The cache key from `compute_cache_key`.
+
+    Returns:
+        Optional[pd.DataFrame]: The cached data, or None on a cache miss.
+    """
+    entry_dir = os.path.join(cache_dir, key)
+    meta_path = os.path.join(entry_dir, _META_FILENAME)
+    if not os.path.exists(meta_path):
+        return None
+
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        columns = {
+            name: np.load(os.path.join(entry_dir, filename), mmap_mode="r")
+            for name, filename in meta["columns"]
+        }
+    except (OSError, ValueError, KeyError) as e:
+        logging.warning(f"Ignoring unreadable cache entry '{key}': {e}")
+        return None
+
+    # Refresh the access time used for least-recently-used eviction.
+    os.utime(meta_path, None)
+    logging.info(f"Loaded standardized data from cache (entry '{key[:12]}').")
+    return pd.DataFrame(columns, copy=False)
+
+
+def store_cached_data(
+    cache_dir: str, key: str, df: pd.DataFrame, source_path: Optional[str] = None
+) -> None:
+    """
+    Stores a standardized DataFrame in the cache, one `.npy` file per column.
+
+    The entry is written to a temporary directory first and then moved into
+    place, so concurrent readers never see a partially written entry.
+
+    Args:
+        cache_dir (str): The cache directory. Created if it does not exist.
+        key (str): The cache key from `compute_cache_key`.
+        df (pd.DataFrame): The standardized data to store.
+        source_path (Optional[str]): The raw file the data came from. Recorded so
+                                     that `invalidate_cache` can target it.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    entry_dir = os.path.join(cache_dir, key)
+    if os.path.exists(entry_dir):
+        return
+
+    tmp_dir = tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=cache_dir)
+    try:
+        columns: List[Tuple[str, str]] = []
+        for i, name in enumerate(df.columns):
+            filename = f"col_{i:03d}.npy"
+            np.save(os.path.join(tmp_dir, filename), df[name].to_numpy())
+            columns.append((name, filename))
+        meta = {
+            "version": CACHE_FORMAT_VERSION,
+            "source_path": os.path.abspath(source_path) if source_path else None,
+            "columns": columns,
+        }
+        with open(os.path.join(tmp_dir, _META_FILENAME), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_dir, entry_dir)
+    except OSError as e:
+        logging.warning(f"Could not write cache entry '{key}': {e}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return
+    logging.info(f"Stored standardized data in cache (entry '{key[:12]}').")
+
+
+def _list_entries(cache_dir: str) -> List[Tuple[str, float, int]]:
+    """Returns (entry_dir, last_access_time, size_bytes) for every complete cache entry."""
+    entries = []
+    if not os.path.isdir(cache_dir):
+        return entries
+    for name in os.listdir(cache_dir):
+        entry_dir = os.path.join(cache_dir, name)
+        meta_path = os.path.join(entry_dir, _META_FILENAME)
+        if name.startswith(".") or not os.path.exists(meta_path):
+            continue
+        try:
+            size = sum(
+                os.path.getsize(os.path.join(entry_dir, filename))
+                for filename in os.listdir(entry_dir)
+            )
+            entries.append((entry_dir, os.path.getmtime(meta_path), size))
+        except OSError:
+            continue  # Evicted by another process (e.g. a batch worker) meanwhile
+    return entries
+
+
+def evict_cache(cache_dir: str, max_size_bytes: int) -> int:
+    """
+    Removes least recently used entries until the cache fits in `max_size_bytes`.
+
+    Args:
+        cache_dir (str): The cache directory.
+        max_size_bytes (int): The maximum total size of all entries.
+
+    Returns:
+        int: The number of entries removed.
+    """
+    entries = sorted(_list_entries(cache_dir), key=lambda entry: entry[1])
+    total_size = sum(size for _, _, size in entries)
+    removed = 0
+    for entry_dir, _, size in entries:
+        if total_size <= max_size_bytes:
+            break
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        total_size -= size
+        removed += 1
+    if removed:
+        logging.info(f"Evicted {removed} cache entr{'y' if removed == 1 else 'ies'}.")
+    return removed
+
+
+def invalidate_cache(cache_dir: str, file_path: Optional[str] = None) -> int:
+    """
+    Explicitly removes cache entries.
+
+    Args:
+        cache_dir (str): The cache directory.
+        file_path (Optional[str]): If given, only entries built from this raw file
+                                   are removed. Otherwise the whole cache is cleared.
+
+    Returns:
+        int: The number of entries removed.
+    """
+    target = os.path.abspath(file_path) if file_path else None
+    removed = 0
+    for entry_dir, _, _ in _list_entries(cache_dir):
+        if target is not None:
+            try:
+                with open(os.path.join(entry_dir, _META_FILENAME), "r", encoding="utf-8") as f:
+                    if json.load(f).get("source_path") != target:
+                        continue
+            except (OSError, ValueError):
+                pass  # Unreadable entries are always removed
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        removed += 1
+    logging.info(f"Invalidated {removed} cache entr{'y' if removed == 1 else 'ies'}.")
+    return removed
@@ -0,0 +1,401 @@
+"""
+This module detects and repairs spikes and dropouts in standardized channels.
+
+Transducer spikes (isolated samples far from their neighbors) and dropouts
+(NaN or infinite samples) break least-squares fits and stretch plot axes. Each
+channel is checked with a Hampel-type test: a sample is a spike if it deviates
+from the rolling median by more than `threshold` times the local noise level.
+The noise level is the rolling mean absolute deviation (MAD) from the median
+over a longer `scale_window`, which is O(N) with cumulative sums and, unlike a
+median absolute deviation over a few samples, stable enough for a high
+threshold to have almost no false positives. Where the signal changes faster
+than its noise, the mean step between samples sets the level instead. The
+rolling median is vectorized (see `signal_processing.rolling_median`), so the
+check is cheap enough to run on full-rate data by default.
+
+Flagged samples are repaired by linear interpolation from the neighboring good
+samples, masked as NaN, or only reported, and a per-channel summary counts them.
+Only dropout gaps of at most `max_gap` samples with good samples on both sides
+are interpolated. Gaps at the start or end of the data and longer gaps (e.g. a
+removed extensometer) are left as NaN instead of being bridged by a made-up line.
+
+Like `signal_processing.ChannelPreprocessor`, `QualityChecker` works on whole
+data or on chunks: it holds back the last rows of each chunk until their
+context has arrived, so the flags and repairs are the same either way (up to rounding).
+"""
+
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from matmech import config_defaults
+from matmech.constants import (
+    QUALITY_CHANNEL_COL,
+    QUALITY_DROPOUTS_COL,
+    QUALITY_FLAGGED_PCT_COL,
+    QUALITY_SAMPLES_COL,
+    QUALITY_SPIKES_COL,
+    TIME_COL,
+)
+from matmech.signal_processing import moving_average, rolling_median
+
+# Scales the mean absolute deviation to the standard deviation of normal noise (sqrt(pi / 2)).
+MAD_TO_STD = 1.2533
+
+REPAIR_METHODS = ("interpolate", "mask", "none")
+
+
+def repairable_gaps(dropouts: np.ndarray, max_gap: int) -> np.ndarray:
+    """
+    Marks the dropouts that can be repaired by interpolation.
+
+    Args:
+        dropouts (np.ndarray): The boolean dropout mask of a channel.
+        max_gap (int): The longest run of dropouts that is repaired.
+
+    Returns:
+        np.ndarray: A boolean mask of the dropouts in runs of at most `max_gap`
+                    samples with a good sample on both sides.
+    """
+    repairable = np.zeros(len(dropouts), dtype=bool)
+    if not dropouts.any():
+        return repairable
+    edges = np.diff(dropouts.astype(np.int8), prepend=0, append=0)
+    starts, stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    interior = (starts > 0) & (stops < len(dropouts)) & (stops - starts <= max_gap)
+    for start, stop in zip(starts[interior], stops[interior]):
+        repairable[start:stop] = True
+    return repairable
+
+
+def find_outliers(
+    values: np.ndarray,
+    window: int,
+    scale_window: int,
+    threshold: float,
+    min_deviation: float = 0.0,
+    max_gap: int = 50,
+    previous: Optional[float] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Flags the dropouts and spikes of a channel.
+
+    Dropouts are filled before the rolling medians are computed, so that they do
+    not bias them: repairable gaps (see `repairable_gaps`) by linear interpolation,
+    and all other gaps with the last good value before them (or the first one
+    after them at the start of the data). The fill only depends on earlier
+    samples, so it is the same when the data arrives in chunks.
+
+    Args:
+        values (np.ndarray): The channel samples, in time order.
+        window (int): The rolling median window length in samples (odd).
+        scale_window (int): The window length of the rolling mean absolute deviation.
+        threshold (float): The number of noise standard deviations a spike
+                           deviates from the rolling median.
+        min_deviation (float): The smallest deviation that counts as a spike,
+                               for signals whose MAD can be zero (e.g. noise-free ones).
+        max_gap (int): The longest run of dropouts that is interpolated.
+        previous (Optional[float]): The last good value before `values`, if any.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Boolean masks of the dropouts and the spikes.
+    """
+    x = np.asarray(values, dtype=float)
+    dropouts = ~np.isfinite(x)
+    if dropouts.all():
+        return dropouts, np.zeros(len(x), dtype=bool)
+    if dropouts.any():
+        good = np.flatnonzero(~dropouts)
+        x = x.copy()
+        repairable = repairable_gaps(dropouts, max_gap)
+        x[repairable] = np.interp(np.flatnonzero(repairable), good, x[good])
+        unrepairable = dropouts & ~repairable
+        if unrepairable.any():
+            last_good = np.maximum.accumulate(np.where(dropouts, -1, np.arange(len(x))))
+            leading = x[good[0]] if previous is None else previous
+            x[unrepairable] = np.where(last_good >= 0, x[last_good], leading)[unrepairable]
+
+    deviation = np.abs(x - rolling_median(x, window))
+    noise_std = MAD_TO_STD * moving_average(deviation, scale_window)
+    # Where the signal changes faster than its noise (e.g. a ramp), the median
+    # follows it exactly and the MAD is tiny, so the typical step between
+    # samples sets the scale instead.
+    steps = np.abs(np.diff(x, prepend=x[:1]))
+    scale = np.maximum(noise_std, moving_average(steps, scale_window))
+    return dropouts, (deviation > np.maximum(threshold * scale, min_deviation)) & ~dropouts
+
+
+class QualityChecker:
+    """
+    Flags and repairs spikes and dropouts in standardized data, whole or in chunks.
+
+    All numeric columns except time are checked. Call `process` for each chunk
+    in order and `flush` after the last one (or pass `last=True` with the last
+    chunk). A row is held back until the samples its rolling medians need have
+    arrived and, if it is repaired, until the good sample after it is known.
+    Gaps that are not repaired do not hold rows back, so a channel that stays
+    NaN (e.g. a removed extensometer) does not stall the stream.
+    `summary` returns the counts of the rows returned so far.
+
+    Args:
+        window (int): The rolling median window length in samples (odd, at least 3).
+        scale_window (int): The window length of the rolling mean absolute deviation.
+        threshold (float): The number of noise standard deviations a spike
+                           deviates from the rolling median.
+        min_deviation (Optional[Dict[str, float]]): The smallest spike deviation
+                        per standard column name (default 0).
+        repair (str): "interpolate", "mask" or "none".
+        max_gap (int): The longest run of dropouts that is interpolated. Longer
+                       gaps and gaps at the start or end of the data become NaN.
+        time_col (str): The name of the standardized time column (not checked).
+
+    Raises:
+        ValueError: If the window is even or too short, or the repair method is unknown.
+    """
+
+    def __init__(
+        self,
+        window: int = 7,
+        scale_window: int = 51,
+        threshold: float = 6.0,
+        min_deviation: Optional[Dict[str, float]] = None,
+        repair: str = "interpolate",
+        max_gap: int = 50,
+        time_col: str = TIME_COL,
+    ) -> None:
+        if window < 3 or window % 2 == 0:
+            raise ValueError(f"The quality check window must be odd and at least 3, got {window}.")
+        if repair not in REPAIR_METHODS:
+            raise ValueError(
+                f"Unknown repair method '{repair}'. Choose one of: {', '.join(REPAIR_METHODS)}."
+            )
+        self.window = window
+        self.scale_window = scale_window
+        self.threshold = threshold
+        self.min_deviation = dict(min_deviation or {})
+        self.repair = repair
+        self.max_gap = max_gap
+        self.time_col = time_col
+        # The median at a row needs window // 2 samples on each side, and the
+        # MAD needs the deviations of scale_window // 2 rows on each side.
+        self.radius = window // 2 + scale_window // 2
+        self._tail: Optional[pd.DataFrame] = None
+        self._tail_start = 0
+        self._emitted = 0
+        self._counts: Dict[str, np.ndarray] = {}
+        # The last good value of each channel before the tail, which fills a
+        # long gap that the tail starts in.
+        self._previous: Dict[str, float] = {}
+
+    def _final_stop(
+        self, flags: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]], first: int, length: int
+    ) -> int:
+        """Returns the end of the rows of a non-last chunk whose flags and repairs are final."""
+        stop = length - self.radius
+        for dropouts, _, _ in flags.values():
+            # A short gap at the end may still be interpolated once a good sample
+            # arrives, which changes its fill and the statistics around it.
+            good = np.flatnonzero(~dropouts)
+            if len(good) and good[-1] < length - 1 and length - 1 - good[-1] <= self.max_gap:
+                stop = min(stop, good[-1] + 1 - self.radius)
+        stop = max(stop, first)
+
+        # A repaired row is interpolated from the rows around it, so end on a
+        # row that is not repaired in any channel.
+        changed = True
+        while changed:
+            changed = False
+            for _, spikes, repairable in flags.values():
+                repaired = spikes[:stop] | repairable[:stop]
+                if stop > first and repaired[-1]:
+                    kept = np.flatnonzero(~repaired)
+                    stop = max(kept[-1] + 1 if len(kept) else 0, first)
+                    changed = True
+        return stop
+
+    def _repair(
+        self,
+        values: np.ndarray,
+        flags: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        first: int,
+        stop: int,
+    ) -> np.ndarray:
+        """Returns the rows [first, stop) of a channel with its bad rows repaired."""
+        dropouts, spikes, repairable = flags
+        rows = values[first:stop]
+        if self.repair == "none" or not (dropouts[first:stop].any() or spikes[first:stop].any()):
+            return rows
+        rows = rows.astype(np.result_type(values.dtype, np.float32))
+        if self.repair == "mask":
+            rows[dropouts[first:stop] | spikes[first:stop]] = np.nan
+            return rows
+        rows[(dropouts & ~repairable)[first:stop]] = np.nan
+        repaired = spikes | repairable
+        rows_repaired = repaired[first:stop]
+        if rows_repaired.any():
+            # Gaps that are not repaired are NaN anchors, so a spike next to one
+            # stays NaN rather than being bridged across the gap.
+            anchors = np.flatnonzero(~repaired[:stop])
+            anchor_values = np.where(dropouts[anchors], np.nan, values[anchors])
+            rows[rows_repaired] = (
+                np.interp(np.flatnonzero(rows_repaired) + first, anchors, anchor_values)
+                if len(anchors)
+                else np.nan
+            )
+        return rows
+
+    def process(self, chunk: Optional[pd.DataFrame], last: bool = False) -> pd.DataFrame:
+        """
+        Checks and repairs the next chunk of standardized data.
+
+        Args:
+            chunk (Optional[pd.DataFrame]): The next rows, in time order.
+            last (bool): Whether this is the last chunk. If so, no rows are held back.
+
+        Returns:
+            pd.DataFrame: The checked rows that are final. May be empty while rows are held back.
+        """
+        pieces = [piece for piece in (self._tail, chunk) if piece is not None and not piece.empty]
+        if not pieces:
+            return pd.DataFrame()
+        data = pd.concat(pieces) if len(pieces) > 1 else pieces[0]
+
+        flags: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        for name in data.columns:
+            if name != self.time_col and pd.api.types.is_numeric_dtype(data[name]):
+                dropouts, spikes = find_outliers(
+                    data[name].to_numpy(),
+                    self.window,
+                    self.scale_window,
+                    self.threshold,
+                    self.min_deviation.get(name, 0.0),
+                    self.max_gap,
+                    self._previous.get(name),
+                )
+                flags[name] = (dropouts, spikes, repairable_gaps(dropouts, self.max_gap))
+
+        first = self._emitted - self._tail_start
+        stop = len(data) if last else self._final_stop(flags, first, len(data))
+
+        columns: Dict[str, np.ndarray] = {}
+        for name in data.columns:
+            values = data[name].to_numpy()
+            if name not in flags:
+                columns[name] = values[first:stop]
+                continue
+            dropouts, spikes, _ = flags[name]
+            counts = self._counts.setdefault(name, np.zeros(3, dtype=np.int64))
+            counts += [stop - first, spikes[first:stop].sum(), dropouts[first:stop].sum()]
+            columns[name] = self._repair(values, flags[name], first, stop)
+        result = pd.DataFrame(columns, index=data.index[first:stop], copy=False)
+
+        self._emitted = self._tail_start + stop
+        if last:
+            self._tail = None
+            return result
+        # Keep the context of the last returned row. A repairable gap is kept
+        # whole, with the good sample before it, so that it is filled as before.
+        keep_from = max(0, stop - self.radius - 1)
+        changed = True
+        while changed:
+            changed = False
+            for dropouts, _, repairable in flags.values():
+                if repairable[keep_from]:
+                    keep_from = int(np.flatnonzero(~dropouts[:keep_from])[-1])
+                    changed = True
+        for name, (dropouts, _, _) in flags.items():
+            good = np.flatnonzero(~dropouts[:keep_from])
+            if len(good):
+                self._previous[name] = float(data[name].to_numpy()[good[-1]])
+        self._tail = data.iloc[keep_from:]
+        self._tail_start += keep_from
+        return result
+
+    def flush(self) -> pd.DataFrame:
+        """
+        Returns the rows still held back, after the last chunk.
+
+        Returns:
+            pd.DataFrame: The remaining checked rows.
+        """
+        return self.process(None, last=True)
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Summarizes the spikes and dropouts found so far.
+
+        Returns:
+            pd.DataFrame: One row per checked channel with the number of samples,
+                          spikes and dropouts, and the flagged percentage.
+        """
+        rows = []
+        for name, (samples, spikes, dropouts) in self._counts.items():
+            rows.append({
+                QUALITY_CHANNEL_COL: name,
+                QUALITY_SAMPLES_COL: int(samples),
+                QUALITY_SPIKES_COL: int(spikes),
+                QUALITY_DROPOUTS_COL: int(dropouts),
+                QUALITY_FLAGGED_PCT_COL: 100.0 * (spikes + dropouts) / samples if samples else 0.0,
+            })
+        return pd.DataFrame(
+            rows,
+            columns=[
+                QUALITY_CHANNEL_COL,
+                QUALITY_SAMPLES_COL,
+                QUALITY_SPIKES_COL,
+                QUALITY_DROPOUTS_COL,
+                QUALITY_FLAGGED_PCT_COL,
+            ],
+        )
+
+
+def build_quality_checker(config: Dict[str, Any]) -> Optional[QualityChecker]:
+    """
+    Creates the quality checker of a workflow configuration.
+
+    Args:
+        config (Dict[str, Any]): The workflow configuration, with optional
+                                 'quality_options' overriding
+                                 `config_defaults.DEFAULT_QUALITY_OPTIONS`.
+
+    Returns:
+        Optional[QualityChecker]: The checker, or None if the check is disabled.
+    """
+    options = {**config_defaults.DEFAULT_QUALITY_OPTIONS, **config.get("quality_options", {})}
+    if not options["enabled"]:
+        return None
+    min_deviation = {
+        config_defaults.DATA_COLUMN_REGISTRY[key]["standard_name"]: value
+        for key, value in options["min_deviation"].items()
+    }
+    return QualityChecker(
+        options["window"],
+        options["scale_window"],
+        options["threshold"],
+        min_deviation,
+        options["repair"],
+        options["max_gap"],
+    )
+
+
+def check_data_quality(
+    df: pd.DataFrame, **quality_options: Any
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Checks and repairs complete standardized data.
+
+    Args:
+        df (pd.DataFrame): The standardized data.
+        **quality_options: Keyword arguments of `QualityChecker`.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The repaired data and the per-channel summary.
+    """
+    checker = QualityChecker(**quality_options)
+    repaired = checker.process(df, last=True)
+    summary = checker.summary()
+    flagged = int(summary[QUALITY_SPIKES_COL].sum() + summary[QUALITY_DROPOUTS_COL].sum())
+    logging.info(f"Data quality check flagged {flagged} sample(s) in {len(summary)} channel(s).")
+    return repaired, summary
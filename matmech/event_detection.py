@@ -0,0 +1,161 @@
+"""
+This module provides automatic detection of test phase boundaries from the
+recorded signals, as an alternative to hand-entered 'end_time' values.
+
+Boundaries are placed where the command signal (e.g. position or rotation)
+changes between loading, unloading and holding, and where the load drops
+sharply at specimen failure. Every step is a vectorized pass over the arrays,
+so detection runs in linear time.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from matmech import config_defaults
+from matmech.signal_processing import moving_average
+
+
+def detect_phase_boundaries(
+    time: np.ndarray,
+    command: np.ndarray,
+    load: Optional[np.ndarray] = None,
+    rate_threshold: float = 0.05,
+    smoothing_window: int = 25,
+    min_phase_duration_s: float = 0.0,
+    failure_drop: Optional[float] = None,
+    failure_window: int = 5,
+) -> np.ndarray:
+    """
+    Detects phase end times from changes in the command signal and load drops.
+
+    Each sample is classified as loading (rate above `rate_threshold` times the
+    peak absolute rate), unloading (rate below minus that), or holding. A phase
+    ends wherever the classification changes. Runs shorter than
+    `min_phase_duration_s` are merged into the preceding phase so that noise
+    around a reversal does not create spurious phases. If `failure_drop` is
+    set, the first time |load| falls by more than `failure_drop` times its
+    running maximum within `failure_window` samples marks failure: the phase
+    ends at the last sample before the drop, later rate changes are ignored,
+    and the remaining samples form one final phase.
+
+    Args:
+        time (np.ndarray): The time values (s), in increasing order.
+        command (np.ndarray): The command signal, e.g. position or rotation.
+        load (Optional[np.ndarray]): The load signal used for failure detection.
+        rate_threshold (float): The fraction of the peak absolute rate below
+                                which the signal counts as holding.
+        smoothing_window (int): The moving-average window (samples) applied to
+                                the command signal before differentiating it.
+        min_phase_duration_s (float): The minimum duration of a detected phase.
+        failure_drop (Optional[float]): The relative load drop that marks failure
+                                        (e.g. 0.5 for a 50% drop). None disables
+                                        failure detection.
+        failure_window (int): The number of samples within which the load must
+                              drop to count as failure.
+
+    Returns:
+        np.ndarray: The end time of each detected phase, in increasing order.
+                    The last entry is the last time value. Empty for empty input.
+    """
+    time = np.asarray(time, dtype=float)
+    n = len(time)
+    if n == 0:
+        return np.array([])
+    if n < 3:
+        return time[-1:].copy()
+
+    # Classify every sample as loading (+1), unloading (-1) or holding (0).
+    smoothed = moving_average(command, smoothing_window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.nan_to_num(np.gradient(smoothed, time), nan=0.0, posinf=0.0, neginf=0.0)
+    peak_rate = np.max(np.abs(rate))
+    state = np.zeros(n, dtype=np.int8)
+    if peak_rate > 0:
+        active = np.abs(rate) > rate_threshold * peak_rate
+        state[active] = np.sign(rate[active])
+
+    # Run-length encode the states and merge runs that are too short.
+    starts = np.concatenate(([0], np.flatnonzero(state[1:] != state[:-1]) + 1))
+    ends = np.concatenate((starts[1:], [n]))
+    keep = (time[ends - 1] - time[starts]) >= min_phase_duration_s
+    keep[0] = True
+    starts = starts[keep]
+    run_states = state[starts]
+    starts = starts[np.concatenate(([True], run_states[1:] != run_states[:-1]))]
+    boundary_indices = np.concatenate((starts[1:] - 1, [n - 1]))
+
+    if load is not None and failure_drop is not None and n > failure_window:
+        magnitude = np.abs(np.asarray(load, dtype=float))
+        running_max = np.maximum.accumulate(magnitude)
+        # A drop of failure_drop x the running peak within failure_window samples;
+        # a gradual unloading is spread over many more samples and does not qualify.
+        dropped = (
+            magnitude[:-failure_window] - magnitude[failure_window:]
+            > failure_drop * running_max[:-failure_window]
+        )
+        if dropped.any():
+            failure_index = int(np.argmax(dropped)) + failure_window - 1
+            logging.info(f"Detected specimen failure at t={time[failure_index]:.3f}s.")
+            boundary_indices = np.concatenate(
+                (boundary_indices[boundary_indices < failure_index], [failure_index, n - 1])
+            )
+
+    return time[np.unique(boundary_indices)]
+
+
+def detect_split_points(df: pd.DataFrame, options: Dict[str, Any]) -> List[float]:
+    """
+    Detects phase end times in standardized data, for use with `split_data_by_time`.
+
+    Args:
+        df (pd.DataFrame): The standardized data.
+        options (Dict[str, Any]): The auto-segmentation options (see
+                                  `config_defaults.DEFAULT_AUTO_SEGMENTATION_OPTIONS`).
+                                  'command' and 'failure_signal' are keys of the
+                                  Data Column Registry.
+
+    Returns:
+        List[float]: The detected end time of each phase.
+
+    Raises:
+        KeyError: If the time or command column is missing from the data.
+    """
+    registry = config_defaults.DATA_COLUMN_REGISTRY
+    time_col = registry["time"]["standard_name"]
+    command_col = registry[options["command"]]["standard_name"]
+    for col in (time_col, command_col):
+        if col not in df.columns:
+            raise KeyError(
+                f"Column '{col}' is required for automatic phase detection. "
+                f"Available columns: {df.columns.tolist()}"
+            )
+
+    load = None
+    failure_signal = options.get("failure_signal")
+    if failure_signal and options.get("failure_drop") is not None:
+        load_col = registry[failure_signal]["standard_name"]
+        if load_col in df.columns:
+            load = df[load_col].to_numpy()
+        else:
+            logging.warning(
+                f"Failure signal '{failure_signal}' not in data. Skipping failure detection."
+            )
+
+    end_times = detect_phase_boundaries(
+        df[time_col].to_numpy(),
+        df[command_col].to_numpy(),
+        load=load,
+        rate_threshold=options["rate_threshold"],
+        smoothing_window=options["smoothing_window"],
+        min_phase_duration_s=options["min_phase_duration_s"],
+        failure_drop=options.get("failure_drop"),
+        failure_window=options["failure_window"],
+    )
+    logging.info(
+        f"Detected {len(end_times)} phase(s) ending at t = "
+        + ", ".join(f"{t:.2f}s" for t in end_times)
+    )
+    return end_times.tolist()
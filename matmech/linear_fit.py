@@ -0,0 +1,388 @@
+"""
+This module provides least-squares line fits over x-windows of a curve.
+
+`prepare_fit_sums` sorts the points by x once and stores cumulative sums of
+x, y, x*y, x^2 and y^2. Any window [lower, upper] of x is then located with a
+binary search, and its slope, intercept and R² follow from differences of the
+sums, in O(log N) per window instead of a new O(N) fit. The sums are taken
+about the mean of the data, which keeps them well conditioned.
+
+`find_linear_region` uses the same sums to score a sliding window starting at
+every point at once, which finds the elastic region of a million-point curve in
+O(N log N).
+
+`rolling_slope` gives the local regression slope around every sample (e.g. a
+tangent modulus) in O(N) for any window length.
+"""
+
+import logging
+from typing import Any, Dict, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from matmech import config_defaults
+from matmech.constants import AUTO_FIT_BOUNDS
+
+
+class FitSums(NamedTuple):
+    """Sorted x values and centered prefix sums of one curve (see `prepare_fit_sums`)."""
+
+    x: np.ndarray
+    x_mean: float
+    y_mean: float
+    sum_x: np.ndarray
+    sum_y: np.ndarray
+    sum_xy: np.ndarray
+    sum_xx: np.ndarray
+    sum_yy: np.ndarray
+
+
+def prepare_fit_sums(x: Any, y: Any) -> FitSums:
+    """
+    Precomputes the prefix sums used by `fit_window` and `fit_windows`.
+
+    Points with a NaN coordinate are dropped. If x is not already sorted, the
+    points are sorted by x (stable), so windows are contiguous index ranges.
+
+    Args:
+        x (Any): The x values (array-like).
+        y (Any): The y values (array-like), of the same length.
+
+    Returns:
+        FitSums: The sorted x values, the data means, and the prefix sums of the
+                 centered values, each with a leading zero.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    if not valid.all():
+        x, y = x[valid], y[valid]
+    if len(x) > 1 and np.any(x[1:] < x[:-1]):
+        order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+
+    x_mean = float(x.mean()) if len(x) else 0.0
+    y_mean = float(y.mean()) if len(y) else 0.0
+    dx, dy = x - x_mean, y - y_mean
+
+    def prefix(values: np.ndarray) -> np.ndarray:
+        out = np.empty(len(values) + 1)
+        out[0] = 0.0
+        np.cumsum(values, out=out[1:])
+        return out
+
+    return FitSums(
+        x=x,
+        x_mean=x_mean,
+        y_mean=y_mean,
+        sum_x=prefix(dx),
+        sum_y=prefix(dy),
+        sum_xy=prefix(dx * dy),
+        sum_xx=prefix(dx * dx),
+        sum_yy=prefix(dy * dy),
+    )
+
+
+def window_indices(sums: FitSums, lower: Any, upper: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the [start, stop) index range of the points with lower <= x <= upper.
+
+    Args:
+        sums (FitSums): The precomputed sums.
+        lower (Any): The lower x bound(s). Scalar or array.
+        upper (Any): The upper x bound(s), broadcastable against `lower`.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The start and stop indices into `sums.x`.
+    """
+    start = np.searchsorted(sums.x, lower, side="left")
+    stop = np.searchsorted(sums.x, upper, side="right")
+    return start, np.maximum(stop, start)
+
+
+def fit_index_ranges(sums: FitSums, start: Any, stop: Any) -> Dict[str, np.ndarray]:
+    """
+    Fits a line to each index range [start, stop) of the sorted points.
+
+    All ranges are evaluated together from the prefix sums. Ranges with fewer
+    than two points, or whose x values are all equal, get NaN results.
+
+    Args:
+        sums (FitSums): The precomputed sums.
+        start (Any): The start index of each range. Scalar or array.
+        stop (Any): The stop index of each range, broadcastable against `start`.
+
+    Returns:
+        Dict[str, np.ndarray]: 'slope', 'intercept', 'r_squared' and 'n_points'
+                               for each range.
+    """
+    start = np.asarray(start, dtype=np.intp)
+    stop = np.asarray(stop, dtype=np.intp)
+    n = (stop - start).astype(float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sx = sums.sum_x[stop] - sums.sum_x[start]
+        sy = sums.sum_y[stop] - sums.sum_y[start]
+        # Centered second moments of the window
+        sxx = (sums.sum_xx[stop] - sums.sum_xx[start]) - sx * sx / n
+        sxy = (sums.sum_xy[stop] - sums.sum_xy[start]) - sx * sy / n
+        syy = (sums.sum_yy[stop] - sums.sum_yy[start]) - sy * sy / n
+
+        degenerate = (n < 2) | ~(sxx > 0)
+        slope = np.where(degenerate, np.nan, sxy / sxx)
+        intercept = (sums.y_mean + sy / n) - slope * (sums.x_mean + sx / n)
+        # A window with no variation in y is fitted exactly by a horizontal line.
+        r_squared = np.where(
+            degenerate, np.nan, np.where(syy > 0, np.clip(sxy * sxy / (sxx * syy), 0.0, 1.0), 1.0)
+        )
+
+    return {
+        "slope": slope,
+        "intercept": np.where(degenerate, np.nan, intercept),
+        "r_squared": r_squared,
+        "n_points": (stop - start),
+    }
+
+
+def fit_windows(sums: FitSums, lower: Any, upper: Any) -> Dict[str, np.ndarray]:
+    """
+    Fits a line to each x-window [lower, upper], vectorized over the windows.
+
+    Args:
+        sums (FitSums): The precomputed sums.
+        lower (Any): The lower x bound(s). Scalar or array.
+        upper (Any): The upper x bound(s), broadcastable against `lower`.
+
+    Returns:
+        Dict[str, np.ndarray]: 'slope', 'intercept', 'r_squared' and 'n_points'
+                               for each window (see `fit_index_ranges`).
+    """
+    start, stop = window_indices(sums, lower, upper)
+    return fit_index_ranges(sums, start, stop)
+
+
+def fit_window(
+    sums: FitSums, lower: Optional[float] = None, upper: Optional[float] = None
+) -> Optional[Dict[str, float]]:
+    """
+    Fits a line to the points with lower <= x <= upper.
+
+    Args:
+        sums (FitSums): The precomputed sums.
+        lower (Optional[float]): The lower x bound. None for no bound.
+        upper (Optional[float]): The upper x bound. None for no bound.
+
+    Returns:
+        Optional[Dict[str, float]]: 'slope', 'intercept', 'r_squared', 'n_points',
+                                    and the 'x_min'/'x_max' of the fitted points,
+                                    or None if fewer than two distinct x values
+                                    are in the window.
+    """
+    start, stop = window_indices(
+        sums, -np.inf if lower is None else lower, np.inf if upper is None else upper
+    )
+    result = fit_index_ranges(sums, start, stop)
+    if np.isnan(result["slope"]):
+        return None
+    return {
+        "slope": float(result["slope"]),
+        "intercept": float(result["intercept"]),
+        "r_squared": float(result["r_squared"]),
+        "n_points": int(result["n_points"]),
+        "x_min": float(sums.x[start]),
+        "x_max": float(sums.x[stop - 1]),
+    }
+
+
+def find_linear_region(
+    sums: FitSums,
+    min_span: float,
+    min_points: int = 10,
+    slope_fraction: float = 0.5,
+) -> Optional[Tuple[float, float]]:
+    """
+    Finds the x-window of at least `min_span` that is best described by a line.
+
+    A window of width `min_span` is placed at every point up to the maximum of
+    y and all of them are fitted together from the prefix sums. Only windows
+    with a positive (loading) slope are considered, so the steep load drop at
+    the end of a test to failure is never chosen. Windows that are less steep
+    than `slope_fraction` times the steepest one are discarded, so that the
+    stiff elastic region wins over a straight but flatter plastic region. Of
+    the remaining windows, the one with the highest R² is returned.
+
+    Args:
+        sums (FitSums): The precomputed sums.
+        min_span (float): The width of the candidate windows, in x units.
+        min_points (int): The minimum number of points in a candidate window.
+        slope_fraction (float): The minimum steepness relative to the steepest window.
+
+    Returns:
+        Optional[Tuple[float, float]]: The (lower, upper) x bounds of the chosen
+                                       window, or None if no window qualifies.
+    """
+    if len(sums.x) < 2 or not min_span > 0:
+        return None
+    # The centered y values in sorted order are the steps of their prefix sum.
+    peak = int(np.argmax(np.diff(sums.sum_y)))
+    x = sums.x[: peak + 1]
+
+    start = np.flatnonzero(x + min_span <= x[-1])
+    stop = np.searchsorted(x, x[start] + min_span, side="right")
+    enough = (stop - start) >= max(min_points, 2)
+    start, stop = start[enough], stop[enough]
+    if len(start) == 0:
+        return None
+
+    fits = fit_index_ranges(sums, start, stop)
+    slope, r_squared = fits["slope"], fits["r_squared"]
+    loading = np.where(np.isfinite(slope), slope, -np.inf)
+    steepest = loading.max()
+    if not steepest > 0:
+        return None
+    candidates = loading >= slope_fraction * steepest
+    best = int(np.argmax(np.where(candidates, r_squared, -np.inf)))
+    return float(x[start[best]]), float(x[stop[best] - 1])
+
+
+def resolve_fit_bounds(
+    sums: FitSums,
+    fit_bounds: Optional[Union[Sequence[float], str]],
+    auto_fit_options: Optional[Dict[str, Any]] = None,
+) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Turns a 'fit_bounds' setting into the (lower, upper) x bounds of a fit.
+
+    Args:
+        sums (FitSums): The precomputed sums of the curve.
+        fit_bounds (Optional[Union[Sequence[float], str]]): (min_x, max_x) in either
+                        order, "auto" to detect the linear region, or None.
+        auto_fit_options (Optional[Dict[str, Any]]): Overrides for
+                        `config_defaults.DEFAULT_AUTO_FIT_OPTIONS`.
+
+    Returns:
+        Tuple[Optional[float], Optional[float]]: The bounds, or (None, None) for a
+                        fit over all points (also when no linear region is found).
+    """
+    if isinstance(fit_bounds, str) and fit_bounds == AUTO_FIT_BOUNDS:
+        options = {**config_defaults.DEFAULT_AUTO_FIT_OPTIONS, **(auto_fit_options or {})}
+        min_span = options["min_span"]
+        if min_span is None and len(sums.x):
+            min_span = options["min_span_fraction"] * (sums.x[-1] - sums.x[0])
+        detected = find_linear_region(
+            sums, min_span or 0.0, options["min_points"], options["slope_fraction"]
+        )
+        if detected is None:
+            logging.warning("Could not detect a linear region. Fitting all data points.")
+            return None, None
+        logging.info(f"Detected linear region for fit: x = {detected[0]:.6g} to {detected[1]:.6g}.")
+        return detected
+    if fit_bounds is not None and len(fit_bounds) == 2:
+        lower, upper = sorted(fit_bounds)
+        return lower, upper
+    return None, None
+
+
+def rolling_slope(x: Any, y: Any, window: int) -> np.ndarray:
+    """
+    Computes the least-squares slope of y over x in a window around every sample.
+
+    The windows follow sample order (e.g. time), hold `window` samples, and are
+    centered on each sample except near the ends, where they are shifted to
+    stay inside the data. All window sums come from prefix sums, so the cost is
+    O(N) regardless of the window length. The prefix sums restart in blocks of
+    `window` samples, each centered on its first sample, so a window spans at
+    most two short sums and keeps full precision on very long records.
+
+    Args:
+        x (Any): The x values (array-like), e.g. strain.
+        y (Any): The y values (array-like), e.g. stress.
+        window (int): The number of samples per window (at least 2).
+
+    Returns:
+        np.ndarray: The local slope at every sample. NaN where the x values of a
+                    window are all equal or contain NaN.
+
+    Raises:
+        ValueError: If `window` is less than 2.
+    """
+    if window < 2:
+        raise ValueError(f"The slope window must hold at least 2 samples, got {window}.")
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n < 2:
+        return np.full(n, np.nan)
+    window = min(window, n)
+
+    # Window [lo, hi) of every sample
+    lo = np.clip(np.arange(n) - window // 2, 0, n - window)
+    hi = lo + window
+
+    # Per-block prefix sums of the block-centered values and their products
+    n_blocks = -(-n // window)
+    pad = n_blocks * window - n
+    x_blocks = np.pad(x, (0, pad), mode="edge").reshape(n_blocks, window)
+    y_blocks = np.pad(y, (0, pad), mode="edge").reshape(n_blocks, window)
+    x_center, y_center = x_blocks[:, 0], y_blocks[:, 0]
+    dx = x_blocks - x_center[:, np.newaxis]
+    dy = y_blocks - y_center[:, np.newaxis]
+
+    def prefix(values: np.ndarray) -> np.ndarray:
+        out = np.zeros((n_blocks, window + 1))
+        np.cumsum(values, axis=1, out=out[:, 1:])
+        return out
+
+    p_x, p_y, p_xx, p_xy = prefix(dx), prefix(dy), prefix(dx * dx), prefix(dx * dy)
+
+    # Part of each window in its first block a, about the center of block a
+    a = lo // window
+    start_a = lo - a * window
+    stop_a = np.minimum(hi - a * window, window)
+    s_x = p_x[a, stop_a] - p_x[a, start_a]
+    s_y = p_y[a, stop_a] - p_y[a, start_a]
+    s_xx = p_xx[a, stop_a] - p_xx[a, start_a]
+    s_xy = p_xy[a, stop_a] - p_xy[a, start_a]
+
+    # Remainder in the next block b, shifted from the center of block b to that of block a
+    b = np.minimum(a + 1, n_blocks - 1)
+    n_b = hi - a * window - stop_a
+    shift_x, shift_y = x_center[b] - x_center[a], y_center[b] - y_center[a]
+    bx, by = p_x[b, n_b], p_y[b, n_b]
+    s_x = s_x + bx + n_b * shift_x
+    s_y = s_y + by + n_b * shift_y
+    s_xx = s_xx + p_xx[b, n_b] + 2.0 * shift_x * bx + n_b * shift_x**2
+    s_xy = s_xy + p_xy[b, n_b] + shift_x * by + shift_y * bx + n_b * shift_x * shift_y
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sxx = s_xx - s_x * s_x / window
+        sxy = s_xy - s_x * s_y / window
+        return np.where(sxx > 0, sxy / sxx, np.nan)
+
+
+def rescale_fit(
+    slope: float,
+    intercept: float,
+    x_conversion: Tuple[float, float] = (1.0, 0.0),
+    y_conversion: Tuple[float, float] = (1.0, 0.0),
+) -> Tuple[float, float]:
+    """
+    Expresses a fitted line in other units without refitting.
+
+    With the affine unit conversions x' = sx * x + ox and y' = sy * y + oy (the
+    `(scale, offset)` pairs of the Data Column Registry), the line y = m * x + b
+    becomes y' = (sy * m / sx) * x' + (sy * b + oy - (sy * m / sx) * ox).
+
+    Args:
+        slope (float): The slope in base units.
+        intercept (float): The intercept in base units.
+        x_conversion (Tuple[float, float]): The (scale, offset) of the x conversion.
+        y_conversion (Tuple[float, float]): The (scale, offset) of the y conversion.
+
+    Returns:
+        Tuple[float, float]: The slope and intercept in the converted units.
+    """
+    x_scale, x_offset = x_conversion
+    y_scale, y_offset = y_conversion
+    converted_slope = y_scale * slope / x_scale
+    return converted_slope, y_scale * intercept + y_offset - converted_slope * x_offset
@@ -1,18 +1,20 @@
 """
 This module provides functions for generating static and animated plots
-of material test data, including linear fit analysis.
+of material test data, including linear fit analysis, and band plots of the
+mean curve of a specimen batch.
 """
 
 import logging
 import os
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import matplotlib.animation as animation
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
-from matmech import config_defaults
+from matmech import config_defaults, linear_fit
+from matmech.constants import BAND_MEAN_COL, BAND_PERCENTILE_COL_FORMAT, BAND_STD_COL
 
 
 def _calculate_axis_limits(
@@ -61,37 +63,44 @@ def calculate_linear_fit(
     x_col_base: str,
     y_col_base: str,
     y_base_units: str,
-    fit_bounds: Optional[Tuple[float, float]] = None,
+    fit_bounds: Optional[Union[Tuple[float, float], str]] = None,
+    auto_fit_options: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Performs a linear fit on specified data columns and returns the results.
     This function is separated from plotting to be reusable for analysis.
 
+    The fit uses the prefix-sum engine of `matmech.linear_fit`, reading the
+    columns directly without copying the DataFrame.
+
     Args:
         df (pd.DataFrame): The DataFrame containing the data.
         x_col_base (str): The name of the x-axis column (in base units) for fitting.
         y_col_base (str): The name of the y-axis column (in base units) for fitting.
         y_base_units (str): The base units of the y-axis data (e.g., 'MPa').
-        fit_bounds (Optional[Tuple[float, float]]): A tuple (min_x, max_x) to specify
-                                                    the range of x-values for the fit.
+        fit_bounds (Optional[Union[Tuple[float, float], str]]): A tuple (min_x, max_x)
+                        to specify the range of x-values for the fit, or "auto" to
+                        use the most linear region (see `linear_fit.find_linear_region`).
+        auto_fit_options (Optional[Dict[str, Any]]): Overrides for
+                        `config_defaults.DEFAULT_AUTO_FIT_OPTIONS` when fit_bounds is "auto".
 
     Returns:
         Dict[str, Any]: A dictionary containing 'modulus_val', 'modulus_units',
-                        'y_intercept', and 'x_intercept'. Returns an empty dict
-                        if there's insufficient data for fitting.
+                        'y_intercept', and 'x_intercept', plus the base-unit
+                        'slope', 'r_squared', 'n_points', the x range of the
+                        fitted points ('fit_x_min', 'fit_x_max'), and the
+                        'fit_bounds' used (None if unbounded). Returns an empty
+                        dict if there's insufficient data for fitting.
     """
-    fit_df = df.copy()
-    if fit_bounds is not None and len(fit_bounds) == 2:
-        lower, upper = sorted(fit_bounds)
-        mask = (fit_df[x_col_base] >= lower) & (fit_df[x_col_base] <= upper)
-        fit_df = fit_df.loc[mask]
+    sums = linear_fit.prepare_fit_sums(df[x_col_base].to_numpy(), df[y_col_base].to_numpy())
 
-    if len(fit_df) < 2:
+    lower, upper = linear_fit.resolve_fit_bounds(sums, fit_bounds, auto_fit_options)
+    fit = linear_fit.fit_window(sums, lower, upper)
+    if fit is None:
         logging.warning("Not enough data points (less than 2) for linear fit.")
         return {}  # Not enough data to fit
 
-    # Perform linear regression
-    m_base, b_base = np.polyfit(fit_df[x_col_base], fit_df[y_col_base], 1)
+    m_base, b_base = fit["slope"], fit["intercept"]
 
     modulus_val = m_base
     modulus_units = y_base_units
@@ -110,6 +119,12 @@ def calculate_linear_fit(
         "modulus_units": modulus_units,
         "y_intercept": b_base,
         "x_intercept": -b_base / m_base if m_base != 0 else float("inf"),
+        "slope": m_base,
+        "r_squared": fit["r_squared"],
+        "n_points": fit["n_points"],
+        "fit_x_min": fit["x_min"],
+        "fit_x_max": fit["x_max"],
+        "fit_bounds": None if lower is None else (lower, upper),
     }
 
 
@@ -125,13 +140,19 @@ def plot_curve(
     y_label: str,
     output_path: str,
     fit_line: bool = False,
-    fit_bounds: Optional[Tuple[float, float]] = None,
+    fit_bounds: Optional[Union[Tuple[float, float], str]] = None,
     snap_x_to_zero: bool = True,
     snap_y_to_zero: bool = True,
+    x_conversion: Tuple[float, float] = (1.0, 0.0),
+    y_conversion: Tuple[float, float] = (1.0, 0.0),
+    auto_fit_options: Optional[Dict[str, Any]] = None,
 ) -> None:
     """
     Generates a static plot of the data, optionally including a linear fit.
 
+    The fit is calculated once in base units; the plotted fit line is obtained
+    by converting it to the plotted units with `x_conversion` and `y_conversion`.
+
     Args:
         df (pd.DataFrame): The DataFrame containing the data to plot.
         x_col_plot (str): The name of the x-axis column (potentially converted units) for plotting.
@@ -144,16 +165,22 @@ def plot_curve(
         y_label (str): The label for the y-axis.
         output_path (str): The full path where the plot image will be saved.
         fit_line (bool): If True, a linear fit line will be added to the plot.
-        fit_bounds (Optional[Tuple[float, float]]): A tuple (min_x, max_x) to specify
-                                                    the range of x-values for the fit.
+        fit_bounds (Optional[Union[Tuple[float, float], str]]): A tuple (min_x, max_x)
+                        to specify the range of x-values (in base units) for the fit,
+                        or "auto" to detect the linear region.
         snap_x_to_zero (bool): If True, x-axis lower limit snaps to 0 if all x-data is positive.
         snap_y_to_zero (bool): If True, y-axis lower limit snaps to 0 if all y-data is positive.
+        x_conversion (Tuple[float, float]): The (scale, offset) converting base x to plotted x.
+        y_conversion (Tuple[float, float]): The (scale, offset) converting base y to plotted y.
+        auto_fit_options (Optional[Dict[str, Any]]): Options for "auto" fit bounds.
     """
     fig, ax = plt.subplots(figsize=(10, 7))
     ax.plot(df[x_col_plot], df[y_col_plot], label="Experimental Data")
 
     if fit_line:
-        fit_results = calculate_linear_fit(df, x_col_base, y_col_base, y_base_units, fit_bounds)
+        fit_results = calculate_linear_fit(
+            df, x_col_base, y_col_base, y_base_units, fit_bounds, auto_fit_options
+        )
         if fit_results:
             logging.info("\n--- Linear Fit Analysis (in Standard Units) ---")
             logging.info(
@@ -161,29 +188,29 @@ def plot_curve(
             )
             logging.info(f"Y-Intercept: {fit_results['y_intercept']:.4f} {y_base_units}")
             logging.info(f"X-Intercept: {fit_results['x_intercept']:.5f}")
+            logging.info(f"R-Squared: {fit_results['r_squared']:.5f}")
+            if fit_results["fit_bounds"] is not None:
+                lower, upper = fit_results["fit_bounds"]
+                logging.info(f"Fit Bounds: {lower:.6g} to {upper:.6g}")
             logging.info("-------------------------------------------------")
 
-            # Plot the fit line using the potentially converted units for display
-            fit_x_for_plot = df[x_col_plot]
-            fit_y_for_plot = df[y_col_plot]
-
-            if fit_bounds:
-                mask = (fit_x_for_plot >= fit_bounds[0]) & (fit_x_for_plot <= fit_bounds[1])
-                fit_x_for_plot = fit_x_for_plot.loc[mask]
-                fit_y_for_plot = fit_y_for_plot.loc[mask]
-
-            if not fit_x_for_plot.empty:
-                m_plot, b_plot = np.polyfit(fit_x_for_plot, fit_y_for_plot, 1)
-                fit_x_vals = np.array([fit_x_for_plot.min(), fit_x_for_plot.max()])
-                fit_y_vals = m_plot * fit_x_vals + b_plot
-                fit_label = (
-                    f"Linear Fit\n"
-                    f"Modulus: {fit_results['modulus_val']:.2f} {fit_results['modulus_units']}\n"
-                    f"Y-Intercept: {fit_results['y_intercept']:.3f} {y_base_units}"
-                )
-                ax.plot(fit_x_vals, fit_y_vals, "r--", linewidth=2, label=fit_label)
-            else:
-                logging.warning("No data points within fit bounds for plotting the fit line.")
+            # Express the base-unit fit in the plotted units instead of refitting
+            m_plot, b_plot = linear_fit.rescale_fit(
+                fit_results["slope"], fit_results["y_intercept"], x_conversion, y_conversion
+            )
+            x_scale, x_offset = x_conversion
+            fit_x_vals = (
+                np.array([fit_results["fit_x_min"], fit_results["fit_x_max"]]) * x_scale + x_offset
+            )
+            fit_y_vals = m_plot * fit_x_vals + b_plot
+            fit_label = (
+                f"Linear Fit\n"
+                f"Modulus: {fit_results['modulus_val']:.2f} {fit_results['modulus_units']}\n"
+                f"Y-Intercept: {fit_results['y_intercept']:.3f} {y_base_units}"
+            )
+            ax.plot(fit_x_vals, fit_y_vals, "r--", linewidth=2, label=fit_label)
+        else:
+            logging.warning("No data points within fit bounds for plotting the fit line.")
 
     ax.set_xlim(_calculate_axis_limits(df[x_col_plot], snap_x_to_zero))
     ax.set_ylim(_calculate_axis_limits(df[y_col_plot], snap_y_to_zero))
@@ -276,3 +303,69 @@ def animate_curve(
     ani.save(output_path, writer="ffmpeg", fps=target_fps)
     plt.close()
     logging.info("Animation saved.")
+
+
+def plot_band(
+    band: pd.DataFrame,
+    x_col: str,
+    title: str,
+    x_label: str,
+    y_label: str,
+    output_path: str,
+    percentiles: Sequence[float] = (5.0, 95.0),
+    curves: Optional[Sequence[Tuple[np.ndarray, np.ndarray]]] = None,
+    snap_x_to_zero: bool = True,
+    snap_y_to_zero: bool = True,
+) -> None:
+    """
+    Plots the mean curve of a specimen batch with its scatter bands.
+
+    The mean is drawn as a line, the mean ± one standard deviation as a shaded
+    band, and the outermost percentiles as dashed envelopes.
+
+    Args:
+        band (pd.DataFrame): The band from `batch_analysis.aggregate_curves`,
+                             in the plotted units.
+        x_col (str): The name of the x column of the band.
+        title (str): The title of the plot.
+        x_label (str): The label for the x-axis.
+        y_label (str): The label for the y-axis.
+        output_path (str): The full path where the plot image will be saved.
+        percentiles (Sequence[float]): The percentiles of the band to draw as envelopes.
+        curves (Optional[Sequence[Tuple[np.ndarray, np.ndarray]]]): The (x, y) values
+                        of the individual specimens, drawn faintly behind the band.
+        snap_x_to_zero (bool): If True, x-axis lower limit snaps to 0 if all x-data is positive.
+        snap_y_to_zero (bool): If True, y-axis lower limit snaps to 0 if all y-data is positive.
+    """
+    band = band[band[BAND_MEAN_COL].notna()]
+    if band.empty:
+        logging.warning(f"No grid point has enough specimens to plot '{title}'. Skipping.")
+        return
+
+    x = band[x_col]
+    mean, std = band[BAND_MEAN_COL], band[BAND_STD_COL].fillna(0.0)
+    fig, ax = plt.subplots(figsize=(10, 7))
+    for i, (curve_x, curve_y) in enumerate(curves or []):
+        label = "Specimens" if i == 0 else None
+        ax.plot(curve_x, curve_y, color="0.6", linewidth=0.6, alpha=0.5, label=label)
+    ax.fill_between(x, mean - std, mean + std, alpha=0.3, label="Mean ± 1σ")
+    y_extents = [mean - std, mean + std]
+    outermost = sorted({min(percentiles), max(percentiles)}) if len(percentiles) else []
+    for percentile in outermost:
+        column = BAND_PERCENTILE_COL_FORMAT.format(percentile)
+        if column in band.columns:
+            ax.plot(x, band[column], "k--", linewidth=1, label=f"{column} envelope")
+            y_extents.append(band[column])
+    ax.plot(x, mean, linewidth=2, label="Mean")
+
+    ax.set_xlim(_calculate_axis_limits(x, snap_x_to_zero))
+    ax.set_ylim(_calculate_axis_limits(pd.concat(y_extents).dropna(), snap_y_to_zero))
+    ax.set_title(title, fontsize=16)
+    ax.set_xlabel(x_label, fontsize=12)
+    ax.set_ylabel(y_label, fontsize=12)
+    ax.grid(True, linestyle="--", alpha=0.6)
+    ax.legend(fontsize="small")
+    plt.tight_layout()
+    plt.savefig(output_path)
+    plt.close()
+    logging.info(f"Band plot saved to: {os.path.basename(output_path)}")
@@ -0,0 +1,227 @@
+"""
+This module extracts scalar mechanical properties from analyzed test phases.
+
+For each AXIAL or TORSIONAL phase, the stress-strain curve is reduced to the
+modulus (from the linear-fit engine), the offset yield strength, the ultimate
+strength, the strain at break, and the absorbed energy (toughness, and
+resilience up to yield). Every quantity comes from whole-array operations on
+the phase's columns, so extraction is cheap enough to run on every file of a
+batch. The results of all phases are collected in one table with a row per phase.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from matmech import config_defaults, linear_fit
+from matmech.constants import (
+    AXIAL_STRAIN_COL,
+    AXIAL_STRESS_MPA_COL,
+    SHEAR_STRAIN_COL,
+    SHEAR_STRESS_MPA_COL,
+)
+
+# The (strain, stress) columns that properties are extracted from, per analysis type.
+PROPERTY_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "AXIAL": (AXIAL_STRAIN_COL, AXIAL_STRESS_MPA_COL),
+    "TORSIONAL": (SHEAR_STRAIN_COL, SHEAR_STRESS_MPA_COL),
+}
+
+
+def cumulative_trapezoid(y: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    Computes the running trapezoidal integral of y over x.
+
+    Args:
+        y (np.ndarray): The integrand values.
+        x (np.ndarray): The integration variable, in sample order.
+
+    Returns:
+        np.ndarray: The integral from the first sample up to each sample
+                    (same length as the input, starting at 0).
+    """
+    out = np.zeros(len(y))
+    if len(y) > 1:
+        np.cumsum(0.5 * (y[1:] + y[:-1]) * np.diff(x), out=out[1:])
+    return out
+
+
+def _first_downward_crossing(values: np.ndarray, start: int) -> Optional[float]:
+    """Returns the fractional index where `values` first falls from > 0 to <= 0 at or after `start`."""
+    tail = values[start:]
+    crossings = np.flatnonzero((tail[:-1] > 0) & (tail[1:] <= 0))
+    if len(crossings) == 0:
+        return None
+    i = start + int(crossings[0])
+    return i + values[i] / (values[i] - values[i + 1])
+
+
+def _interpolate_at(values: np.ndarray, position: float) -> float:
+    """Linearly interpolates an array at a fractional index."""
+    i = min(int(position), len(values) - 2)
+    return float(values[i] + (position - i) * (values[i + 1] - values[i]))
+
+
+def extract_curve_properties(
+    strain: np.ndarray,
+    stress: np.ndarray,
+    offset_strain: float = 0.002,
+    fit_bounds: Any = "auto",
+    auto_fit_options: Optional[Dict[str, Any]] = None,
+) -> Dict[str, float]:
+    """
+    Extracts the mechanical properties of one stress-strain curve.
+
+    The modulus is the slope of the linear fit over `fit_bounds`, within the
+    data up to the ultimate strength; a fit with a non-positive slope is
+    treated as failed. The offset
+    yield point is where the curve first drops below the fitted line shifted by
+    `offset_strain` (e.g. 0.2%), searched from the start of the fit window and
+    interpolated between samples. Toughness is the area under the whole curve,
+    and resilience the area up to the yield point, both by trapezoidal integration
+    (in MJ/m³ for stress in MPa).
+
+    Args:
+        strain (np.ndarray): The strain values, in sample order.
+        stress (np.ndarray): The stress values (MPa), in sample order.
+        offset_strain (float): The strain offset that defines the yield point.
+        fit_bounds (Any): (min_strain, max_strain) for the modulus fit, "auto"
+                          to detect the elastic region, or None for all points.
+        auto_fit_options (Optional[Dict[str, Any]]): Options for "auto" fit bounds.
+
+    Returns:
+        Dict[str, float]: 'modulus_mpa', 'modulus_r_squared', 'fit_lower', 'fit_upper',
+                          'yield_strength_mpa', 'yield_strain', 'ultimate_strength_mpa',
+                          'strain_at_ultimate', 'strain_at_break', 'toughness_mj_m3'
+                          and 'resilience_mj_m3'. Values that cannot be determined
+                          are NaN.
+    """
+    strain = np.asarray(strain, dtype=float)
+    stress = np.asarray(stress, dtype=float)
+    valid = ~(np.isnan(strain) | np.isnan(stress))
+    if not valid.all():
+        strain, stress = strain[valid], stress[valid]
+
+    properties = dict.fromkeys(
+        (
+            "modulus_mpa", "modulus_r_squared", "fit_lower", "fit_upper",
+            "yield_strength_mpa", "yield_strain", "ultimate_strength_mpa",
+            "strain_at_ultimate", "strain_at_break", "toughness_mj_m3", "resilience_mj_m3",
+        ),
+        np.nan,
+    )
+    if len(strain) < 2:
+        logging.warning("Not enough data points (less than 2) for property extraction.")
+        return properties
+
+    ultimate_index = int(np.argmax(stress))
+    energy = cumulative_trapezoid(stress, strain)
+    properties.update(
+        ultimate_strength_mpa=float(stress[ultimate_index]),
+        strain_at_ultimate=float(strain[ultimate_index]),
+        strain_at_break=float(strain[-1]),
+        toughness_mj_m3=float(energy[-1]),
+    )
+
+    # The elastic region is before the ultimate strength; after it, a test to
+    # failure ends in a steep load drop that must not be fitted.
+    sums = linear_fit.prepare_fit_sums(
+        strain[: ultimate_index + 1], stress[: ultimate_index + 1]
+    )
+    lower, upper = linear_fit.resolve_fit_bounds(sums, fit_bounds, auto_fit_options)
+    fit = linear_fit.fit_window(sums, lower, upper)
+    if fit is None or not fit["slope"] > 0:
+        logging.warning("Could not fit the elastic region. Modulus and yield are undefined.")
+        return properties
+    properties.update(
+        modulus_mpa=fit["slope"],
+        modulus_r_squared=fit["r_squared"],
+        fit_lower=fit["x_min"],
+        fit_upper=fit["x_max"],
+    )
+
+    # Distance of the curve above the offset line; yield is where it first turns negative.
+    offset_line_gap = stress - (fit["slope"] * (strain - offset_strain) + fit["intercept"])
+    search_start = int(np.argmax(strain >= fit["x_min"]))
+    yield_position = _first_downward_crossing(offset_line_gap, search_start)
+    if yield_position is None:
+        logging.warning(f"The curve does not cross the {offset_strain:g} offset line; no yield point.")
+        return properties
+    properties.update(
+        yield_strength_mpa=_interpolate_at(stress, yield_position),
+        yield_strain=_interpolate_at(strain, yield_position),
+        resilience_mj_m3=_interpolate_at(energy, yield_position),
+    )
+    return properties
+
+
+def extract_phase_properties(
+    phase_name: str,
+    analysis_type: str,
+    df: pd.DataFrame,
+    options: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Extracts the mechanical properties of one analyzed phase.
+
+    Args:
+        phase_name (str): The name of the phase.
+        analysis_type (str): The phase type, a key of PROPERTY_COLUMNS.
+        df (pd.DataFrame): The analyzed data of the phase.
+        options (Optional[Dict[str, Any]]): Overrides for
+                        `config_defaults.DEFAULT_PROPERTY_OPTIONS`.
+
+    Returns:
+        Optional[Dict[str, Any]]: One results row ('phase', 'type' and the
+                                  properties of `extract_curve_properties`), or
+                                  None if the phase type or columns are not supported.
+    """
+    if analysis_type not in PROPERTY_COLUMNS:
+        return None
+    strain_col, stress_col = PROPERTY_COLUMNS[analysis_type]
+    if strain_col not in df.columns or stress_col not in df.columns:
+        logging.warning(
+            f"Skipping property extraction for phase '{phase_name}': "
+            f"'{strain_col}' or '{stress_col}' is missing."
+        )
+        return None
+
+    options = {**config_defaults.DEFAULT_PROPERTY_OPTIONS, **(options or {})}
+    properties = extract_curve_properties(
+        df[strain_col].to_numpy(),
+        df[stress_col].to_numpy(),
+        offset_strain=options["offset_strain"],
+        fit_bounds=options["fit_bounds"],
+        auto_fit_options=options.get("auto_fit_options"),
+    )
+    return {"phase": phase_name, "type": analysis_type, **properties}
+
+
+def extract_properties_table(
+    processed_data: Dict[str, pd.DataFrame],
+    recipe: List[Dict[str, Any]],
+    options: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Extracts the properties of every supported phase into one table.
+
+    Args:
+        processed_data (Dict[str, pd.DataFrame]): The analyzed data by phase name.
+        recipe (List[Dict[str, Any]]): The test recipe, which gives the phase order and types.
+        options (Optional[Dict[str, Any]]): Overrides for
+                        `config_defaults.DEFAULT_PROPERTY_OPTIONS`.
+
+    Returns:
+        pd.DataFrame: One row per AXIAL or TORSIONAL phase with data, in recipe order.
+    """
+    rows = []
+    for phase in recipe:
+        df = processed_data.get(phase["name"])
+        if df is None or df.empty:
+            continue
+        row = extract_phase_properties(phase["name"], phase["type"], df, options)
+        if row is not None:
+            rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,238 @@
+"""
+This module provides rainflow cycle counting (ASTM E1049) for variable-amplitude
+load histories.
+
+Counting has three stages:
+1. Reversal extraction: the turning points of the load signal, with reversals
+   smaller than a hysteresis band removed (`cyclic_analysis.find_turning_points`).
+2. Cycle counting with the four-point rule: a pair of reversals whose range is
+   enclosed by the ranges on both sides is a full cycle. All such pairs are
+   removed in parallel, vectorized passes; once a pass removes only a few
+   reversals, the remainder is finished by a sequential stack kernel (compiled
+   with numba when it is installed). The reversals left over (the residue)
+   are counted as half cycles, which gives the same counts as the three-point
+   algorithm of ASTM E1049.
+3. Binning: the cycles are collected into a range/mean histogram.
+"""
+
+import functools
+import logging
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from matmech import config_defaults
+from matmech.constants import RAINFLOW_COUNT_COL, RAINFLOW_MEAN_COL, RAINFLOW_RANGE_COL
+from matmech.cyclic_analysis import find_turning_points
+
+# Vectorized passes continue while they remove at least this fraction of the
+# remaining reversals; below it, the sequential kernel is faster.
+MIN_PASS_REMOVAL_FRACTION = 0.01
+
+
+def _four_point_stack(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Counts full cycles in a reversal sequence with the sequential four-point rule.
+
+    Written with plain loops over arrays so that numba can compile it.
+
+    Args:
+        values (np.ndarray): The reversal values (float64).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The positions of the first
+            and second reversal of each full cycle, and the positions of the
+            residue reversals.
+    """
+    n = len(values)
+    stack = np.empty(n, dtype=np.int64)
+    first = np.empty(n // 2, dtype=np.int64)
+    second = np.empty(n // 2, dtype=np.int64)
+    top = 0
+    count = 0
+    for i in range(n):
+        stack[top] = i
+        top += 1
+        while top >= 4:
+            outer_left = abs(values[stack[top - 3]] - values[stack[top - 4]])
+            inner = abs(values[stack[top - 2]] - values[stack[top - 3]])
+            outer_right = abs(values[stack[top - 1]] - values[stack[top - 2]])
+            if inner > outer_left or inner > outer_right:
+                break
+            first[count] = stack[top - 3]
+            second[count] = stack[top - 2]
+            count += 1
+            stack[top - 3] = stack[top - 1]
+            top -= 2
+    return first[:count], second[:count], stack[:top]
+
+
+@functools.lru_cache(maxsize=None)
+def _stack_kernel() -> Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Returns the sequential kernel, compiled with numba if it is installed."""
+    try:
+        import numba
+    except ImportError:
+        logging.debug("numba is not installed. Using the pure-Python rainflow stack kernel.")
+        return _four_point_stack
+    return numba.njit(cache=True, nogil=True)(_four_point_stack)
+
+
+def _parallel_pass(values: np.ndarray) -> np.ndarray:
+    """
+    Marks the reversal pairs that the four-point rule removes in one vectorized pass.
+
+    Pair i (reversals i and i + 1) is a full cycle if its range is not larger
+    than the ranges of the pairs on either side. Of a run of overlapping
+    qualifying pairs (equal ranges), every second one is taken, so the
+    removed pairs are disjoint.
+
+    Returns:
+        np.ndarray: The positions of the first reversal of each removed pair.
+    """
+    ranges = np.abs(np.diff(values))
+    inner = ranges[1:-1]
+    qualifies = np.concatenate(([False], (inner <= ranges[:-2]) & (inner <= ranges[2:]), [False]))
+    if not qualifies.any():
+        return np.array([], dtype=np.intp)
+    positions = np.arange(len(qualifies))
+    run_start = np.maximum.accumulate(
+        np.where(qualifies & ~np.concatenate(([False], qualifies[:-1])), positions, 0)
+    )
+    return np.flatnonzero(qualifies & ((positions - run_start) % 2 == 0))
+
+
+def count_cycles(reversals: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Counts the rainflow cycles of a reversal sequence.
+
+    Args:
+        reversals (np.ndarray): The turning-point values, e.g. from
+                                `cyclic_analysis.find_turning_points`.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The range, mean, and count
+            (1.0 for a full cycle, 0.5 for a half cycle) of each cycle. Full
+            cycles come first, then the half cycles of the residue in order.
+    """
+    values = np.asarray(reversals, dtype=float)
+    remaining = np.arange(len(values))
+    first_parts, second_parts = [], []
+
+    while len(remaining) >= 4:
+        pairs = _parallel_pass(values[remaining])
+        if len(pairs) * 2 < MIN_PASS_REMOVAL_FRACTION * len(remaining):
+            break
+        first_parts.append(remaining[pairs])
+        second_parts.append(remaining[pairs + 1])
+        keep = np.ones(len(remaining), dtype=bool)
+        keep[pairs] = False
+        keep[pairs + 1] = False
+        remaining = remaining[keep]
+
+    first, second, residue = _stack_kernel()(values[remaining])
+    first_parts.append(remaining[first])
+    second_parts.append(remaining[second])
+    residue = remaining[residue]
+
+    full_a = values[np.concatenate(first_parts)]
+    full_b = values[np.concatenate(second_parts)]
+    half_a, half_b = values[residue[:-1]], values[residue[1:]]
+    ranges = np.concatenate((np.abs(full_b - full_a), np.abs(half_b - half_a)))
+    means = np.concatenate((0.5 * (full_a + full_b), 0.5 * (half_a + half_b)))
+    counts = np.concatenate((np.ones(len(full_a)), np.full(len(half_a), 0.5)))
+    return ranges, means, counts
+
+
+def rainflow_histogram(
+    ranges: np.ndarray,
+    means: np.ndarray,
+    counts: np.ndarray,
+    range_bins: Union[int, Sequence[float]] = 32,
+    mean_bins: Union[int, Sequence[float]] = 8,
+) -> pd.DataFrame:
+    """
+    Bins counted cycles into a range/mean histogram.
+
+    Args:
+        ranges (np.ndarray): The cycle ranges from `count_cycles`.
+        means (np.ndarray): The cycle means from `count_cycles`.
+        counts (np.ndarray): The cycle counts (1.0 or 0.5) from `count_cycles`.
+        range_bins (Union[int, Sequence[float]]): The number of range bins
+                                                  (from 0 to the largest range) or the bin edges.
+        mean_bins (Union[int, Sequence[float]]): The number of mean bins or the bin edges.
+
+    Returns:
+        pd.DataFrame: One row per non-empty bin, with the 'Range' and 'Mean'
+                      bin centers and the number of 'Cycles', ordered by range, then mean.
+    """
+    if isinstance(range_bins, int):
+        range_bins = np.linspace(0.0, ranges.max() if len(ranges) else 1.0, range_bins + 1)
+    histogram, range_edges, mean_edges = np.histogram2d(
+        ranges, means, bins=[range_bins, mean_bins], weights=counts
+    )
+    range_index, mean_index = np.nonzero(histogram)
+    return pd.DataFrame(
+        {
+            RAINFLOW_RANGE_COL: 0.5 * (range_edges[range_index] + range_edges[range_index + 1]),
+            RAINFLOW_MEAN_COL: 0.5 * (mean_edges[mean_index] + mean_edges[mean_index + 1]),
+            RAINFLOW_COUNT_COL: histogram[range_index, mean_index],
+        }
+    )
+
+
+def calculate_rainflow_counts(
+    df: pd.DataFrame,
+    geometry: Dict[str, Any],
+    signal: str = "force",
+    hysteresis: Optional[float] = None,
+    hysteresis_fraction: float = 0.01,
+    range_bins: Union[int, Sequence[float]] = 32,
+    mean_bins: Union[int, Sequence[float]] = 8,
+) -> pd.DataFrame:
+    """
+    Rainflow-counts a load channel of a test phase into a range/mean histogram.
+
+    Args:
+        df (pd.DataFrame): The standardized data of the phase.
+        geometry (Dict[str, Any]): The specimen geometry (unused; counting works
+                                   on the load channel directly).
+        signal (str): The Data Column Registry key of the channel to count,
+                      e.g. 'force' or 'torque'.
+        hysteresis (Optional[float]): The smallest reversal (in the signal's
+                                      standard units) that counts. If None,
+                                      `hysteresis_fraction` of the signal's range is used.
+        hysteresis_fraction (float): The hysteresis as a fraction of the signal's range.
+        range_bins (Union[int, Sequence[float]]): The number of range bins or the bin edges.
+        mean_bins (Union[int, Sequence[float]]): The number of mean bins or the bin edges.
+
+    Returns:
+        pd.DataFrame: The histogram from `rainflow_histogram`, in the signal's
+                      standard units. Empty if the signal has no reversals.
+
+    Raises:
+        KeyError: If the signal is not in the registry or not in the data.
+    """
+    signal_col = config_defaults.DATA_COLUMN_REGISTRY[signal]["standard_name"]
+    if signal_col not in df.columns:
+        raise KeyError(
+            f"Column '{signal_col}' is required for rainflow counting. "
+            f"Available columns: {df.columns.tolist()}"
+        )
+
+    values = df[signal_col].to_numpy(dtype=float)
+    values = values[~np.isnan(values)]
+    if len(values) < 2:
+        logging.warning(f"Not enough data in '{signal_col}' for rainflow counting.")
+        return pd.DataFrame()
+    if hysteresis is None:
+        hysteresis = hysteresis_fraction * float(values.max() - values.min())
+
+    reversals = values[find_turning_points(values, hysteresis)]
+    ranges, means, counts = count_cycles(reversals)
+    logging.info(
+        f"Rainflow counted {counts.sum():g} cycle(s) from {len(reversals)} reversals "
+        f"of '{signal_col}' (hysteresis {hysteresis:g})."
+    )
+    return rainflow_histogram(ranges, means, counts, range_bins, mean_bins)
@@ -0,0 +1,269 @@
+"""
+This module resamples standardized channels onto common grids.
+
+- `TimeGridResampler` interpolates all channels onto a uniform time grid, e.g.
+  to align channels logged at irregular rates or to shrink an oversampled
+  file before analysis. It works on whole data or on chunks, like
+  `signal_processing.ChannelPreprocessor`.
+- `resample_on_grid` interpolates all channels onto a grid of a monotonic
+  quantity such as strain, as needed to average specimens point by point.
+  A curve that reverses direction (loading, then unloading) is split into
+  monotonic branches at its turning points, and every branch is resampled
+  onto the grid values within its range.
+
+Both use `np.interp` over all samples at once: the branches of a curve are
+mapped onto one increasing coordinate, so a single interpolation per channel
+covers all of them.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from matmech.constants import BRANCH_COL, TIME_COL
+from matmech.cyclic_analysis import find_turning_points
+
+
+def uniform_grid(start: float, stop: float, step: float) -> np.ndarray:
+    """
+    Returns the grid start, start + step, ... up to and including `stop`.
+
+    Args:
+        start (float): The first grid value.
+        stop (float): The last value the grid may reach.
+        step (float): The grid spacing (positive).
+
+    Returns:
+        np.ndarray: The grid values.
+
+    Raises:
+        ValueError: If the step is not positive.
+    """
+    if step <= 0:
+        raise ValueError(f"The grid step must be positive, got {step}.")
+    count = int(np.floor((stop - start) / step + 1e-9)) + 1
+    return start + step * np.arange(max(count, 0))
+
+
+def _interpolate_columns(
+    df: pd.DataFrame, x_key: np.ndarray, query: np.ndarray, sample_index: np.ndarray, skip: str
+) -> dict:
+    """Interpolates every column except `skip` at `query`, keeping float dtypes."""
+    columns = {}
+    for name in df.columns:
+        if name == skip:
+            continue
+        values = df[name].to_numpy()
+        dtype = np.result_type(values.dtype, np.float32)
+        columns[name] = np.interp(query, x_key, values[sample_index]).astype(dtype, copy=False)
+    return columns
+
+
+class TimeGridResampler:
+    """
+    Interpolates standardized data onto a uniform time grid, whole or in chunks.
+
+    The grid starts at the first time value and has a spacing of
+    1 / `rate_hz`. Call `process` for each chunk in order and `flush` after
+    the last one (or pass `last=True` with the last chunk). The last sample of
+    each chunk is kept to interpolate the grid points before the first sample
+    of the next chunk. Time must increase, as in a recording.
+
+    Args:
+        rate_hz (float): The sample rate of the grid.
+        time_col (str): The name of the standardized time column.
+
+    Raises:
+        ValueError: If the rate is not positive.
+    """
+
+    def __init__(self, rate_hz: float, time_col: str = TIME_COL) -> None:
+        if rate_hz <= 0:
+            raise ValueError(f"The resampling rate must be positive, got {rate_hz}.")
+        self.step = 1.0 / rate_hz
+        self.time_col = time_col
+        self._origin: Optional[float] = None
+        self._next_point = 0
+        self._tail: Optional[pd.DataFrame] = None
+
+    def process(self, chunk: Optional[pd.DataFrame], last: bool = False) -> pd.DataFrame:
+        """
+        Resamples the next chunk of standardized data.
+
+        Args:
+            chunk (Optional[pd.DataFrame]): The next rows, in time order.
+            last (bool): Whether this is the last chunk.
+
+        Returns:
+            pd.DataFrame: The grid rows up to the last time received so far,
+                          indexed by their grid point number.
+
+        Raises:
+            KeyError: If the time column is missing.
+        """
+        pieces = [piece for piece in (self._tail, chunk) if piece is not None and not piece.empty]
+        if not pieces:
+            return pd.DataFrame()
+        data = pd.concat(pieces) if len(pieces) > 1 else pieces[0]
+        if self.time_col not in data.columns:
+            raise KeyError(
+                f"Column '{self.time_col}' is required for resampling. "
+                f"Available columns: {data.columns.tolist()}"
+            )
+        time = data[self.time_col].to_numpy(dtype=float)
+        if self._origin is None:
+            self._origin = float(time[0])
+
+        last_point = int(np.floor((time[-1] - self._origin) / self.step + 1e-9))
+        points = np.arange(self._next_point, last_point + 1)
+        grid_time = self._origin + self.step * points
+        columns = {self.time_col: grid_time}
+        columns.update(
+            _interpolate_columns(data, time, grid_time, np.arange(len(data)), self.time_col)
+        )
+        self._next_point = max(self._next_point, last_point + 1)
+        self._tail = None if last else data.iloc[-1:]
+        return pd.DataFrame(columns, index=points, copy=False)
+
+    def flush(self) -> pd.DataFrame:
+        """
+        Ends the stream after the last chunk.
+
+        Returns:
+            pd.DataFrame: Always empty, since `process` returns every grid point
+                          up to the last sample received.
+        """
+        return self.process(None, last=True)
+
+
+def build_resampler(config: Dict[str, Any]) -> Optional[TimeGridResampler]:
+    """
+    Creates the time-grid resampler of a workflow configuration, if it asks for one.
+
+    Args:
+        config (Dict[str, Any]): The workflow configuration, with optional 'resample_to_hz'.
+
+    Returns:
+        Optional[TimeGridResampler]: The resampler, or None if no rate is configured.
+    """
+    rate_hz = config.get("resample_to_hz")
+    return None if rate_hz is None else TimeGridResampler(rate_hz)
+
+
+def resample_uniform_time(df: pd.DataFrame, rate_hz: float, time_col: str = TIME_COL) -> pd.DataFrame:
+    """
+    Interpolates complete standardized data onto a uniform time grid.
+
+    Args:
+        df (pd.DataFrame): The standardized data, with increasing time.
+        rate_hz (float): The sample rate of the grid.
+        time_col (str): The name of the standardized time column.
+
+    Returns:
+        pd.DataFrame: The data at the grid times, indexed by grid point number.
+    """
+    if df.empty:
+        return df
+    resampled = TimeGridResampler(rate_hz, time_col).process(df, last=True)
+    logging.info(f"Resampled {len(df)} samples onto {len(resampled)} grid points at {rate_hz:g} Hz.")
+    return resampled
+
+
+def split_monotonic(x: np.ndarray, hysteresis: float = 0.0) -> np.ndarray:
+    """
+    Finds the monotonic branches of a signal.
+
+    Branches are delimited by the turning points of the signal
+    (`cyclic_analysis.find_turning_points`), so reversals smaller than
+    `hysteresis` do not start a new branch.
+
+    Args:
+        x (np.ndarray): The signal samples, in time order.
+        hysteresis (float): The smallest reversal that starts a new branch.
+
+    Returns:
+        np.ndarray: The sample indices of the branch boundaries. Branch i runs
+                    from boundary i to boundary i + 1, both included.
+    """
+    return find_turning_points(x, hysteresis)
+
+
+def resample_on_grid(
+    df: pd.DataFrame, x_col: str, grid: np.ndarray, hysteresis: float = 0.0
+) -> pd.DataFrame:
+    """
+    Interpolates all columns onto a grid of `x_col`, branch by branch.
+
+    Within each monotonic branch, `x_col` is replaced by its running maximum
+    (or minimum, for a decreasing branch), so that noise below the hysteresis
+    cannot make it go backwards. Each branch is then sampled at the grid
+    values within its range, in the branch's direction.
+
+    Args:
+        df (pd.DataFrame): The data, in time order.
+        x_col (str): The column that defines the grid, e.g. 'Axial Strain'.
+        grid (np.ndarray): The grid values, in increasing order.
+        hysteresis (float): The smallest reversal of `x_col` that starts a new branch.
+
+    Returns:
+        pd.DataFrame: One row per branch and grid value within its range, with
+                      `x_col` equal to the grid value, the other columns
+                      interpolated, and the 0-based branch number in 'Branch'.
+
+    Raises:
+        KeyError: If `x_col` is missing from the data.
+    """
+    if x_col not in df.columns:
+        raise KeyError(
+            f"Column '{x_col}' is required for resampling. Available columns: {df.columns.tolist()}"
+        )
+    grid = np.asarray(grid, dtype=float)
+    x = df[x_col].to_numpy(dtype=float)
+    valid = ~np.isnan(x)
+    if not valid.all():
+        df, x = df[valid], x[valid]
+    if len(x) < 2:
+        return pd.DataFrame(columns=[x_col, BRANCH_COL])
+
+    bounds = split_monotonic(x, hysteresis)
+    if len(bounds) < 2:
+        return pd.DataFrame(columns=[x_col, BRANCH_COL])
+    starts, stops = bounds[:-1], bounds[1:]
+    direction = np.where(x[stops] >= x[starts], 1.0, -1.0)
+
+    # The samples of every branch, with the shared turning points repeated.
+    lengths = stops - starts + 1
+    branch_of_sample = np.repeat(np.arange(len(starts)), lengths)
+    first_of_branch = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    sample_index = starts[branch_of_sample] + np.arange(lengths.sum()) - first_of_branch[branch_of_sample]
+
+    # Flip decreasing branches and shift branch b by b * width, so that all
+    # branches form one increasing coordinate; the running maximum then makes
+    # each branch monotonic.
+    oriented = direction[branch_of_sample] * x[sample_index]
+    lowest = float(oriented.min())
+    width = 2.0 * (float(oriented.max()) - lowest) or 1.0
+    x_key = np.maximum.accumulate(oriented - lowest + branch_of_sample * width)
+
+    # The grid values within each branch's range, in the branch's direction.
+    low = np.minimum(x[starts], x[stops])
+    high = np.maximum(x[starts], x[stops])
+    first_point = np.searchsorted(grid, low, side="left")
+    counts = np.maximum(np.searchsorted(grid, high, side="right") - first_point, 0)
+    branch_of_query = np.repeat(np.arange(len(starts)), counts)
+    offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    ascending = direction[branch_of_query] > 0
+    grid_index = np.where(
+        ascending,
+        first_point[branch_of_query] + offset,
+        first_point[branch_of_query] + counts[branch_of_query] - 1 - offset,
+    )
+    query_x = grid[grid_index]
+    query_key = direction[branch_of_query] * query_x - lowest + branch_of_query * width
+
+    columns = {x_col: query_x}
+    columns.update(_interpolate_columns(df, x_key, query_key, sample_index, x_col))
+    columns[BRANCH_COL] = branch_of_query
+    return pd.DataFrame(columns, copy=False)
@@ -0,0 +1,501 @@
+"""
+This module provides zero-phase filtering and decimation of standardized channels.
+
+Filters are configured per channel with the same registry keys as
+`column_sources` and `tare_options`:
+- "moving_average": a centered moving average over `window` samples.
+- "savgol": a Savitzky–Golay filter (local polynomial of degree `polyorder`
+  over `window` samples), which smooths noise while keeping peaks.
+- "butterworth": a low-pass Butterworth filter of `order` and `cutoff_hz`,
+  applied forward and backward (filtfilt). Requires the optional scipy package.
+
+Decimation reduces all channels to a target sample rate after a windowed-sinc
+anti-aliasing low-pass filter.
+
+Every filter only needs a bounded number of neighboring samples, so
+`ChannelPreprocessor` can process data that arrives in chunks: it holds back
+the last rows of each chunk until the samples after them have arrived. The
+moving-average, Savitzky–Golay and decimation results are the same as for the
+whole array; Butterworth results agree to within the decay of its impulse response.
+"""
+
+import logging
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from matmech import config_defaults
+from matmech.constants import TIME_COL
+
+# Samples per block of `rolling_median`; each block needs window x block floats.
+MEDIAN_BLOCK_SIZE = 65536
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Computes a centered moving average in O(N) using cumulative sums.
+
+    Near the ends, the window shrinks to the samples that are available, so the
+    output has the same length as the input and no edge bias towards zero.
+    NaN and infinite samples are left out of the average, so they do not spread
+    beyond their window; a window without finite samples gives NaN.
+
+    Args:
+        values (np.ndarray): The input samples.
+        window (int): The window length in samples. Values below 2 return a copy.
+
+    Returns:
+        np.ndarray: The smoothed samples (float64).
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if window < 2 or n == 0:
+        return values.copy()
+    half = window // 2
+    idx = np.arange(n)
+    lo = np.clip(idx - half, 0, n)
+    hi = np.clip(idx + (window - half), 0, n)
+    finite = np.isfinite(values)
+    if finite.all():
+        cumsum = np.concatenate(([0.0], np.cumsum(values)))
+        return (cumsum[hi] - cumsum[lo]) / (hi - lo)
+
+    cumsum = np.concatenate(([0.0], np.cumsum(np.where(finite, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(finite)))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (cumsum[hi] - cumsum[lo]) / (counts[hi] - counts[lo])
+
+
+def rolling_median(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Computes a centered rolling median over an odd number of samples.
+
+    The windows are strided views of the signal, and their medians are
+    selected with `np.partition` (O(window) per sample) in blocks of
+    `MEDIAN_BLOCK_SIZE` samples, which bounds the temporary memory. Near the
+    ends, the first and last samples are repeated.
+
+    Args:
+        values (np.ndarray): The input samples (without NaN).
+        window (int): The window length in samples (odd). Values below 2 return a copy.
+
+    Returns:
+        np.ndarray: The rolling median (float64).
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if window < 2 or n == 0:
+        return values.copy()
+    half = window // 2
+    padded = np.pad(values, half, mode="edge")
+    out = np.empty(n)
+    for start in range(0, n, MEDIAN_BLOCK_SIZE):
+        windows = np.lib.stride_tricks.sliding_window_view(
+            padded[start : start + MEDIAN_BLOCK_SIZE + 2 * half], 2 * half + 1
+        )
+        out[start : start + len(windows)] = np.partition(windows, half, axis=1)[:, half]
+    return out
+
+
+def _polynomial_projection(length: int, polyorder: int) -> np.ndarray:
+    """Returns the matrix that replaces `length` samples by their least-squares polynomial fit."""
+    vander = np.vander(np.arange(length, dtype=float) - (length - 1) / 2, polyorder + 1)
+    return vander @ np.linalg.pinv(vander)
+
+
+def savitzky_golay(values: np.ndarray, window: int, polyorder: int) -> np.ndarray:
+    """
+    Applies a Savitzky–Golay filter.
+
+    Each interior sample is replaced by the value at its center of the
+    least-squares polynomial through the `window` samples around it, which is
+    one correlation with fixed coefficients. The first and last `window // 2`
+    samples take their values from the polynomial fitted to the first and
+    last full window.
+
+    Args:
+        values (np.ndarray): The input samples.
+        window (int): The window length in samples (odd).
+        polyorder (int): The polynomial degree (less than `window`).
+
+    Returns:
+        np.ndarray: The smoothed samples (float64).
+
+    Raises:
+        ValueError: If the window is even or not larger than `polyorder`.
+    """
+    if window % 2 == 0 or window <= polyorder:
+        raise ValueError(
+            f"Savitzky-Golay needs an odd window larger than polyorder; got window={window}, "
+            f"polyorder={polyorder}."
+        )
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n <= polyorder:
+        return values.copy()
+    if n < window:
+        return _polynomial_projection(n, polyorder) @ values
+
+    half = window // 2
+    projection = _polynomial_projection(window, polyorder)
+    out = np.empty(n)
+    out[half : n - half] = np.correlate(values, projection[half], mode="valid")
+    out[:half] = projection[:half] @ values[:window]
+    out[n - half :] = projection[window - half :] @ values[n - window :]
+    return out
+
+
+def butterworth_filtfilt(
+    values: np.ndarray, cutoff_hz: float, sample_rate_hz: float, order: int = 4
+) -> np.ndarray:
+    """
+    Applies a zero-phase low-pass Butterworth filter (forward and backward).
+
+    Args:
+        values (np.ndarray): The input samples.
+        cutoff_hz (float): The cutoff frequency.
+        sample_rate_hz (float): The sample rate of `values`.
+        order (int): The filter order (the effective order is doubled by filtfilt).
+
+    Returns:
+        np.ndarray: The filtered samples (float64).
+
+    Raises:
+        ImportError: If scipy is not installed.
+        ValueError: If the cutoff is not below the Nyquist frequency.
+    """
+    try:
+        from scipy import signal
+    except ImportError as e:
+        raise ImportError(
+            "The 'butterworth' filter requires scipy. Install it with: pip install scipy"
+        ) from e
+    if not 0 < cutoff_hz < sample_rate_hz / 2:
+        raise ValueError(
+            f"Butterworth cutoff {cutoff_hz} Hz must lie between 0 and the Nyquist "
+            f"frequency ({sample_rate_hz / 2:g} Hz)."
+        )
+    values = np.asarray(values, dtype=float)
+    sos = signal.butter(order, cutoff_hz, fs=sample_rate_hz, output="sos")
+    padlen = min(3 * (2 * len(sos) + 1), len(values) - 1)
+    return signal.sosfiltfilt(sos, values, padlen=max(padlen, 0))
+
+
+def anti_alias_taps(factor: int) -> np.ndarray:
+    """
+    Designs the low-pass FIR filter applied before decimating by `factor`.
+
+    A Hamming-windowed sinc with 20 * factor + 1 taps and its cutoff at the
+    new Nyquist frequency, normalized to unit gain at DC.
+
+    Args:
+        factor (int): The decimation factor.
+
+    Returns:
+        np.ndarray: The filter taps.
+    """
+    half = 10 * factor
+    taps = np.sinc(np.arange(-half, half + 1) / factor) * np.hamming(2 * half + 1)
+    return taps / taps.sum()
+
+
+def _fir_every(values: np.ndarray, taps: np.ndarray, first: int, count: int, step: int) -> np.ndarray:
+    """
+    Applies a centered FIR filter at positions first, first + step, ... only.
+
+    The edge samples are repeated beyond the ends. The padded signal is viewed
+    as rows of `step` samples, so the filter becomes a few matrix-vector
+    products over contiguous memory (one per `step` taps).
+    """
+    half = len(taps) // 2
+    phases = -(-len(taps) // step)
+    taps = np.concatenate((taps, np.zeros(phases * step - len(taps))))
+    padded = np.pad(values, (half, half + phases * step), mode="edge")
+    rows = padded[first : first + (count + phases - 1) * step].reshape(-1, step)
+    out = np.zeros(count)
+    for j in range(phases):
+        out += rows[j : j + count] @ taps[j * step : (j + 1) * step]
+    return out
+
+
+def estimate_sample_rate(time: np.ndarray) -> Optional[float]:
+    """
+    Estimates the sample rate from the median time step.
+
+    Args:
+        time (np.ndarray): The time values (s).
+
+    Returns:
+        Optional[float]: The sample rate in Hz, or None if it cannot be determined.
+    """
+    steps = np.diff(np.asarray(time, dtype=float))
+    steps = steps[steps > 0]
+    if len(steps) == 0:
+        return None
+    return float(1.0 / np.median(steps))
+
+
+class ChannelPreprocessor:
+    """
+    Filters and decimates standardized data, whole or in chunks.
+
+    Call `process` for each chunk in order and `flush` after the last one (or
+    pass `last=True` with the last chunk). Each call returns the rows that are
+    final: a row is held back until `radius` samples after it have arrived, and
+    `radius` samples before the first unreturned row are kept as context for
+    the next chunk.
+
+    Args:
+        filter_options (Dict[str, Dict[str, Any]]): Maps registry keys to a filter
+                        configuration with a 'method' and its parameters (see
+                        `config_defaults.FILTER_METHOD_DEFAULTS`).
+        decimate_to_hz (Optional[float]): The target sample rate, or None to keep all samples.
+        sample_rate_hz (Optional[float]): The sample rate of the data. If None, it is
+                        estimated from the time column of the first chunk.
+        time_col (str): The name of the standardized time column.
+
+    Raises:
+        ValueError: If a filter method is unknown.
+    """
+
+    def __init__(
+        self,
+        filter_options: Dict[str, Dict[str, Any]],
+        decimate_to_hz: Optional[float] = None,
+        sample_rate_hz: Optional[float] = None,
+        time_col: str = TIME_COL,
+    ) -> None:
+        self.filters: Dict[str, Dict[str, Any]] = {}
+        for key, options in filter_options.items():
+            method = options.get("method")
+            if method not in config_defaults.FILTER_METHOD_DEFAULTS:
+                raise ValueError(
+                    f"Unknown filter method '{method}' for '{key}'. "
+                    f"Choose one of: {', '.join(config_defaults.FILTER_METHOD_DEFAULTS)}."
+                )
+            standard_name = config_defaults.DATA_COLUMN_REGISTRY[key]["standard_name"]
+            self.filters[standard_name] = {
+                **config_defaults.FILTER_METHOD_DEFAULTS[method],
+                **options,
+            }
+        self.decimate_to_hz = decimate_to_hz
+        self.sample_rate_hz = sample_rate_hz
+        self.time_col = time_col
+        self.factor = 1
+        self.radius = 0
+        self._configured = False
+        self._tail: Optional[pd.DataFrame] = None
+        self._tail_start = 0
+        self._emitted = 0
+
+    def _configure(self, chunk: pd.DataFrame, last: bool) -> bool:
+        """
+        Fixes the sample rate, decimation factor and context radius from the first rows.
+
+        Returns False if the sample rate is needed but more rows are required to
+        estimate it.
+        """
+        for name in list(self.filters):
+            if name not in chunk.columns:
+                logging.warning(f"Channel '{name}' not in data. Skipping its filter.")
+                del self.filters[name]
+        if self.sample_rate_hz is None and self.time_col in chunk.columns:
+            self.sample_rate_hz = estimate_sample_rate(chunk[self.time_col].to_numpy())
+        needs_rate = self.decimate_to_hz is not None or any(
+            options["method"] == "butterworth" for options in self.filters.values()
+        )
+        if needs_rate and self.sample_rate_hz is None:
+            if not last:
+                return False
+            raise ValueError(
+                "The sample rate is needed for Butterworth filtering and decimation, but it "
+                f"could not be estimated from '{self.time_col}'."
+            )
+
+        radius = 0
+        for options in self.filters.values():
+            if options["method"] == "butterworth":
+                # Samples over which the impulse response has decayed.
+                radius = max(
+                    radius,
+                    int(np.ceil(2 * options["order"] * self.sample_rate_hz / options["cutoff_hz"])),
+                )
+            elif options["method"] == "savgol":
+                # The edge rows use the polynomial of the first full window.
+                radius = max(radius, options["window"])
+            else:
+                radius = max(radius, options["window"] // 2 + 1)
+        if self.decimate_to_hz is not None:
+            self.factor = max(1, int(round(self.sample_rate_hz / self.decimate_to_hz)))
+            if self.factor > 1:
+                radius += 10 * self.factor
+                logging.info(
+                    f"Decimating by {self.factor} from {self.sample_rate_hz:g} Hz "
+                    f"to {self.sample_rate_hz / self.factor:g} Hz."
+                )
+        self.radius = radius
+        self._configured = True
+        return True
+
+    def _filter_channel(self, values: np.ndarray, options: Dict[str, Any]) -> np.ndarray:
+        """Applies one channel's filter."""
+        method = options["method"]
+        if method == "moving_average":
+            return moving_average(values, options["window"])
+        if method == "savgol":
+            return savitzky_golay(values, options["window"], options["polyorder"])
+        return butterworth_filtfilt(
+            values, options["cutoff_hz"], self.sample_rate_hz, options["order"]
+        )
+
+    def _emit(self, data: pd.DataFrame, first: int, stop: int) -> pd.DataFrame:
+        """Returns the filtered (and decimated) rows [first, stop) of `data`."""
+        # Keep the rows whose index in the whole stream is a multiple of the factor.
+        first += (-(self._tail_start + first)) % self.factor
+        count = max(0, -(-(stop - first) // self.factor))
+        positions = slice(first, first + count * self.factor, self.factor)
+        taps = anti_alias_taps(self.factor) if self.factor > 1 else None
+
+        columns: Dict[str, np.ndarray] = {}
+        for name in data.columns:
+            values = data[name].to_numpy()
+            if name == self.time_col:
+                columns[name] = values[positions]
+                continue
+            dtype = np.result_type(values.dtype, np.float32)
+            if name in self.filters:
+                values = self._filter_channel(values, self.filters[name])
+            if taps is not None:
+                columns[name] = _fir_every(values, taps, first, count, self.factor).astype(
+                    dtype, copy=False
+                )
+            else:
+                columns[name] = np.asarray(values[positions], dtype=dtype)
+        return pd.DataFrame(columns, index=data.index[positions], copy=False)
+
+    def process(self, chunk: Optional[pd.DataFrame], last: bool = False) -> pd.DataFrame:
+        """
+        Processes the next chunk of standardized data.
+
+        Args:
+            chunk (Optional[pd.DataFrame]): The next rows, in time order.
+            last (bool): Whether this is the last chunk. If so, no rows are held back.
+
+        Returns:
+            pd.DataFrame: The filtered (and decimated) rows that are final. May
+                          be empty while the first rows are held back.
+
+        Raises:
+            ValueError: If Butterworth filtering or decimation is configured but the
+                        sample rate cannot be estimated from the time column.
+        """
+        pieces = [piece for piece in (self._tail, chunk) if piece is not None]
+        if not pieces:
+            return pd.DataFrame()
+        data = pd.concat(pieces) if len(pieces) > 1 else pieces[0]
+        if not self._configured and not self._configure(data, last):
+            self._tail = data
+            return pd.DataFrame()
+
+        stop = self._tail_start + len(data)
+        if not last:
+            stop = max(self._emitted, stop - self.radius)
+        result = self._emit(data, self._emitted - self._tail_start, stop - self._tail_start)
+
+        keep_from = max(self._tail_start, stop - self.radius)
+        self._tail = None if last else data.iloc[keep_from - self._tail_start :]
+        self._tail_start = keep_from
+        self._emitted = stop
+        return result
+
+    def flush(self) -> pd.DataFrame:
+        """
+        Returns the rows still held back, after the last chunk.
+
+        Returns:
+            pd.DataFrame: The remaining filtered (and decimated) rows.
+        """
+        return self.process(None, last=True)
+
+
+class ChunkPipeline:
+    """
+    Chains chunk processors, such as a `ChannelPreprocessor` followed by a
+    `resampling.TimeGridResampler`.
+
+    Each stage must provide `process(chunk, last=False)` and `flush()`, and
+    receives the rows returned by the stage before it.
+
+    Args:
+        stages (Sequence[Any]): The processors, in order.
+    """
+
+    def __init__(self, stages: Sequence[Any]) -> None:
+        self.stages = list(stages)
+
+    def process(self, chunk: Optional[pd.DataFrame], last: bool = False) -> pd.DataFrame:
+        """
+        Passes the next chunk through every stage.
+
+        Args:
+            chunk (Optional[pd.DataFrame]): The next rows, in time order.
+            last (bool): Whether this is the last chunk.
+
+        Returns:
+            pd.DataFrame: The rows returned by the last stage.
+        """
+        for stage in self.stages:
+            if not last and (chunk is None or chunk.empty):
+                return pd.DataFrame()
+            chunk = stage.process(chunk, last=last)
+        return chunk
+
+    def flush(self) -> pd.DataFrame:
+        """
+        Returns the rows still held back by any stage, after the last chunk.
+
+        Returns:
+            pd.DataFrame: The remaining rows of the last stage.
+        """
+        return self.process(None, last=True)
+
+
+def build_preprocessor(config: Dict[str, Any]) -> Optional[ChannelPreprocessor]:
+    """
+    Creates the preprocessor of a workflow configuration, if it asks for one.
+
+    Args:
+        config (Dict[str, Any]): The workflow configuration, with optional
+                                 'filter_options' and 'decimate_to_hz'.
+
+    Returns:
+        Optional[ChannelPreprocessor]: The preprocessor, or None if no filter
+                                       or decimation is configured.
+    """
+    filter_options = config.get("filter_options") or {}
+    decimate_to_hz = config.get("decimate_to_hz")
+    if not filter_options and decimate_to_hz is None:
+        return None
+    return ChannelPreprocessor(filter_options, decimate_to_hz)
+
+
+def preprocess_data(
+    df: pd.DataFrame,
+    filter_options: Dict[str, Dict[str, Any]],
+    decimate_to_hz: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Filters and decimates complete standardized data.
+
+    Args:
+        df (pd.DataFrame): The standardized data.
+        filter_options (Dict[str, Dict[str, Any]]): The per-channel filter configuration.
+        decimate_to_hz (Optional[float]): The target sample rate, or None.
+
+    Returns:
+        pd.DataFrame: The filtered (and decimated) data.
+    """
+    if df.empty:
+        return df
+    return ChannelPreprocessor(filter_options, decimate_to_hz).process(df, last=True)
@@ -1,14 +1,23 @@
 """
 This module provides functions for calculating torsional material properties
 for specific geometries, such as solid rectangular cross-sections.
+
+`compute_torsional_properties_rect` works on column arrays and writes the
+derived columns into new or preallocated arrays without copying its input;
+`calculate_torsional_properties_rect` wraps it for DataFrames.
+
+The torsion coefficients of a rectangular section are the exact series
+solutions (Saint-Venant), tabulated once at import over the side ratio and
+looked up by linear interpolation.
 """
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from matmech.common_utils import attach_columns, output_buffer
 from matmech.constants import (
     ROTATION_COL,
     SHEAR_STRAIN_COL,
@@ -17,30 +26,97 @@ from matmech.constants import (
     TORQUE_COL,
 )
 
+# --- Rectangular Torsion Coefficient Table ---
+# Nodes over the short-to-long side ratio b/a in [0, 1], and the number of odd
+# series terms per evaluation. With these settings, linear interpolation of the
+# table stays within TORSION_TABLE_MAX_REL_ERROR of the series.
+TORSION_TABLE_SIZE = 2049
+TORSION_SERIES_TERMS = 200
+TORSION_TABLE_MAX_REL_ERROR = 1e-7
 
-def calculate_torsional_properties_rect(
-    df: pd.DataFrame, geometry: Dict[str, Any]
-) -> pd.DataFrame:
+
+def rect_torsion_coefficients_series(
+    side_ratio: Any, n_terms: int = TORSION_SERIES_TERMS
+) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Calculates Shear Stress and Shear Strain for a solid rectangular cross-section.
+    Evaluates the exact series solution for torsion of a solid rectangular section.
 
-    This function assumes the input DataFrame contains 'Rotation (deg)' and 'Torque (N·m)'.
-    It adds 'Rotation (rad)', 'Shear Strain (gamma)', 'Shear Stress (tau_Pa)',
-    and 'Shear Stress (tau_MPa)' columns to the DataFrame.
+    For a section with long side a and short side b, the maximum shear stress is
+    tau_max = T / (alpha * a * b^2), at the midpoint of the long side, and the
+    torsional constant is J = beta * a * b^3, where (with n = 1, 3, 5, ...)
+
+        beta  = 1/3 * (1 - 192/pi^5 * (b/a) * sum(tanh(n*pi*a / (2b)) / n^5))
+        k     = 1 - 8/pi^2 * sum(1 / (n^2 * cosh(n*pi*a / (2b))))
+        alpha = beta / k
+
+    Both coefficients are 0.2082 and 0.1406 for a square and tend to 1/3 for a
+    thin strip.
 
     Args:
-        df (pd.DataFrame): The input DataFrame.
-        geometry (Dict[str, Any]): A dictionary containing geometry parameters,
-                                   e.g., 'torsional_side1_mm', 'torsional_side2_mm',
-                                   'gauge_length_mm'.
+        side_ratio (Any): The short-to-long side ratio b/a, in [0, 1]. Scalar or array.
+        n_terms (int): The number of odd series terms to sum.
 
     Returns:
-        pd.DataFrame: The DataFrame with calculated torsional properties.
-                      Returns the original DataFrame if critical geometry keys are missing
-                      or if a zero denominator is encountered during stress calculation.
+        Tuple[np.ndarray, np.ndarray]: The stress coefficient alpha and the
+                                       torsional-constant coefficient beta.
     """
-    df_processed = df.copy()
+    ratio = np.atleast_1d(np.asarray(side_ratio, dtype=float))[:, np.newaxis]
+    n = np.arange(1, 2 * n_terms, 2, dtype=float)
+    # A zero ratio (thin strip) gives infinite arguments, for which tanh -> 1 and 1/cosh -> 0.
+    with np.errstate(divide="ignore", over="ignore"):
+        x = n * np.pi / (2.0 * ratio)
+        beta = (1.0 / 3.0) * (
+            1.0 - (192.0 / np.pi**5) * ratio[:, 0] * np.sum(np.tanh(x) / n**5, axis=1)
+        )
+        k = 1.0 - (8.0 / np.pi**2) * np.sum(1.0 / (n**2 * np.cosh(x)), axis=1)
+    return beta / k, beta
+
+
+_TABLE_RATIOS = np.linspace(0.0, 1.0, TORSION_TABLE_SIZE)
+_TABLE_ALPHA, _TABLE_BETA = rect_torsion_coefficients_series(_TABLE_RATIOS)
 
+
+def rect_torsion_coefficients(side_ratio: Any) -> Tuple[Any, Any]:
+    """
+    Looks up the torsion coefficients (alpha, beta) of a rectangular section.
+
+    This interpolates the precomputed table of `rect_torsion_coefficients_series`,
+    so each lookup is O(1) and the result is within TORSION_TABLE_MAX_REL_ERROR
+    of the series.
+
+    Args:
+        side_ratio (Any): The short-to-long side ratio b/a, in [0, 1]. Scalar or array.
+
+    Returns:
+        Tuple[Any, Any]: The stress coefficient alpha and the torsional-constant
+                         coefficient beta, with the shape of `side_ratio`.
+
+    Raises:
+        ValueError: If a side ratio is outside [0, 1].
+    """
+    ratio = np.asarray(side_ratio, dtype=float)
+    if np.any((ratio < 0.0) | (ratio > 1.0)):
+        raise ValueError("The side ratio (short side / long side) must be between 0 and 1.")
+    return (
+        np.interp(ratio, _TABLE_RATIOS, _TABLE_ALPHA),
+        np.interp(ratio, _TABLE_RATIOS, _TABLE_BETA),
+    )
+
+
+def torsional_rect_factors(geometry: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Returns the geometry factors that turn rotation and torque into shear strain and stress.
+
+    Args:
+        geometry (Dict[str, Any]): A dictionary containing 'torsional_side1_mm',
+                                   'torsional_side2_mm' and 'gauge_length_mm'.
+
+    Returns:
+        Tuple[Optional[float], Optional[float]]: The shear strain per degree of
+            rotation, and the denominator dividing torque (N·m) into shear stress (Pa).
+            Both are None (with a logged reason) if critical geometry keys are
+            missing or the short side is zero; the denominator is None if it is zero.
+    """
     try:
         side1_m = geometry["torsional_side1_mm"] / 1000.0
         side2_m = geometry["torsional_side2_mm"] / 1000.0
@@ -49,53 +125,116 @@ def calculate_torsional_properties_rect(
         logging.error(
             f"Could not calculate torsional properties. Missing key in geometry config: {e}"
         )
-        return df
+        return None, None
 
     long_side_m, short_side_m = (
         (side1_m, side2_m) if side1_m >= side2_m else (side2_m, side1_m)
     )
 
-    # Calculate alpha factor for rectangular cross-section
-    # This formula is an approximation for aspect ratios > 1.
-    # For square sections (aspect_ratio = 1), alpha = 0.1406.
-    # For very thin sections (aspect_ratio -> inf), alpha -> 1/3.
     if short_side_m == 0:
         logging.error("Short side dimension is zero, cannot calculate torsional properties.")
-        return df_processed
-
-    aspect_ratio = long_side_m / short_side_m
-    # A common approximation for alpha for rectangular sections
-    alpha = (1 / 3) * (1 - 0.630 * (1 / aspect_ratio))
+        return None, None
 
-    # Convert rotation to radians
-    df_processed["Rotation (rad)"] = np.deg2rad(df_processed[ROTATION_COL])
+    # Exact stress coefficient for the rectangular cross-section.
+    # For square sections, alpha = 0.208; for very thin sections, alpha -> 1/3.
+    alpha, _ = rect_torsion_coefficients(short_side_m / long_side_m)
 
-    # Calculate Shear Strain (gamma)
+    # Shear Strain (gamma)
     # For a rectangular bar, max shear strain occurs at the midpoint of the longer side.
     # The formula used here is a simplified one, often for circular shafts or as an approximation.
     # For rectangular sections, the shear strain distribution is complex.
     # This formula assumes max shear strain at the surface of the shorter side.
-    df_processed[SHEAR_STRAIN_COL] = (
-        short_side_m * df_processed["Rotation (rad)"]
-    ) / gauge_length_m
-
-    # Calculate Shear Stress (tau)
-    # The denominator is related to the torsional constant J for a rectangular section.
-    # T = G * phi * J / L, where J = alpha * long_side * short_side^3
-    # Max shear stress tau_max = T / (alpha * long_side * short_side^2)
-    denominator = alpha * long_side_m * (short_side_m**2)
+    # The degree-to-radian conversion is folded into the same scale factor.
+    strain_per_deg = np.deg2rad(1.0) * short_side_m / gauge_length_m
+
+    # Shear Stress (tau)
+    # The maximum shear stress occurs at the midpoint of the long side:
+    # tau_max = T / (alpha * long_side * short_side^2)
+    denominator = float(alpha) * long_side_m * (short_side_m**2)
     if denominator == 0:
         logging.warning(
             "Torsional geometry resulted in a zero denominator; shear stress is infinite."
         )
-        return df_processed
+        return strain_per_deg, None
+    return strain_per_deg, denominator
 
-    df_processed[SHEAR_STRESS_PA_COL] = df_processed[
-        TORQUE_COL
-    ] / denominator
-    df_processed[SHEAR_STRESS_MPA_COL] = (
-        df_processed[SHEAR_STRESS_PA_COL] / 1e6
-    )
+
+def compute_torsional_properties_rect(
+    columns: Mapping[str, Any],
+    geometry: Dict[str, Any],
+    out: Optional[Dict[str, np.ndarray]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Computes Shear Stress and Shear Strain arrays for a solid rectangular cross-section.
+
+    The inputs are only read. Rotation is converted from degrees as part of the
+    strain calculation, so no intermediate radian column is stored. Each derived
+    column is written exactly once, into the matching array of `out` if one is
+    provided, or into a new array.
+
+    Args:
+        columns (Mapping[str, Any]): The input columns by standard name, e.g. a
+                                     DataFrame or a dictionary of arrays with
+                                     'Rotation (deg)' and 'Torque (N·m)'.
+        geometry (Dict[str, Any]): A dictionary containing geometry parameters,
+                                   e.g., 'torsional_side1_mm', 'torsional_side2_mm',
+                                   'gauge_length_mm'.
+        out (Optional[Dict[str, np.ndarray]]): Preallocated output arrays keyed by
+                                               derived column name.
+
+    Returns:
+        Dict[str, np.ndarray]: The 'Shear Strain (gamma)', 'Shear Stress (tau_Pa)'
+                               and 'Shear Stress (tau_MPa)' arrays. Empty if critical
+                               geometry keys are missing or the short side is zero;
+                               without the stress arrays if a zero denominator is
+                               encountered during stress calculation.
+    """
+    derived: Dict[str, np.ndarray] = {}
+    strain_per_deg, denominator = torsional_rect_factors(geometry)
+    if strain_per_deg is None:
+        return derived
+
+    rotation_deg = np.asarray(columns[ROTATION_COL])
+    shear_strain = output_buffer(out, SHEAR_STRAIN_COL, rotation_deg)
+    np.multiply(rotation_deg, strain_per_deg, out=shear_strain)
+    derived[SHEAR_STRAIN_COL] = shear_strain
+
+    if denominator is None:
+        return derived
+
+    torque = np.asarray(columns[TORQUE_COL])
+    shear_stress_pa = output_buffer(out, SHEAR_STRESS_PA_COL, torque)
+    np.divide(torque, denominator, out=shear_stress_pa)
+    shear_stress_mpa = output_buffer(out, SHEAR_STRESS_MPA_COL, torque)
+    np.divide(shear_stress_pa, 1e6, out=shear_stress_mpa)
+    derived[SHEAR_STRESS_PA_COL] = shear_stress_pa
+    derived[SHEAR_STRESS_MPA_COL] = shear_stress_mpa
 
     logging.info("Torsional properties for rectangular cross-section calculated.")
-    return df_processed
+    return derived
+
+
+def calculate_torsional_properties_rect(
+    df: pd.DataFrame, geometry: Dict[str, Any]
+) -> pd.DataFrame:
+    """
+    Calculates Shear Stress and Shear Strain for a solid rectangular cross-section.
+
+    This function assumes the input DataFrame contains 'Rotation (deg)' and 'Torque (N·m)'.
+    It adds 'Shear Strain (gamma)', 'Shear Stress (tau_Pa)', and 'Shear Stress (tau_MPa)'
+    columns. The returned DataFrame shares the input columns with `df` instead of
+    copying them.
+
+    Args:
+        df (pd.DataFrame): The input DataFrame.
+        geometry (Dict[str, Any]): A dictionary containing geometry parameters,
+                                   e.g., 'torsional_side1_mm', 'torsional_side2_mm',
+                                   'gauge_length_mm'.
+
+    Returns:
+        pd.DataFrame: The DataFrame with calculated torsional properties.
+                      Has no added columns if critical geometry keys are missing
+                      or the short side is zero, and no stress columns if a zero
+                      denominator is encountered during stress calculation.
+    """
+    return attach_columns(df, compute_torsional_properties_rect(df, geometry))
@@ -2,37 +2,80 @@
 The main workflow orchestration module for the mat-analyzer library.
 
 This module defines the `run_analysis_workflow` function, which serves as the
-primary entry point for processing mechanical test data. It handles:
+primary entry point for processing mechanical test data,
+`follow_analysis_workflow`, which processes a data file incrementally while
+the test machine is still writing it, and `run_batch_workflow`, which analyzes
+many data files in parallel worker processes. They handle:
 1. Configuration setup and merging default profiles with user settings.
 2. Path and directory management for input data and output graphs.
-3. Data loading, standardization, and optional taring/inversion.
+3. Data loading (in memory or streamed in chunks), standardization,
+   optional taring/inversion, and optional channel filtering/decimation.
 4. Segmentation of data into test phases based on a recipe.
 5. Phase-by-phase analysis using a registry of analysis functions.
 6. Generation of static and animated plots based on user or default configurations.
 """
 
+import concurrent.futures
 import copy
+import fnmatch
+import glob
 import logging
 import os
-from typing import Any, Callable, Dict, List, Tuple
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import pandas as pd
 
 # noinspection PyPackages
-from matmech import axial_analysis, common_utils, config_defaults, plotting_tools, torsional_analysis
-from matmech.constants import TIME_COL
+from matmech import (
+    axial_analysis,
+    batch_analysis,
+    common_utils,
+    config_defaults,
+    cyclic_analysis,
+    data_cache,
+    data_quality,
+    event_detection,
+    plotting_tools,
+    property_extraction,
+    rainflow,
+    resampling,
+    signal_processing,
+    torsional_analysis,
+)
+from matmech.constants import (
+    AUTO_END_TIME,
+    AUTO_SOFTWARE_TYPE,
+    BAND_MEAN_COL,
+    BAND_PERCENTILE_COL_FORMAT,
+    BAND_STD_COL,
+    DEFAULT_CSV_ENGINE,
+    QUALITY_DROPOUTS_COL,
+    QUALITY_SPIKES_COL,
+    TIME_COL,
+)
 
 # The Analysis Registry: Maps a string from the config to an analysis function.
-# This makes the workflow extensible without modification.
-ANALYSIS_REGISTRY: Dict[str, Callable[[pd.DataFrame, Dict[str, Any]], pd.DataFrame]] = {
+# This makes the workflow extensible without modification. Each function is called
+# as func(df, geometry, **analysis_options), with the phase's 'analysis_options'.
+ANALYSIS_REGISTRY: Dict[str, Callable[..., pd.DataFrame]] = {
     "AXIAL": axial_analysis.calculate_axial_properties,
     "TORSIONAL": torsional_analysis.calculate_torsional_properties_rect,
+    "CYCLIC": cyclic_analysis.calculate_cycle_properties,
+    "RAINFLOW": rainflow.calculate_rainflow_counts,
+}
+
+# Analysis types whose result is a summary table rather than per-sample data.
+# The table is also saved as '<phase name>_<suffix>.csv' in the output directory.
+TABLE_OUTPUT_SUFFIXES: Dict[str, str] = {
+    "CYCLIC": "cycles",
+    "RAINFLOW": "rainflow",
 }
 
 
 def _resolve_column_info(
     df: pd.DataFrame, user_key: str, user_units: str = "auto"
-) -> Tuple[str, str]:
+) -> Tuple[str, str, Tuple[float, float]]:
     """
     Resolves user-friendly keys (e.g., 'force') to specific DataFrame columns and plot labels.
     Handles unit conversions and auto-scaling for plotting.
@@ -44,9 +87,10 @@ def _resolve_column_info(
                           If 'auto', units will be chosen based on data magnitude.
 
     Returns:
-        Tuple[str, str]: A tuple containing:
+        Tuple[str, str, Tuple[float, float]]: A tuple containing:
                          - The actual DataFrame column name to plot.
                          - The formatted axis label including units.
+                         - The (scale, offset) converting the base column to it.
 
     Raises:
         ValueError: If a user key is not provided or unit conversion is not defined.
@@ -82,51 +126,55 @@ def _resolve_column_info(
     if chosen_units and chosen_units != col_info["default_units"]:
         if chosen_units in col_info["conversions"]:
             converted_col_name = f"{standard_name}_to_{chosen_units}"
-            conversion_func = col_info["conversions"][chosen_units]
+            scale, offset = col_info["conversions"][chosen_units]
 
             if converted_col_name not in df.columns:
-                df[converted_col_name] = conversion_func(df[standard_name])
+                df[converted_col_name] = df[standard_name] * scale + offset
 
             column_to_plot = converted_col_name
             # Replace default units in label with chosen units
             axis_label = col_info["label"].replace(
                 f"({col_info['default_units']})", f"({chosen_units})"
             )
+            conversion = (scale, offset)
         else:
             raise ValueError(f"Unit conversion '{chosen_units}' not defined for '{user_key}'.")
     else:
         column_to_plot = standard_name
         axis_label = col_info["label"]
+        conversion = (1.0, 0.0)
 
-    return column_to_plot, axis_label
+    return column_to_plot, axis_label, conversion
 
 
-def run_analysis_workflow(script_path: str, user_config: Dict[str, Any]) -> None:
+def _build_final_config(script_path: str, user_config: Dict[str, Any]) -> Dict[str, Any]:
     """
-    The main entry point for running a complete data analysis workflow.
-
-    This function orchestrates the entire process from configuration loading
-    to data processing, analysis, and plot generation.
+    Merges the selected software profile with the user configuration.
 
     Args:
-        script_path (str): The absolute path to the directory where the calling
-                           script (e.g., main.py) is located. This is used to
-                           locate data and output directories.
-        user_config (Dict[str, Any]): A dictionary containing user-defined
-                                     configuration settings for the analysis.
-    """
-    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
-    logging.info("Starting data analysis workflow...")
+        script_path (str): The directory of the calling script, used to locate the
+                           data file when the software type is 'auto'.
+        user_config (Dict[str, Any]): The user-defined configuration settings.
 
-    # === 1. CONFIGURATION SETUP ===
+    Returns:
+        Dict[str, Any]: The final configuration.
+
+    Raises:
+        ValueError: If the software type is not defined in SOFTWARE_PROFILES.
+    """
     software_type = user_config.get("software_type", config_defaults.DEFAULT_SOFTWARE_TYPE)
+    if software_type == AUTO_SOFTWARE_TYPE:
+        # Only the header is read here, so a mismatched file fails before any data is parsed.
+        software_type = common_utils.detect_software_profile(
+            os.path.join(script_path, "data", user_config["data_file_name"])
+        )
     logging.info(f"Using software profile: '{software_type}'")
 
     if software_type not in config_defaults.SOFTWARE_PROFILES:
         raise ValueError(f"Software type '{software_type}' not defined in SOFTWARE_PROFILES.")
 
     base_profile = copy.deepcopy(config_defaults.SOFTWARE_PROFILES[software_type])
-    final_config = {**base_profile, **user_config}
+    final_config = {**base_profile, **user_config, "software_type": software_type}
 
     # Deep merge dictionaries for nested configurations (e.g., 'geometry', 'plots')
     # User-provided empty dictionaries for nested configs should explicitly override defaults.
@@ -141,102 +189,212 @@ def run_analysis_workflow(script_path: str, user_config: Dict[str, Any]) -> None
             final_config[key] = value
         # For other types, the shallow merge {**base_profile, **user_config} is sufficient.
 
-    # === 2. PATH AND DIRECTORY SETUP ===
-    output_dir = os.path.join(script_path, "graphs")
-    input_file_path = os.path.join(script_path, "data", final_config["data_file_name"])
-    os.makedirs(output_dir, exist_ok=True)
-    logging.info(f"Output directory set to: '{output_dir}'")
+    return final_config
 
-    # === 3. DATA LOADING AND STANDARDIZATION ===
-    full_raw_df = common_utils.load_csv_data(input_file_path)
-    clean_df = pd.DataFrame()
-    sources = final_config.get("column_sources", {})
-    inversion_flags = final_config.get("inversion_flags", {})
-    tare_options = final_config.get("tare_options", {})
 
-    for key, source_info in sources.items():
-        registry_entry = config_defaults.DATA_COLUMN_REGISTRY[key]
-        standard_name = registry_entry["standard_name"]
-        raw_col, raw_units = source_info["raw_col"], source_info["raw_units"]
+def _build_preprocessor(
+    config: Dict[str, Any], quality_checker: Optional[data_quality.QualityChecker] = None
+) -> Optional[signal_processing.ChunkPipeline]:
+    """
+    Chains the quality check and the configured channel filters, decimation
+    and time-grid resampling.
 
-        if raw_col not in full_raw_df.columns:
-            logging.warning(
-                f"Source column '{raw_col}' for '{key}' not in data file. Skipping '{key}'."
-            )
-            continue
+    Args:
+        config (Dict[str, Any]): The final workflow configuration.
+        quality_checker (Optional[data_quality.QualityChecker]): The spike and
+                        dropout check, applied first so that spikes are removed before filtering.
+
+    Returns:
+        Optional[signal_processing.ChunkPipeline]: The stages to apply to the
+            standardized data, or None if no preprocessing is configured.
+    """
+    stages = [
+        stage
+        for stage in (
+            quality_checker,
+            signal_processing.build_preprocessor(config),
+            resampling.build_resampler(config),
+        )
+        if stage is not None
+    ]
+    return signal_processing.ChunkPipeline(stages) if stages else None
 
-        series = full_raw_df[raw_col].copy()
 
-        # Standardize units
-        if raw_units != registry_entry["default_units"]:
-            if raw_units not in registry_entry["standardize_from"]:
-                raise ValueError(
-                    f"Standardization from '{raw_units}' to "
-                    f"'{registry_entry['default_units']}' not defined for '{key}'."
-                )
-            convert_func = registry_entry["standardize_from"][raw_units]
-            series = convert_func(series)
-            logging.debug(f"Standardized '{key}' from '{raw_units}' to '{registry_entry['default_units']}'.")
-
-        # Apply inversion if flagged
-        if inversion_flags.get(key, False):
-            series *= -1
-            logging.debug(f"Applied inversion to '{key}' channel.")
-
-        # Apply taring if flagged
-        if tare_options.get(key, False):
-            if not series.empty:
-                series -= series.iloc[0]
-                logging.debug(f"Applied taring to '{key}' channel (normalized to start at zero).")
-            else:
-                logging.warning(f"Attempted to tare '{key}', but the series was empty.")
+def _save_quality_summary(
+    quality_checker: Optional[data_quality.QualityChecker], output_dir: str
+) -> pd.DataFrame:
+    """
+    Logs the data quality summary and saves it as 'data_quality.csv'.
 
-        clean_df[standard_name] = series
+    Args:
+        quality_checker (Optional[data_quality.QualityChecker]): The checker that
+                        processed the data, or None if the check is disabled.
+        output_dir (str): The directory the summary is written to.
 
-    logging.info("Data standardization complete.")
+    Returns:
+        pd.DataFrame: The per-channel summary (empty if the check is disabled).
+    """
+    if quality_checker is None:
+        return pd.DataFrame()
+    summary = quality_checker.summary()
+    if not summary.empty:
+        summary_path = os.path.join(output_dir, "data_quality.csv")
+        summary.to_csv(summary_path, index=False)
+        logging.info(
+            f"\n--- Data Quality ---\n{summary.to_string(index=False)}\n"
+            f"Saved to: {os.path.basename(summary_path)}"
+        )
+    return summary
 
-    # === 4. DATA SEGMENTATION ===
-    recipe: List[Dict[str, Any]] = final_config["test_recipe"]
-    split_points = [phase["end_time"] for phase in recipe]
 
-    # Get the standard name for the time column from the constants
-    time_standard_name = TIME_COL
+def _save_phase_table(phase: Dict[str, Any], analyzed_df: pd.DataFrame, output_dir: str) -> None:
+    """
+    Saves the analyzed data of a phase whose type produces a table (see `TABLE_OUTPUT_SUFFIXES`).
 
-    # Defensive check: Ensure the time column exists in clean_df
-    if time_standard_name not in clean_df.columns:
-        raise KeyError(
-            f"Required time column '{time_standard_name}' not found in processed data. "
-            f"Available columns: {clean_df.columns.tolist()}"
+    Args:
+        phase (Dict[str, Any]): The phase entry of the test recipe.
+        analyzed_df (pd.DataFrame): The analyzed data of the phase.
+        output_dir (str): The directory the table is written to.
+    """
+    suffix = TABLE_OUTPUT_SUFFIXES.get(phase["type"])
+    if suffix and not analyzed_df.empty:
+        table_path = os.path.join(output_dir, f"{phase['name']}_{suffix}.csv")
+        analyzed_df.to_csv(table_path, index=False)
+        logging.info(f"{phase['type'].capitalize()} table saved to: {os.path.basename(table_path)}")
+
+
+def _save_properties_table(
+    processed_data_store: Dict[str, pd.DataFrame],
+    recipe: List[Dict[str, Any]],
+    final_config: Dict[str, Any],
+    output_dir: str,
+) -> pd.DataFrame:
+    """
+    Extracts the mechanical properties of all phases and saves them as 'mechanical_properties.csv'.
+
+    Args:
+        processed_data_store (Dict[str, pd.DataFrame]): The analyzed data, by phase name.
+        recipe (List[Dict[str, Any]]): The test recipe.
+        final_config (Dict[str, Any]): The final configuration, whose
+                                       'property_extraction' key holds the options.
+        output_dir (str): The directory the table is written to.
+
+    Returns:
+        pd.DataFrame: The properties table (empty if extraction is disabled).
+    """
+    property_options = {
+        **config_defaults.DEFAULT_PROPERTY_OPTIONS,
+        **final_config.get("property_extraction", {}),
+    }
+    if not property_options["enabled"]:
+        return pd.DataFrame()
+    properties_table = property_extraction.extract_properties_table(
+        processed_data_store, recipe, property_options
+    )
+    if not properties_table.empty:
+        properties_path = os.path.join(output_dir, "mechanical_properties.csv")
+        properties_table.to_csv(properties_path, index=False)
+        logging.info(
+            f"\n--- Mechanical Properties ---\n{properties_table.to_string(index=False)}\n"
+            f"Saved to: {os.path.basename(properties_path)}"
+        )
+    return properties_table
+
+
+def _assign_detected_end_times(
+    recipe: List[Dict[str, Any]], detected_end_times: List[float]
+) -> List[float]:
+    """
+    Maps automatically detected phase end times onto the phases of the recipe, in order.
+
+    If more phases are detected than the recipe lists, the last recipe phase
+    extends to the last detected end time. If fewer are detected, the remaining
+    recipe phases are left empty.
+
+    Args:
+        recipe (List[Dict[str, Any]]): The test recipe.
+        detected_end_times (List[float]): The detected end times, in increasing order.
+
+    Returns:
+        List[float]: One end time per recipe phase.
+    """
+    if len(detected_end_times) != len(recipe):
+        logging.warning(
+            f"Detected {len(detected_end_times)} phase(s) but the test recipe lists "
+            f"{len(recipe)}. Detected phases are assigned to the recipe in order."
         )
+    if not detected_end_times:
+        return [0.0] * len(recipe)
+    end_times = detected_end_times[: len(recipe) - 1] + [detected_end_times[-1]]
+    return end_times + [end_times[-1]] * (len(recipe) - len(end_times))
+
 
-    data_segments = common_utils.split_data_by_time(
-        clean_df, split_points, time_col=time_standard_name
+def _analyze_phase(
+    phase_number: int, phase: Dict[str, Any], segment_df: pd.DataFrame, geometry: Dict[str, Any]
+) -> pd.DataFrame:
+    """
+    Runs the registered analysis function for one test phase.
+
+    Args:
+        phase_number (int): The 1-based position of the phase in the recipe (for logging).
+        phase (Dict[str, Any]): The phase entry of the test recipe.
+        segment_df (pd.DataFrame): The standardized data of the phase.
+        geometry (Dict[str, Any]): The specimen geometry.
+
+    Returns:
+        pd.DataFrame: The analyzed data, the unchanged segment if no analysis is
+                      registered for the phase type, or an empty DataFrame if the
+                      segment is empty.
+    """
+    phase_name, analysis_type = phase["name"], phase["type"]
+    logging.info(f"\n--- Analyzing Phase {phase_number}: {phase_name} (Type: {analysis_type}) ---")
+
+    if segment_df.empty:
+        logging.warning(f"Segment for phase '{phase_name}' is empty. Skipping analysis.")
+        return pd.DataFrame()
+
+    if analysis_type in ANALYSIS_REGISTRY:
+        analysis_func = ANALYSIS_REGISTRY[analysis_type]
+        return analysis_func(segment_df, geometry, **phase.get("analysis_options", {}))
+
+    logging.info(
+        f"No analysis function registered for type '{analysis_type}'. "
+        "Passing data through without further processing."
     )
+    return segment_df
 
-    # === 5. PHASE-BY-PHASE ANALYSIS (USING REGISTRY) ===
-    processed_data_store: Dict[str, pd.DataFrame] = {}
-    for i, (phase, segment_df) in enumerate(zip(recipe, data_segments)):
-        phase_name, analysis_type = phase["name"], phase["type"]
-        logging.info(f"\n--- Analyzing Phase {i+1}: {phase_name} (Type: {analysis_type}) ---")
 
-        if segment_df.empty:
-            logging.warning(f"Segment for phase '{phase_name}' is empty. Skipping analysis.")
-            processed_data_store[phase_name] = pd.DataFrame()
-            continue
+def _analyze_streamed_phase(
+    phase_index: int,
+    recipe: List[Dict[str, Any]],
+    phase_pieces: List[List[pd.DataFrame]],
+    geometry: Dict[str, Any],
+    output_dir: str,
+) -> pd.DataFrame:
+    """
+    Joins the pieces collected for a completed phase, analyzes them and saves its table.
 
-        if analysis_type in ANALYSIS_REGISTRY:
-            analysis_func = ANALYSIS_REGISTRY[analysis_type]
-            processed_df = analysis_func(segment_df, final_config["geometry"])
-        else:
-            logging.info(
-                f"No analysis function registered for type '{analysis_type}'. "
-                "Passing data through without further processing."
-            )
-            processed_df = segment_df
-        processed_data_store[phase_name] = processed_df
+    The pieces are released afterwards, so each phase is concatenated only once.
+    """
+    pieces = phase_pieces[phase_index]
+    segment_df = pd.concat(pieces) if pieces else pd.DataFrame()
+    phase_pieces[phase_index] = []
+    analyzed_df = _analyze_phase(phase_index + 1, recipe[phase_index], segment_df, geometry)
+    _save_phase_table(recipe[phase_index], analyzed_df, output_dir)
+    return analyzed_df
+
+
+def _resolve_plot_configs(plot_configs_raw: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Expands plot definitions into plot configuration dictionaries.
 
-    # === 6. PLOT GENERATION ===
-    plot_configs_raw = final_config.get("plots", [])
+    Args:
+        plot_configs_raw (List[Any]): Keys of DEFAULT_PLOTS and/or custom plot dictionaries.
+
+    Returns:
+        List[Dict[str, Any]]: The plot configurations. Unknown keys and invalid
+                              definitions are skipped with a warning.
+    """
     resolved_plot_configs: List[Dict[str, Any]] = []
 
     for plot_def in plot_configs_raw:
@@ -257,11 +415,30 @@ def run_analysis_workflow(script_path: str, user_config: Dict[str, Any]) -> None
                 "Expected string or dict. Skipping."
             )
 
-    logging.info(f"\n--- Generating {len(resolved_plot_configs)} requested plot definition(s) ---")
+    return resolved_plot_configs
 
-    # Get all phase names for '*' handling in plot configurations
-    all_phase_names = [phase["name"] for phase in recipe]
 
+def _generate_plots(
+    resolved_plot_configs: List[Dict[str, Any]],
+    processed_data_store: Dict[str, pd.DataFrame],
+    all_phase_names: List[str],
+    output_dir: str,
+    phase_names: Optional[List[str]] = None,
+    plot_types_filter: Optional[List[str]] = None,
+) -> None:
+    """
+    Renders the requested plots for the analyzed phases.
+
+    Args:
+        resolved_plot_configs (List[Dict[str, Any]]): Plot configurations from
+                                                      `_resolve_plot_configs`.
+        processed_data_store (Dict[str, pd.DataFrame]): Analyzed data by phase name.
+        all_phase_names (List[str]): All phase names of the recipe, used for '*'.
+        output_dir (str): The directory the plots are written to.
+        phase_names (Optional[List[str]]): If given, only these phases are plotted.
+        plot_types_filter (Optional[List[str]]): If given, only these plot types
+                                                 (e.g. ['static']) are rendered.
+    """
     for plot_config in resolved_plot_configs:
         # Ensure 'output_filename' is present for all plots, including custom ones
         if "output_filename" not in plot_config:
@@ -277,6 +454,8 @@ def run_analysis_workflow(script_path: str, user_config: Dict[str, Any]) -> None
         phases_to_iterate = all_phase_names if "*" in target_phases else target_phases
 
         for phase_name in phases_to_iterate:
+            if phase_names is not None and phase_name not in phase_names:
+                continue
             df_to_plot = processed_data_store.get(phase_name)
             if df_to_plot is None or df_to_plot.empty:
                 logging.warning(
@@ -286,10 +465,10 @@ def run_analysis_workflow(script_path: str, user_config: Dict[str, Any]) -> None
                 continue
             try:
                 # Resolve column names and labels for plotting, handling units
-                x_col_to_plot, x_label = _resolve_column_info(
+                x_col_to_plot, x_label, x_conversion = _resolve_column_info(
                     df_to_plot, plot_config["x_col"], plot_config.get("x_units", "auto")
                 )
-                y_col_to_plot, y_label = _resolve_column_info(
+                y_col_to_plot, y_label, y_conversion = _resolve_column_info(
                     df_to_plot, plot_config["y_col"], plot_config.get("y_units", "auto")
                 )
 
@@ -303,6 +482,11 @@ def run_analysis_workflow(script_path: str, user_config: Dict[str, Any]) -> None
 
                 for plot_type in plot_types:
                     plot_type = plot_type.lower()
+                    if plot_types_filter is not None and plot_type not in plot_types_filter:
+                        continue
+                    if plot_type == "band":
+                        # Band plots aggregate many specimens (see generate_band_plots).
+                        continue
                     format_keys = {**plot_config, "phase_name": phase_name}
                     base_filename = plot_config["output_filename"].format(**format_keys)
                     suffix = ".mp4" if plot_type == "animated" else ".png"
@@ -342,6 +526,9 @@ def run_analysis_workflow(script_path: str, user_config: Dict[str, Any]) -> None
                             output_path=output_file_path,
                             fit_line=plot_config.get("fit_line", False),
                             fit_bounds=plot_config.get("fit_bounds"),
+                            x_conversion=x_conversion,
+                            y_conversion=y_conversion,
+                            auto_fit_options=plot_config.get("auto_fit_options"),
                         )
                     else:
                         logging.warning(f"Unknown plot type '{plot_type}'. Skipping.")
@@ -350,4 +537,666 @@ def run_analysis_workflow(script_path: str, user_config: Dict[str, Any]) -> None
                     f"Skipping plot '{plot_config.get('title', 'Untitled')}' "
                     f"for phase '{phase_name}'. Reason: {e}"
                 )
+
+
+def _is_band_plot(plot_config: Dict[str, Any]) -> bool:
+    """Returns whether a resolved plot configuration includes the "band" type."""
+    plot_types = plot_config.get("type", "static")
+    plot_types = [plot_types] if isinstance(plot_types, str) else plot_types
+    return "band" in [plot_type.lower() for plot_type in plot_types]
+
+
+def generate_band_plots(
+    results: List[Dict[str, Any]], plot_configs_raw: List[Any], output_dir: str
+) -> Dict[str, pd.DataFrame]:
+    """
+    Renders the "band" plots of a specimen batch: the mean curve of each phase
+    with its standard deviation band and percentile envelopes.
+
+    Plot configurations use the same keys as single-specimen plots ('x_col',
+    'y_col', units, 'title', 'output_filename', 'phases'), with "band" among
+    their types and optional 'band_options' overriding
+    `config_defaults.DEFAULT_BAND_OPTIONS`. Each band is also saved as a CSV
+    file (in standard units) next to its plot.
+
+    Args:
+        results (List[Dict[str, Any]]): The return values of `run_analysis_workflow`,
+                                        one per specimen.
+        plot_configs_raw (List[Any]): Keys of DEFAULT_PLOTS and/or custom plot dictionaries.
+        output_dir (str): The directory the plots and bands are written to.
+
+    Returns:
+        Dict[str, pd.DataFrame]: The bands from `batch_analysis.aggregate_curves`,
+                                 by output filename (without extension).
+    """
+    phase_names: List[str] = []
+    for result in results:
+        phase_names.extend(name for name in result.get("phases", {}) if name not in phase_names)
+
+    bands: Dict[str, pd.DataFrame] = {}
+    for plot_config in _resolve_plot_configs(plot_configs_raw):
+        if not _is_band_plot(plot_config):
+            continue
+        if "output_filename" not in plot_config:
+            logging.warning(
+                f"Plot configuration missing 'output_filename'. Skipping plot: "
+                f"{plot_config.get('title', 'Untitled Plot')}"
+            )
+            continue
+        band_options = {
+            **config_defaults.DEFAULT_BAND_OPTIONS,
+            **plot_config.get("band_options", {}),
+        }
+        target_phases = plot_config.get("phases", [])
+        for phase_name in phase_names if "*" in target_phases else target_phases:
+            try:
+                registry = config_defaults.DATA_COLUMN_REGISTRY
+                x_base = registry[plot_config["x_col"].lower()]["standard_name"]
+                y_base = registry[plot_config["y_col"].lower()]["standard_name"]
+                band = batch_analysis.aggregate_phase_results(
+                    results, phase_name, x_base, y_base, **band_options
+                )
+                if band.empty:
+                    continue
+
+                # Choose the plotted units from the band, then convert it.
+                probe = pd.DataFrame({x_base: band[x_base], y_base: band[BAND_MEAN_COL]})
+                _, x_label, (x_scale, x_offset) = _resolve_column_info(
+                    probe, plot_config["x_col"], plot_config.get("x_units", "auto")
+                )
+                _, y_label, (y_scale, y_offset) = _resolve_column_info(
+                    probe, plot_config["y_col"], plot_config.get("y_units", "auto")
+                )
+                plotted = band.copy()
+                plotted[x_base] = band[x_base] * x_scale + x_offset
+                for column in [BAND_MEAN_COL] + [
+                    BAND_PERCENTILE_COL_FORMAT.format(p) for p in band_options["percentiles"]
+                ]:
+                    plotted[column] = band[column] * y_scale + y_offset
+                plotted[BAND_STD_COL] = band[BAND_STD_COL] * abs(y_scale)
+                curves = [
+                    (frame[x_base] * x_scale + x_offset, frame[y_base] * y_scale + y_offset)
+                    for frame in (result.get("phases", {}).get(phase_name) for result in results)
+                    if frame is not None and x_base in frame.columns and y_base in frame.columns
+                ]
+
+                format_keys = {**plot_config, "phase_name": phase_name}
+                base_filename = plot_config["output_filename"].format(**format_keys)
+                plotting_tools.plot_band(
+                    plotted,
+                    x_base,
+                    plot_config["title"].format(**format_keys),
+                    x_label,
+                    y_label,
+                    os.path.join(output_dir, base_filename + ".png"),
+                    percentiles=band_options["percentiles"],
+                    curves=curves,
+                )
+                band.to_csv(os.path.join(output_dir, base_filename + ".csv"), index=False)
+                bands[base_filename] = band
+            except (KeyError, ValueError) as e:
+                logging.warning(
+                    f"Skipping band plot '{plot_config.get('title', 'Untitled')}' "
+                    f"for phase '{phase_name}': {e}"
+                )
+    return bands
+
+
+def run_analysis_workflow(
+    script_path: str, user_config: Dict[str, Any], output_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    The main entry point for running a complete data analysis workflow.
+
+    This function orchestrates the entire process from configuration loading
+    to data processing, analysis, property extraction, and plot generation.
+
+    Args:
+        script_path (str): The absolute path to the directory where the calling
+                           script (e.g., main.py) is located. This is used to
+                           locate data and output directories.
+        user_config (Dict[str, Any]): A dictionary containing user-defined
+                                     configuration settings for the analysis.
+        output_dir (Optional[str]): The directory for graphs and tables. Defaults
+                                    to the 'graphs' directory next to the script.
+
+    Returns:
+        Dict[str, Any]: The results, with the analyzed data of each phase under
+                        'phases' (by phase name), the mechanical property table
+                        under 'properties' (empty if extraction is disabled), and
+                        the data quality summary under 'quality' (empty if the
+                        check is disabled).
+    """
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    logging.info("Starting data analysis workflow...")
+
+    # === 1. CONFIGURATION SETUP ===
+    final_config = _build_final_config(script_path, user_config)
+
+    # === 2. PATH AND DIRECTORY SETUP ===
+    output_dir = output_dir or os.path.join(script_path, "graphs")
+    input_file_path = os.path.join(script_path, "data", final_config["data_file_name"])
+    os.makedirs(output_dir, exist_ok=True)
+    logging.info(f"Output directory set to: '{output_dir}'")
+
+    # === 3. DATA LOADING AND STANDARDIZATION ===
+    sources = final_config.get("column_sources", {})
+    inversion_flags = final_config.get("inversion_flags", {})
+    tare_options = final_config.get("tare_options", {})
+    use_float32 = final_config.get("use_float32", False)
+
+    recipe: List[Dict[str, Any]] = final_config["test_recipe"]
+    auto_segmentation = any(
+        phase.get("end_time", AUTO_END_TIME) == AUTO_END_TIME for phase in recipe
+    )
+    split_points = [] if auto_segmentation else [phase["end_time"] for phase in recipe]
+
+    # Get the standard name for the time column from the constants
+    time_standard_name = TIME_COL
+
+    chunksize = final_config.get("stream_chunksize")
+    if chunksize and auto_segmentation:
+        raise ValueError(
+            "Automatic phase detection needs the complete signal and cannot be "
+            "combined with 'stream_chunksize'. Set an explicit 'end_time' for every phase."
+        )
+    quality_checker = data_quality.build_quality_checker(final_config)
+    header_line = common_utils.find_header_line(input_file_path, sources)
+    processed_data_store: Dict[str, pd.DataFrame] = {}
+    if chunksize:
+        # === 3/4. STREAMING STANDARDIZATION AND SEGMENTATION ===
+        # Each raw chunk is standardized and routed to its phase before the next
+        # one is read, so the full raw file is never held in memory.
+        raw_chunks = common_utils.iter_csv_chunks(
+            input_file_path,
+            chunksize,
+            column_sources=sources,
+            use_float32=use_float32,
+            header_line=header_line,
+        )
+        # === 5. PHASE-BY-PHASE ANALYSIS (USING REGISTRY) ===
+        # Time increases through the file, so a phase is analyzed and its raw pieces
+        # released as soon as rows of a later phase arrive. Only the phase being read
+        # and the analyzed results of earlier phases are held in memory.
+        phase_pieces: List[List[pd.DataFrame]] = [[] for _ in split_points]
+        next_phase_index = 0
+        for phase_index, piece in common_utils.stream_phase_segments(
+            raw_chunks,
+            sources,
+            inversion_flags,
+            tare_options,
+            split_points,
+            time_standard_name,
+            preprocessor=_build_preprocessor(final_config, quality_checker),
+        ):
+            phase_pieces[phase_index].append(piece)
+            while next_phase_index < phase_index:
+                processed_data_store[recipe[next_phase_index]["name"]] = _analyze_streamed_phase(
+                    next_phase_index, recipe, phase_pieces, final_config["geometry"], output_dir
+                )
+                next_phase_index += 1
+        logging.info("Data standardization complete.")
+        for phase_index in range(next_phase_index, len(recipe)):
+            processed_data_store[recipe[phase_index]["name"]] = _analyze_streamed_phase(
+                phase_index, recipe, phase_pieces, final_config["geometry"], output_dir
+            )
+        quality_summary = _save_quality_summary(quality_checker, output_dir)
+    else:
+        cache_options = {**config_defaults.DEFAULT_CACHE_OPTIONS, **final_config.get("cache", {})}
+        clean_df = None
+        if cache_options["enabled"]:
+            cache_dir = cache_options["directory"] or os.path.join(script_path, ".matmech_cache")
+            cache_key = data_cache.compute_cache_key(
+                input_file_path,
+                {
+                    "column_sources": sources,
+                    "inversion_flags": inversion_flags,
+                    "tare_options": tare_options,
+                    "use_float32": use_float32,
+                },
+            )
+            clean_df = data_cache.load_cached_data(cache_dir, cache_key)
+
+        if clean_df is None:
+            full_raw_df = common_utils.load_csv_data(
+                input_file_path,
+                column_sources=sources,
+                use_float32=use_float32,
+                engine=final_config.get("csv_engine", DEFAULT_CSV_ENGINE),
+                header_line=header_line,
+            )
+            clean_df = common_utils.standardize_data(
+                full_raw_df, sources, inversion_flags, tare_options
+            )
+            del full_raw_df
+            if cache_options["enabled"]:
+                data_cache.store_cached_data(cache_dir, cache_key, clean_df, input_file_path)
+                data_cache.evict_cache(cache_dir, int(cache_options["max_size_mb"] * 1024**2))
+        logging.info("Data standardization complete.")
+
+        # The quality check, filtering, decimation and resampling run after the
+        # cache, so that changing them does not invalidate the cached standardized data.
+        preprocessor = _build_preprocessor(final_config, quality_checker)
+        if preprocessor is not None:
+            clean_df = preprocessor.process(clean_df, last=True)
+            logging.info(f"Channel preprocessing complete ({len(clean_df)} data points).")
+
+        # === 4. DATA SEGMENTATION ===
+        # Defensive check: Ensure the time column exists in clean_df
+        if time_standard_name not in clean_df.columns:
+            raise KeyError(
+                f"Required time column '{time_standard_name}' not found in processed data. "
+                f"Available columns: {clean_df.columns.tolist()}"
+            )
+
+        if auto_segmentation:
+            auto_options = {
+                **config_defaults.DEFAULT_AUTO_SEGMENTATION_OPTIONS,
+                **final_config.get("auto_segmentation", {}),
+            }
+            split_points = _assign_detected_end_times(
+                recipe, event_detection.detect_split_points(clean_df, auto_options)
+            )
+
+        data_segments = common_utils.split_data_by_time(
+            clean_df, split_points, time_col=time_standard_name
+        )
+        quality_summary = _save_quality_summary(quality_checker, output_dir)
+
+        # === 5. PHASE-BY-PHASE ANALYSIS (USING REGISTRY) ===
+        for i, (phase, segment_df) in enumerate(zip(recipe, data_segments)):
+            processed_data_store[phase["name"]] = _analyze_phase(
+                i + 1, phase, segment_df, final_config["geometry"]
+            )
+            _save_phase_table(phase, processed_data_store[phase["name"]], output_dir)
+
+    # === 6. PROPERTY EXTRACTION ===
+    properties_table = _save_properties_table(
+        processed_data_store, recipe, final_config, output_dir
+    )
+
+    # === 7. PLOT GENERATION ===
+    resolved_plot_configs = _resolve_plot_configs(final_config.get("plots", []))
+    logging.info(f"\n--- Generating {len(resolved_plot_configs)} requested plot definition(s) ---")
+
+    # Get all phase names for '*' handling in plot configurations
+    all_phase_names = [phase["name"] for phase in recipe]
+    _generate_plots(resolved_plot_configs, processed_data_store, all_phase_names, output_dir)
     logging.info(f"\nMulti-phase analysis complete. Graphs saved in '{output_dir}'.")
+    return {
+        "phases": processed_data_store,
+        "properties": properties_table,
+        "quality": quality_summary,
+    }
+
+
+def follow_analysis_workflow(script_path: str, user_config: Dict[str, Any]) -> None:
+    """
+    Runs the analysis workflow on a data file while it is still being written.
+
+    The file is followed from a byte offset, so each update only parses,
+    standardizes and segments the newly appended rows. A phase is analyzed
+    once, as soon as data past its 'end_time' arrives, and its table is saved
+    as in `run_analysis_workflow`. The properties table is saved once the file
+    stops growing. Every 'plot_interval_s' seconds, static plots of the newly
+    completed phases and of the phase in progress (from its rows so far) are
+    written.
+    Animated plots are rendered once the file stops growing for
+    'idle_timeout_s' seconds, or once the recipe's last end time has passed.
+
+    Time is assumed to increase monotonically, as in a live recording. The
+    follow options are read from the 'follow' key of the configuration (see
+    `config_defaults.DEFAULT_FOLLOW_OPTIONS`).
+
+    Args:
+        script_path (str): The absolute path to the directory where the calling
+                           script (e.g., main.py) is located. This is used to
+                           locate data and output directories.
+        user_config (Dict[str, Any]): A dictionary containing user-defined
+                                     configuration settings for the analysis.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    logging.info("Starting live (follow) analysis workflow...")
+
+    # === 1. CONFIGURATION SETUP ===
+    final_config = _build_final_config(script_path, user_config)
+    follow_options = {**config_defaults.DEFAULT_FOLLOW_OPTIONS, **final_config.get("follow", {})}
+
+    # === 2. PATH AND DIRECTORY SETUP ===
+    output_dir = os.path.join(script_path, "graphs")
+    input_file_path = os.path.join(script_path, "data", final_config["data_file_name"])
+    os.makedirs(output_dir, exist_ok=True)
+    logging.info(f"Output directory set to: '{output_dir}'")
+
+    sources = final_config.get("column_sources", {})
+    recipe: List[Dict[str, Any]] = final_config["test_recipe"]
+    if any(phase.get("end_time", AUTO_END_TIME) == AUTO_END_TIME for phase in recipe):
+        raise ValueError(
+            "Automatic phase detection needs the complete signal and is not available "
+            "in follow mode. Set an explicit 'end_time' for every phase."
+        )
+    split_points = [phase["end_time"] for phase in recipe]
+    all_phase_names = [phase["name"] for phase in recipe]
+    resolved_plot_configs = _resolve_plot_configs(final_config.get("plots", []))
+
+    # === 3/4. INCREMENTAL STANDARDIZATION AND SEGMENTATION ===
+    raw_chunks = common_utils.follow_csv(
+        input_file_path,
+        column_sources=sources,
+        use_float32=final_config.get("use_float32", False),
+        poll_interval_s=follow_options["poll_interval_s"],
+        idle_timeout_s=follow_options["idle_timeout_s"],
+    )
+    phase_pieces: List[List[pd.DataFrame]] = [[] for _ in split_points]
+    processed_data_store: Dict[str, pd.DataFrame] = {}
+    next_phase_index = 0
+    unplotted_phase_names: List[str] = []
+    last_plot_time = time.monotonic()
+
+    quality_checker = data_quality.build_quality_checker(final_config)
+    for phase_index, piece in common_utils.stream_phase_segments(
+        raw_chunks,
+        sources,
+        final_config.get("inversion_flags", {}),
+        final_config.get("tare_options", {}),
+        split_points,
+        TIME_COL,
+        preprocessor=_build_preprocessor(final_config, quality_checker),
+    ):
+        phase_pieces[phase_index].append(piece)
+
+        # === 5. ANALYSIS OF COMPLETED PHASES ===
+        # Rows of a later phase mean that the earlier phases' end times have passed.
+        while next_phase_index < phase_index:
+            phase_name = recipe[next_phase_index]["name"]
+            processed_data_store[phase_name] = _analyze_streamed_phase(
+                next_phase_index, recipe, phase_pieces, final_config["geometry"], output_dir
+            )
+            unplotted_phase_names.append(phase_name)
+            next_phase_index += 1
+
+        # === 6. PERIODIC PLOT UPDATES ===
+        if time.monotonic() - last_plot_time >= follow_options["plot_interval_s"]:
+            # The phase in progress is plotted from its rows so far. Its pieces are
+            # joined in place, so each tick only concatenates the rows since the last one.
+            phase_pieces[phase_index] = [pd.concat(phase_pieces[phase_index])]
+            partial_name = recipe[phase_index]["name"]
+            partial_df = _analyze_phase(
+                phase_index + 1,
+                recipe[phase_index],
+                phase_pieces[phase_index][0],
+                final_config["geometry"],
+            )
+            _generate_plots(
+                resolved_plot_configs,
+                {**processed_data_store, partial_name: partial_df},
+                all_phase_names,
+                output_dir,
+                phase_names=unplotted_phase_names + [partial_name],
+                plot_types_filter=["static"],
+            )
+            unplotted_phase_names = []
+            last_plot_time = time.monotonic()
+
+    # The file has stopped growing: analyze the phases still open and finish the plots.
+    _save_quality_summary(quality_checker, output_dir)
+    for phase_index in range(next_phase_index, len(recipe)):
+        phase_name = recipe[phase_index]["name"]
+        processed_data_store[phase_name] = _analyze_streamed_phase(
+            phase_index, recipe, phase_pieces, final_config["geometry"], output_dir
+        )
+        unplotted_phase_names.append(phase_name)
+    _save_properties_table(processed_data_store, recipe, final_config, output_dir)
+
+    _generate_plots(
+        resolved_plot_configs,
+        processed_data_store,
+        all_phase_names,
+        output_dir,
+        phase_names=unplotted_phase_names,
+        plot_types_filter=["static"],
+    )
+    _generate_plots(
+        resolved_plot_configs,
+        processed_data_store,
+        all_phase_names,
+        output_dir,
+        plot_types_filter=["animated"],
+    )
+    logging.info(f"\nLive analysis complete. Graphs saved in '{output_dir}'.")
+
+
+def find_batch_files(script_path: str, data_files: Union[str, Sequence[str]]) -> List[str]:
+    """
+    Lists the data files of a batch.
+
+    Args:
+        script_path (str): The directory of the calling script. Relative paths
+                           and patterns are resolved in its 'data' directory.
+        data_files (Union[str, Sequence[str]]): Directories (all '*.csv*' files in
+                        them, including compressed ones), glob patterns ('**' matches
+                        subdirectories) or file paths.
+
+    Returns:
+        List[str]: The absolute paths of the files, sorted within each entry and
+                   without duplicates.
+
+    Raises:
+        FileNotFoundError: If no file matches.
+    """
+    entries = [data_files] if isinstance(data_files, str) else list(data_files)
+    files: List[str] = []
+    for entry in entries:
+        path = os.path.join(script_path, "data", entry)
+        if os.path.isdir(path):
+            path = os.path.join(path, "*.csv*")
+        for match in sorted(glob.glob(path, recursive=True)):
+            match = os.path.abspath(match)
+            if os.path.isfile(match) and match not in files:
+                files.append(match)
+    if not files:
+        raise FileNotFoundError(f"No data files match {entries} in '{script_path}'.")
+    return files
+
+
+def _batch_output_name(file_path: str, used_names: List[str]) -> str:
+    """Returns a unique output directory name for a data file, its name without extensions."""
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    if name.lower().endswith(".csv"):  # A compressed file, e.g. 'A1.csv.gz'
+        name = name[: -len(".csv")]
+    unique_name, counter = name, 2
+    while unique_name in used_names:
+        unique_name, counter = f"{name}_{counter}", counter + 1
+    used_names.append(unique_name)
+    return unique_name
+
+
+def _apply_file_overrides(
+    user_config: Dict[str, Any], file_name: str, file_overrides: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Applies the overrides whose file name or glob pattern matches a data file.
+
+    Non-empty nested dictionaries (e.g. 'geometry') are merged into the
+    configuration's; all other values replace it, as in `_build_final_config`.
+    """
+    config = dict(user_config)
+    for pattern, overrides in file_overrides.items():
+        if not fnmatch.fnmatch(file_name, pattern):
+            continue
+        for key, value in overrides.items():
+            if isinstance(value, dict) and value and isinstance(config.get(key), dict):
+                config[key] = {**config[key], **value}
+            else:
+                config[key] = value
+    return config
+
+
+def _init_batch_worker(log_level: str) -> None:
+    """Configures logging and limits the CSV parser to one thread in a batch worker process."""
+    logging.basicConfig(level=log_level, format="%(levelname)s: [%(processName)s] %(message)s")
+    # The workers already use every core, so pyarrow's own thread pool would
+    # only oversubscribe them.
+    try:
+        import pyarrow
+
+        pyarrow.set_cpu_count(1)
+    except ImportError:
+        pass
+
+
+def _run_batch_file(
+    script_path: str, file_config: Dict[str, Any], output_dir: str, keep_phases: bool
+) -> Dict[str, Any]:
+    """
+    Analyzes one file of a batch. Runs in a worker process.
+
+    Returns:
+        Dict[str, Any]: The workflow 'result' (without the phase data unless
+                        `keep_phases` is set, as it would be copied back to the
+                        parent process), the 'error' message or None, and 'elapsed_s'.
+    """
+    start = time.perf_counter()
+    try:
+        result = run_analysis_workflow(script_path, file_config, output_dir=output_dir)
+    except Exception as e:
+        logging.exception(f"Analysis of '{file_config['data_file_name']}' failed.")
+        return {"result": None, "error": f"{type(e).__name__}: {e}",
+                "elapsed_s": time.perf_counter() - start}
+    if not keep_phases:
+        result = {**result, "phases": {}}
+    return {"result": result, "error": None, "elapsed_s": time.perf_counter() - start}
+
+
+def _batch_summary_rows(name: str, outcome: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Returns the summary rows of one file: one per row of its property table, or one."""
+    row: Dict[str, Any] = {
+        "file": name,
+        "status": "failed" if outcome["error"] else "ok",
+        "error": outcome["error"],
+        "elapsed_s": outcome["elapsed_s"],
+    }
+    result = outcome["result"]
+    if result is None:
+        return [row]
+    quality = result["quality"]
+    if not quality.empty:
+        row["flagged_samples"] = int(
+            quality[QUALITY_SPIKES_COL].sum() + quality[QUALITY_DROPOUTS_COL].sum()
+        )
+    properties = result["properties"]
+    if properties.empty:
+        return [row]
+    return [{**row, **properties_row} for properties_row in properties.to_dict("records")]
+
+
+def run_batch_workflow(
+    script_path: str,
+    user_config: Dict[str, Any],
+    data_files: Union[str, Sequence[str]] = ".",
+) -> Dict[str, Any]:
+    """
+    Runs `run_analysis_workflow` on many data files in parallel worker processes.
+
+    Every file is analyzed with `user_config` (its 'data_file_name' replaced and
+    the matching 'file_overrides' of the 'batch' options applied), and writes its
+    graphs and tables to 'graphs/<file name>/'. Files are independent, so the
+    throughput grows with the number of workers up to the number of cores (or
+    until the disk is the bottleneck). A file that fails is logged and recorded
+    in the summary; the other files are not affected. "band" plots of the
+    configuration are rendered once over all files, in 'graphs/'.
+
+    Args:
+        script_path (str): The absolute path to the directory of the calling script,
+                           with the 'data' and 'graphs' directories.
+        user_config (Dict[str, Any]): The configuration shared by all files, with
+                        optional 'batch' options overriding
+                        `config_defaults.DEFAULT_BATCH_OPTIONS`.
+        data_files (Union[str, Sequence[str]]): Directories, glob patterns or files,
+                        relative to the 'data' directory (see `find_batch_files`).
+                        Defaults to every CSV file in it.
+
+    Returns:
+        Dict[str, Any]: The 'summary' table (also saved as 'graphs/batch_summary.csv'),
+                        with one row per file and property table row: 'file',
+                        'status' ("ok" or "failed"), 'error', 'elapsed_s',
+                        'flagged_samples' and the properties of
+                        `property_extraction.extract_properties_table`; 'results',
+                        the workflow results by file name (None for failed files);
+                        and 'bands', the bands of the "band" plots.
+
+    Raises:
+        FileNotFoundError: If no data file matches.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    options = {**config_defaults.DEFAULT_BATCH_OPTIONS, **user_config.get("batch", {})}
+    base_config = {key: value for key, value in user_config.items() if key != "batch"}
+    band_plots = [
+        plot_def
+        for plot_def in base_config.get("plots", [])
+        if any(_is_band_plot(config) for config in _resolve_plot_configs([plot_def]))
+    ]
+    keep_phases = bool(options["keep_phases"] or band_plots)
+
+    files = find_batch_files(script_path, data_files)
+    output_root = os.path.join(script_path, "graphs")
+    used_names: List[str] = []
+    jobs: List[Tuple[str, Dict[str, Any], str]] = []
+    for file_path in files:
+        name = _batch_output_name(file_path, used_names)
+        file_config = _apply_file_overrides(
+            base_config, os.path.basename(file_path), options["file_overrides"]
+        )
+        file_config["data_file_name"] = file_path
+        jobs.append((name, file_config, os.path.join(output_root, name)))
+
+    max_workers = min(options["max_workers"] or os.cpu_count() or 1, len(jobs))
+    logging.info(f"Analyzing {len(jobs)} data file(s) with {max_workers} worker(s)...")
+    start = time.perf_counter()
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    if max_workers == 1:
+        for name, file_config, output_dir in jobs:
+            outcomes[name] = _run_batch_file(script_path, file_config, output_dir, keep_phases)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_batch_worker,
+            initargs=(options["worker_log_level"],),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _run_batch_file, script_path, file_config, output_dir, keep_phases
+                ): name
+                for name, file_config, output_dir in jobs
+            }
+            for future in concurrent.futures.as_completed(futures):
+                name = futures[future]
+                try:
+                    outcomes[name] = future.result()
+                except Exception as e:
+                    # E.g. a worker process that was killed, or a result that cannot be pickled.
+                    outcomes[name] = {"result": None, "error": f"{type(e).__name__}: {e}",
+                                      "elapsed_s": float("nan")}
+                status = "failed: " + outcomes[name]["error"] if outcomes[name]["error"] else "ok"
+                logging.info(f"[{len(outcomes)}/{len(jobs)}] '{name}' {status}")
+
+    rows: List[Dict[str, Any]] = []
+    for name, _, _ in jobs:
+        rows.extend(_batch_summary_rows(name, outcomes[name]))
+    summary = pd.DataFrame(rows)
+    os.makedirs(output_root, exist_ok=True)
+    summary_path = os.path.join(output_root, "batch_summary.csv")
+    summary.to_csv(summary_path, index=False)
+    failed = sum(1 for outcome in outcomes.values() if outcome["error"])
+    logging.info(
+        f"Batch complete: {len(jobs) - failed} of {len(jobs)} file(s) analyzed in "
+        f"{time.perf_counter() - start:.1f} s. Summary saved to: {os.path.basename(summary_path)}"
+    )
+
+    results = {name: outcomes[name]["result"] for name, _, _ in jobs}
+    bands: Dict[str, pd.DataFrame] = {}
+    if band_plots:
+        bands = generate_band_plots(
+            [result for result in results.values() if result is not None], band_plots, output_root
+        )
+    return {"summary": summary, "results": results, "bands": bands}
@@ -6,6 +6,8 @@ These tests verify the correctness of property calculations based on
 known inputs and expected outputs.
 """
 
+import bz2
+import gzip
 import logging
 import re  # Import the 're' module for regex escaping
 import numpy as np
@@ -14,16 +16,43 @@ import pytest
 import os
 import shutil
 
-from matmech import axial_analysis, torsional_analysis, common_utils, plotting_tools, workflow, config_defaults
+from matmech import (
+    axial_analysis,
+    torsional_analysis,
+    common_utils,
+    plotting_tools,
+    workflow,
+    config_defaults,
+    data_cache,
+    event_detection,
+    batch_analysis,
+    linear_fit,
+    property_extraction,
+    cyclic_analysis,
+    rainflow,
+    signal_processing,
+    resampling,
+    data_quality,
+)
 from matmech.constants import (
     AXIAL_STRAIN_COL,
     AXIAL_STRESS_MPA_COL,
+    BAND_COUNT_COL,
+    BAND_MEAN_COL,
+    BAND_STD_COL,
+    BRANCH_COL,
+    CYCLE_ENERGY_COL,
+    CYCLE_STIFFNESS_COL,
     FORCE_COL,
     POSITION_COL,
     ROTATION_COL,
+    SECANT_MODULUS_COL,
     SHEAR_STRAIN_COL,
     SHEAR_STRESS_MPA_COL,
+    TANGENT_MODULUS_COL,
     TORQUE_COL,
+    TRUE_STRAIN_COL,
+    TRUE_STRESS_COL,
     TIME_COL,
 )
 
@@ -181,6 +210,26 @@ def test_load_csv_data(tmp_path):
         common_utils.load_csv_data(str(tmp_path / "non_existent.csv"))
 
 
+def test_load_csv_data_column_sources(tmp_path):
+    """Test that only profile columns are parsed, with their declared dtypes."""
+    csv_content = "Total Time (s),Unused (V),Force (kN)\n0,9,1.5\n1,9,2.5"
+    file_path = tmp_path / "wide.csv"
+    file_path.write_text(csv_content)
+    sources = {
+        "time": {"raw_col": "Total Time (s)", "raw_units": "s", "dtype": "float64"},
+        "force": {"raw_col": "Force (kN)", "raw_units": "kN"},
+        "torque": {"raw_col": "Torque (N·m)", "raw_units": "N·m"},  # Not in the file
+    }
+
+    df = common_utils.load_csv_data(str(file_path), column_sources=sources)
+    assert df.columns.tolist() == ["Total Time (s)", "Force (kN)"]
+    assert df["Force (kN)"].dtype == np.float64
+
+    df_32 = common_utils.load_csv_data(str(file_path), column_sources=sources, use_float32=True)
+    assert df_32["Force (kN)"].dtype == np.float32
+    assert df_32["Total Time (s)"].dtype == np.float64  # Explicit dtype wins
+
+
 def test_split_data_by_time():
     """Test splitting a DataFrame into segments based on time points."""
     df = pd.DataFrame({
@@ -212,6 +261,241 @@ def test_split_data_by_time():
     pd.testing.assert_frame_equal(segments_outside[0], df.iloc[1:].copy())
 
 
+@pytest.mark.parametrize("engine", common_utils.CSV_ENGINES)
+def test_load_csv_data_engines(engine):
+    """Verify that every CSV engine yields the same pruned, typed data."""
+    file_path = os.path.join(os.path.dirname(__file__), "sample_data", "sample_bluehill.csv")
+    sources = config_defaults.SOFTWARE_PROFILES["bluehill"]["column_sources"]
+    expected = common_utils.load_csv_data(file_path, column_sources=sources)
+    df = common_utils.load_csv_data(file_path, column_sources=sources, engine=engine)
+    pd.testing.assert_frame_equal(df, expected)
+
+
+@pytest.mark.parametrize("engine", common_utils.CSV_ENGINES)
+def test_load_csv_data_after_preamble(tmp_path, engine):
+    """Test that every loader finds the column header below a ragged preamble."""
+    file_path = tmp_path / "preamble.csv"
+    file_path.write_text(
+        "Specimen,A1,Batch 7\n\nTime (s),Displacement (mm),Force (kN)\n0,0,1.0\n1,0.5,2.0\n"
+    )
+    sources = config_defaults.SOFTWARE_PROFILES["bluehill"]["column_sources"]
+    header_line = common_utils.find_header_line(str(file_path), sources)
+    assert header_line == 1  # The blank line is not counted
+
+    df = common_utils.load_csv_data(
+        str(file_path), column_sources=sources, engine=engine, header_line=header_line
+    )
+    assert df["Force (kN)"].tolist() == [1.0, 2.0]
+    chunks = common_utils.iter_csv_chunks(
+        str(file_path), 1, column_sources=sources, header_line=header_line
+    )
+    assert [chunk["Force (kN)"].tolist() for chunk in chunks] == [[1.0], [2.0]]
+    follower = common_utils.follow_csv(
+        str(file_path), column_sources=sources, poll_interval_s=0.01, idle_timeout_s=0.05
+    )
+    assert pd.concat(follower)["Force (kN)"].tolist() == [1.0, 2.0]
+
+
+def test_load_csv_data_unknown_engine(tmp_path):
+    """Test that an unknown CSV engine is rejected."""
+    file_path = tmp_path / "test.csv"
+    file_path.write_text("col1\n1")
+    with pytest.raises(ValueError, match="Unknown CSV engine"):
+        common_utils.load_csv_data(str(file_path), engine="excel")
+
+
+def test_load_compressed_csv_data(tmp_path):
+    """Verify that compressed files are detected and decompressed on the fly."""
+    file_path = os.path.join(os.path.dirname(__file__), "sample_data", "sample_bluehill.csv")
+    sources = config_defaults.SOFTWARE_PROFILES["bluehill"]["column_sources"]
+    expected = common_utils.load_csv_data(file_path, column_sources=sources)
+    with open(file_path, "rb") as f:
+        raw_bytes = f.read()
+
+    gz_path = tmp_path / "sample.csv.gz"
+    gz_path.write_bytes(gzip.compress(raw_bytes))
+    mislabeled_path = tmp_path / "sample.csv"  # bz2 contents behind a plain extension
+    mislabeled_path.write_bytes(bz2.compress(raw_bytes))
+
+    assert common_utils.detect_compression(file_path) is None
+    assert common_utils.detect_compression(str(gz_path)) == "gzip"
+    assert common_utils.detect_compression(str(mislabeled_path)) == "bz2"
+    for path in (gz_path, mislabeled_path):
+        assert common_utils.detect_software_profile(str(path)) == "bluehill"
+        pd.testing.assert_frame_equal(
+            common_utils.load_csv_data(str(path), column_sources=sources), expected
+        )
+        streamed = pd.concat(common_utils.iter_csv_chunks(str(path), 10, column_sources=sources))
+        pd.testing.assert_frame_equal(streamed, expected)
+
+
+def test_detect_software_profile(tmp_path):
+    """Test header-only detection of the software profile."""
+    sample_dir = os.path.join(os.path.dirname(__file__), "sample_data")
+    assert common_utils.detect_software_profile(
+        os.path.join(sample_dir, "sample_bluehill.csv")
+    ) == "bluehill"
+    assert common_utils.detect_software_profile(
+        os.path.join(sample_dir, "sample_wavematrix_torsion.csv")
+    ) == "wavematrix"
+
+    # A short preamble before the column header is tolerated
+    preamble_file = tmp_path / "preamble.csv"
+    preamble_file.write_text("Specimen,A1\nTime (s),Displacement (mm),Force (kN)\n0,0,0\n")
+    assert common_utils.detect_software_profile(str(preamble_file)) == "bluehill"
+
+    unknown_file = tmp_path / "unknown.csv"
+    unknown_file.write_text("a,b\n1,2\n")
+    with pytest.raises(ValueError, match="Could not detect a software profile"):
+        common_utils.detect_software_profile(str(unknown_file))
+
+
+def test_standardize_data():
+    """Verify fused unit conversion, inversion and taring of raw channels."""
+    raw_df = pd.DataFrame({
+        "Time (s)": np.array([0.0, 1.0, 2.0]),
+        "Force (kN)": np.array([0.5, 1.0, 2.0], dtype=np.float32),
+        "Rotation (rad)": np.array([0.0, np.pi / 2, np.pi]),
+    })
+    sources = {
+        "time": {"raw_col": "Time (s)", "raw_units": "s"},
+        "force": {"raw_col": "Force (kN)", "raw_units": "kN"},
+        "rotation": {"raw_col": "Rotation (rad)", "raw_units": "rad"},
+    }
+    raw_copy = raw_df.copy()
+
+    clean_df = common_utils.standardize_data(
+        raw_df, sources, inversion_flags={"force": True}, tare_options={"force": True}
+    )
+
+    assert clean_df.columns.tolist() == [TIME_COL, FORCE_COL, ROTATION_COL]
+    np.testing.assert_allclose(clean_df[FORCE_COL], [0.0, -500.0, -1500.0])
+    np.testing.assert_allclose(clean_df[ROTATION_COL], [0.0, 90.0, 180.0])
+    assert clean_df[FORCE_COL].dtype == np.float32  # Channel dtypes are preserved
+    pd.testing.assert_frame_equal(raw_df, raw_copy)  # The raw data is not modified
+
+
+def test_stream_phase_segments_matches_in_memory_path():
+    """Verify that chunked standardization and segmentation match the in-memory path."""
+    file_path = os.path.join(os.path.dirname(__file__), "sample_data", "sample_bluehill.csv")
+    profile = config_defaults.SOFTWARE_PROFILES["bluehill"]
+    sources = profile["column_sources"]
+    inversion_flags = {"force": True}
+    tare_options = {"position": True, "force": True}
+    split_points = [7.5, 20.0]
+
+    clean_df = common_utils.standardize_data(
+        common_utils.load_csv_data(file_path, column_sources=sources),
+        sources, inversion_flags, tare_options,
+    )
+    expected = common_utils.split_data_by_time(clean_df, split_points, TIME_COL)
+
+    raw_chunks = common_utils.iter_csv_chunks(file_path, 4, column_sources=sources)
+    pieces = [[] for _ in split_points]
+    for phase_index, piece in common_utils.stream_phase_segments(
+        raw_chunks, sources, inversion_flags, tare_options, split_points, TIME_COL
+    ):
+        assert len(piece) <= 4
+        pieces[phase_index].append(piece)
+
+    for phase_pieces, expected_df in zip(pieces, expected):
+        pd.testing.assert_frame_equal(pd.concat(phase_pieces), expected_df)
+    # Taring uses the first sample of the file, not of each chunk
+    assert np.isclose(expected[1][POSITION_COL].iloc[-1], 2.0)
+
+
+def test_follow_csv_yields_only_new_rows(tmp_path):
+    """Test that following a growing file parses each appended row exactly once."""
+    file_path = tmp_path / "live.csv"
+    file_path.write_text("Total Time (s),Unused,Force (kN)\n0,9,1.0\n1,9,2.0\n2,9,3")
+    sources = {"force": {"raw_col": "Force (kN)", "raw_units": "kN"}}
+    follower = common_utils.follow_csv(
+        str(file_path), column_sources=sources, poll_interval_s=0.01, idle_timeout_s=0.2
+    )
+
+    first = next(follower)
+    assert first.columns.tolist() == ["Force (kN)"]
+    assert first["Force (kN)"].tolist() == [1.0, 2.0]  # The unfinished last line is held back
+
+    with open(file_path, "a") as f:
+        f.write(".5\n3,9,4.0\n4,9,5.0")
+    second = next(follower)
+    assert second["Force (kN)"].tolist() == [3.5, 4.0]
+
+    # Once the writer goes idle, the final line without a newline is flushed
+    remaining = list(follower)
+    assert [df["Force (kN)"].tolist() for df in remaining] == [[5.0]]
+
+
+def test_data_cache_round_trip_and_invalidation(tmp_path):
+    """Test storing, memory-mapped loading, eviction and invalidation of cached data."""
+    data_file = tmp_path / "raw.csv"
+    data_file.write_text("t,f\n0,1\n1,2")
+    cache_dir = str(tmp_path / "cache")
+    settings = {"tare_options": {"force": True}}
+    key = data_cache.compute_cache_key(str(data_file), settings)
+
+    assert data_cache.load_cached_data(cache_dir, key) is None
+    df = pd.DataFrame({TIME_COL: [0.0, 1.0], FORCE_COL: [0.0, 1000.0]})
+    data_cache.store_cached_data(cache_dir, key, df, str(data_file))
+    cached = data_cache.load_cached_data(cache_dir, key)
+    pd.testing.assert_frame_equal(cached, df)
+
+    # Any change to the settings or the file contents yields a different key
+    assert data_cache.compute_cache_key(str(data_file), {"tare_options": {"force": False}}) != key
+    data_file.write_text("t,f\n0,1\n1,3")
+    assert data_cache.compute_cache_key(str(data_file), settings) != key
+
+    assert data_cache.evict_cache(cache_dir, max_size_bytes=10**9) == 0
+    assert data_cache.invalidate_cache(cache_dir, str(tmp_path / "other.csv")) == 0
+    assert data_cache.invalidate_cache(cache_dir, str(data_file)) == 1
+    assert data_cache.load_cached_data(cache_dir, key) is None
+
+    data_cache.store_cached_data(cache_dir, key, df, str(data_file))
+    assert data_cache.evict_cache(cache_dir, max_size_bytes=0) == 1
+
+
+def test_split_data_by_time_non_monotonic_fallback():
+    """Test that segmentation of non-monotonic time matches the masked definition."""
+    df = pd.DataFrame({
+        TIME_COL: [0, 2, 1, 3, 5, 4, 6],
+        "value": [10, 12, 11, 13, 15, 14, 16],
+    })
+    segments = common_utils.split_data_by_time(df, [2.5, 5.0], TIME_COL)
+    pd.testing.assert_frame_equal(segments[0], df.iloc[[1, 2]])
+    pd.testing.assert_frame_equal(segments[1], df.iloc[[3, 4, 5]])
+
+
+def test_split_data_by_time_returns_slices():
+    """Verify that monotonic segmentation slices the input instead of copying it."""
+    df = pd.DataFrame({TIME_COL: np.arange(10.0), "value": np.arange(10.0)})
+    segments = common_utils.split_data_by_time(df, [4.0, 4.0, 9.0], TIME_COL)
+    assert [len(segment) for segment in segments] == [4, 0, 5]
+    assert np.shares_memory(segments[2]["value"].to_numpy(), df["value"].to_numpy())
+
+
+def test_detect_phase_boundaries():
+    """Verify phase detection from rate reversals, holds and a failure load drop."""
+    time = np.linspace(0, 40, 4001)
+    # Load to 10 mm over 10 s, hold 10 s, unload over 10 s, reload until failure
+    position = np.interp(time, [0, 10, 20, 30, 40], [0, 10, 10, 0, 10])
+    force = np.where(time < 38, position * 100, 0.0)
+    force[(time > 0.5) & (time < 0.6)] += 5  # A brief glitch must not create a phase
+
+    end_times = event_detection.detect_phase_boundaries(
+        time, position, smoothing_window=5, min_phase_duration_s=1.0
+    )
+    np.testing.assert_allclose(end_times, [10, 20, 30, 40], atol=0.1)
+
+    end_times_failure = event_detection.detect_phase_boundaries(
+        time, position, load=force, smoothing_window=5, min_phase_duration_s=1.0,
+        failure_drop=0.5,
+    )
+    np.testing.assert_allclose(end_times_failure, [10, 20, 30, 38, 40], atol=0.1)
+
+    assert len(event_detection.detect_phase_boundaries(np.array([]), np.array([]))) == 0
+
+
 def test_calculate_linear_fit():
     """Test linear fit calculation with various data, bounds, and unit auto-scaling."""
     df = pd.DataFrame({
@@ -274,6 +558,99 @@ def test_calculate_linear_fit():
     assert fit_results_empty == {}
 
 
+def test_prefix_sum_fit_windows_match_polyfit():
+    """Verify windowed prefix-sum fits against np.polyfit and unit rescaling against a refit."""
+    rng = np.random.default_rng(3)
+    x = rng.uniform(0, 0.05, 2000)  # Unsorted strain values
+    y = 2500 * x + 3 + rng.normal(0, 1, x.size)
+    x[10] = np.nan
+    sums = linear_fit.prepare_fit_sums(x, y)
+    valid = ~np.isnan(x)
+
+    lowers, uppers = np.array([0.0, 0.01, 0.02]), np.array([0.05, 0.03, 0.025])
+    fits = linear_fit.fit_windows(sums, lowers, uppers)
+    for i, (lower, upper) in enumerate(zip(lowers, uppers)):
+        mask = valid & (x >= lower) & (x <= upper)
+        m, b = np.polyfit(x[mask], y[mask], 1)
+        r = np.corrcoef(x[mask], y[mask])[0, 1]
+        assert np.isclose(fits["slope"][i], m)
+        assert np.isclose(fits["intercept"][i], b)
+        assert np.isclose(fits["r_squared"][i], r**2)
+        assert fits["n_points"][i] == mask.sum()
+
+    # A fit rescaled to other units equals a refit on the converted data
+    fit = linear_fit.fit_window(sums, 0.01, 0.03)
+    x_conversion, y_conversion = (100.0, 0.0), (1e-3, 0.5)
+    m_plot, b_plot = linear_fit.rescale_fit(fit["slope"], fit["intercept"], x_conversion, y_conversion)
+    mask = valid & (x >= 0.01) & (x <= 0.03)
+    m_ref, b_ref = np.polyfit(x[mask] * 100.0, y[mask] * 1e-3 + 0.5, 1)
+    assert np.isclose(m_plot, m_ref) and np.isclose(b_plot, b_ref)
+
+    assert linear_fit.fit_window(sums, 1.0, 2.0) is None
+
+
+def test_calculate_linear_fit_auto_bounds():
+    """Verify that automatic fit bounds find the elastic region of a bilinear curve."""
+    rng = np.random.default_rng(4)
+    strain = np.linspace(0, 0.05, 200_001)
+    # 200 GPa up to 0.2% strain (400 MPa), then 2 GPa hardening
+    stress = np.where(strain < 0.002, 200_000 * strain, 400 + 2000 * (strain - 0.002))
+    stress += rng.normal(0, 0.5, strain.size)
+    df = pd.DataFrame({"x_data": strain, "y_data": stress})
+
+    fit_results = plotting_tools.calculate_linear_fit(
+        df, "x_data", "y_data", "MPa", fit_bounds="auto", auto_fit_options={"min_span": 0.001}
+    )
+    lower, upper = fit_results["fit_bounds"]
+    assert 0 <= lower and upper <= 0.002
+    assert upper - lower >= 0.001 - 1e-6
+    assert fit_results["modulus_units"] == "GPa"
+    assert np.isclose(fit_results["modulus_val"], 200, rtol=1e-3)
+    assert fit_results["r_squared"] > 0.999
+
+
+def test_find_linear_region_ignores_fracture_drop():
+    """Verify that the steep load drop after fracture is never taken as the elastic region."""
+    rng = np.random.default_rng(6)
+    strain = np.linspace(0, 0.05, 5001)
+    stress = np.where(strain < 0.002, 200_000 * strain, 400 + 2000 * (strain - 0.002))
+    # 20-sample fracture tail: the load falls from 496 MPa to zero over 0.05% strain
+    strain = np.concatenate([strain, np.linspace(0.05, 0.0505, 21)[1:]])
+    stress = np.concatenate([stress, np.linspace(496, 0, 21)[1:]])
+    stress += rng.normal(0, 0.5, strain.size)
+
+    sums = linear_fit.prepare_fit_sums(strain, stress)
+    lower, upper = linear_fit.resolve_fit_bounds(sums, "auto")
+    assert 0 <= lower and upper <= 0.002
+    assert np.isclose(linear_fit.fit_window(sums, lower, upper)["slope"], 200_000, rtol=1e-2)
+
+    # A curve that only unloads has no loading region
+    falling = linear_fit.prepare_fit_sums(strain[:100], -stress[:100])
+    assert linear_fit.find_linear_region(falling, 0.00001) is None
+
+
+def test_tangent_and_secant_modulus():
+    """Verify rolling-slope tangent modulus against polyfit and the secant modulus definition."""
+    rng = np.random.default_rng(5)
+    n = 5000
+    strain = np.linspace(0, 0.02, n) + rng.normal(0, 1e-7, n)
+    stress = 150_000 * strain - 2_000_000 * strain**2 + rng.normal(0, 0.2, n)
+
+    window = 101
+    slopes = linear_fit.rolling_slope(strain, stress, window)
+    for i in (0, 7, 50, 2500, n - 40, n - 1):
+        lo = min(max(i - window // 2, 0), n - window)
+        expected = np.polyfit(strain[lo:lo + window], stress[lo:lo + window], 1)[0]
+        assert np.isclose(slopes[i], expected, rtol=1e-9)
+    with pytest.raises(ValueError, match="at least 2"):
+        linear_fit.rolling_slope(strain, stress, 1)
+
+    df = pd.DataFrame({FORCE_COL: stress * 100.0, POSITION_COL: strain * 100.0})
+    geometry = {"axial_width_mm": 20.0, "axial_thickness_mm": 5.0, "gauge_length_mm": 100.0}
+    result_df = axial_analysis.calculate_axial_properties(df, geometry, modulus_window=window)
+    np.testing.assert_allclose(result_df[TANGENT_MODULUS_COL], slopes, rtol=1e-6)
+    assert np.isclose(result_df[SECANT_MODULUS_COL].iloc[-1], stress[-1] / strain[-1], rtol=1e-9)
+    assert TANGENT_MODULUS_COL not in axial_analysis.calculate_axial_properties(df, geometry).columns
 
 
 def test_calculate_torsional_properties_rect():
@@ -298,13 +675,12 @@ def test_calculate_torsional_properties_rect():
     assert SHEAR_STRAIN_COL in result_df.columns
     assert np.isclose(result_df[SHEAR_STRAIN_COL].iloc[-1], np.pi / 20)
 
-    # For aspect_ratio = 20/10 = 2
-    # alpha = (1/3) * (1 - 0.630 * (1/2)) = (1/3) * (1 - 0.315) = (1/3) * 0.685 = 0.22833
+    # For aspect_ratio = 20/10 = 2, the exact stress coefficient is alpha = 0.245878
     # denominator = alpha * long_side_m * (short_side_m**2)
-    #             = 0.22833 * 0.020 * (0.010**2) = 0.22833 * 0.020 * 0.0001 = 4.5666e-7
-    # Shear Stress (Pa) @ 20 N.m = 20 / 4.5666e-7 = 43,799,000 Pa = 43.799 MPa
+    #             = 0.24588 * 0.020 * (0.010**2) = 4.9176e-7
+    # Shear Stress (Pa) @ 20 N.m = 20 / 4.9176e-7 = 40,670,000 Pa = 40.67 MPa
     assert SHEAR_STRESS_MPA_COL in result_df.columns
-    expected_alpha = (1 / 3) * (1 - 0.630 * (1 / 2))
+    expected_alpha = 0.245878
     expected_denominator = expected_alpha * 0.020 * (0.010**2)
     expected_shear_stress_pa = 20 / expected_denominator
     expected_shear_stress_mpa = expected_shear_stress_pa / 1e6
@@ -362,11 +738,8 @@ def test_calculate_torsional_properties_rect_square_section():
     }
     result_df = torsional_analysis.calculate_torsional_properties_rect(df, geometry)
 
-    # For aspect_ratio = 10/10 = 1
-    # alpha = (1/3) * (1 - 0.630 * (1/1)) = (1/3) * (1 - 0.630) = (1/3) * 0.37 = 0.12333
-    # Note: The comment in torsional_analysis.py says alpha = 0.1406 for square.
-    # The formula used is an approximation. Let's use the formula's result.
-    expected_alpha = (1 / 3) * (1 - 0.630 * (1 / 1))
+    # For aspect_ratio = 10/10 = 1, the exact stress coefficient is alpha = 0.208165
+    expected_alpha = 0.208165
     expected_denominator = expected_alpha * 0.010 * (0.010**2)
     expected_shear_stress_pa = 20 / expected_denominator
     expected_shear_stress_mpa = expected_shear_stress_pa / 1e6
@@ -404,10 +777,532 @@ def test_calculate_torsional_properties_rect_negative_values():
     }
     result_df = torsional_analysis.calculate_torsional_properties_rect(df, geometry)
 
-    expected_alpha = (1 / 3) * (1 - 0.630 * (1 / 2))
+    expected_alpha = 0.245878
     expected_denominator = expected_alpha * 0.020 * (0.010**2)
     expected_shear_stress_pa = -20 / expected_denominator
     expected_shear_stress_mpa = expected_shear_stress_pa / 1e6
 
     assert np.isclose(result_df[SHEAR_STRAIN_COL].iloc[-1], -np.pi / 20)
     assert np.isclose(result_df[SHEAR_STRESS_MPA_COL].iloc[-1], expected_shear_stress_mpa)
+
+
+def test_rect_torsion_coefficient_table():
+    """Verify the tabulated torsion coefficients against the series and published values."""
+    # Timoshenko & Goodier, Theory of Elasticity, table for a/b = 1, 1.5, 2, 3, 5, 10
+    aspect_ratios = np.array([1.0, 1.5, 2.0, 3.0, 5.0, 10.0])
+    alpha, beta = torsional_analysis.rect_torsion_coefficients(1 / aspect_ratios)
+    np.testing.assert_allclose(alpha, [0.208, 0.231, 0.246, 0.267, 0.291, 0.312], atol=6e-4)
+    np.testing.assert_allclose(beta, [0.141, 0.196, 0.229, 0.263, 0.291, 0.312], atol=6e-4)
+
+    # Interpolation error between the table nodes stays within the stated bound
+    ratios = np.random.default_rng(2).uniform(0, 1, 500)
+    table_alpha, table_beta = torsional_analysis.rect_torsion_coefficients(ratios)
+    series_alpha, series_beta = torsional_analysis.rect_torsion_coefficients_series(ratios)
+    tolerance = torsional_analysis.TORSION_TABLE_MAX_REL_ERROR
+    np.testing.assert_allclose(table_alpha, series_alpha, rtol=tolerance)
+    np.testing.assert_allclose(table_beta, series_beta, rtol=tolerance)
+
+    # Thin-strip limit
+    assert np.allclose(torsional_analysis.rect_torsion_coefficients(0.0), 1 / 3)
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        torsional_analysis.rect_torsion_coefficients(1.5)
+
+
+def test_compute_properties_into_preallocated_arrays():
+    """Verify the array API writes into given buffers and the wrappers do not copy inputs."""
+    df = pd.DataFrame({
+        FORCE_COL: [0.0, 50.0, 100.0],
+        POSITION_COL: [0.0, 0.5, 1.0],
+        ROTATION_COL: [0.0, 45.0, 90.0],
+        TORQUE_COL: [0.0, 10.0, 20.0],
+    })
+    geometry = {
+        "axial_width_mm": 20.0,
+        "axial_thickness_mm": 5.0,
+        "gauge_length_mm": 100.0,
+        "torsional_side1_mm": 20.0,
+        "torsional_side2_mm": 10.0,
+    }
+
+    out = {AXIAL_STRESS_MPA_COL: np.zeros(3), AXIAL_STRAIN_COL: np.zeros(3)}
+    derived = axial_analysis.compute_axial_properties(df, geometry, out=out)
+    assert derived[AXIAL_STRESS_MPA_COL] is out[AXIAL_STRESS_MPA_COL]
+    assert derived[AXIAL_STRAIN_COL] is out[AXIAL_STRAIN_COL]
+    np.testing.assert_allclose(out[AXIAL_STRESS_MPA_COL], [0.0, 0.5, 1.0])
+    np.testing.assert_allclose(out[AXIAL_STRAIN_COL], [0.0, 0.005, 0.01])
+
+    with pytest.raises(ValueError, match="expected"):
+        axial_analysis.compute_axial_properties(
+            df, geometry, out={AXIAL_STRAIN_COL: np.zeros(2)}
+        )
+
+    result_df = torsional_analysis.calculate_torsional_properties_rect(df, geometry)
+    assert "Rotation (rad)" not in result_df.columns
+    assert np.shares_memory(result_df[TORQUE_COL].to_numpy(), df[TORQUE_COL].to_numpy())
+    assert list(df.columns) == [FORCE_COL, POSITION_COL, ROTATION_COL, TORQUE_COL]
+
+
+def test_analyze_batch_matches_single_specimen_analysis():
+    """Verify batched analysis of specimens with different lengths and geometries."""
+    rng = np.random.default_rng(1)
+    frames = [
+        pd.DataFrame({
+            FORCE_COL: rng.normal(100, 10, n),
+            POSITION_COL: rng.normal(1, 0.1, n),
+            ROTATION_COL: rng.normal(45, 5, n),
+            TORQUE_COL: rng.normal(10, 1, n),
+        })
+        for n in (50, 80, 65)
+    ]
+    geometries = [
+        {"axial_width_mm": 20.0, "axial_thickness_mm": 5.0, "gauge_length_mm": 100.0,
+         "torsional_side1_mm": 20.0, "torsional_side2_mm": 10.0},
+        {"axial_width_mm": 10.0, "axial_thickness_mm": 4.0, "gauge_length_mm": 50.0,
+         "torsional_side1_mm": 8.0, "torsional_side2_mm": 12.0},
+        {"axial_width_mm": 0.0, "axial_thickness_mm": 5.0, "gauge_length_mm": 80.0,
+         "torsional_side1_mm": 10.0, "torsional_side2_mm": 10.0},
+    ]
+
+    for analysis_type, single in (
+        ("AXIAL", axial_analysis.calculate_axial_properties),
+        ("TORSIONAL", torsional_analysis.calculate_torsional_properties_rect),
+    ):
+        batch_results = batch_analysis.analyze_batch(frames, geometries, analysis_type)
+        for frame, geometry, result_df in zip(frames, geometries, batch_results):
+            expected_df = single(frame, geometry)
+            assert sorted(result_df.columns) == sorted(expected_df.columns)
+            pd.testing.assert_frame_equal(result_df[expected_df.columns], expected_df)
+
+    # The zero-area specimen gets strain but no stress
+    assert AXIAL_STRESS_MPA_COL not in batch_analysis.analyze_batch(frames, geometries, "AXIAL")[2]
+
+    # An extensometer-only specimen (no displacement) in a lot with displacement
+    extensometer_df = pd.DataFrame({
+        FORCE_COL: rng.normal(100, 10, 70), AXIAL_STRAIN_COL: rng.normal(0.01, 0.001, 70)
+    })
+    mixed = [frames[0], extensometer_df]
+    for lot in (mixed, mixed[1:]):
+        batch_results = batch_analysis.analyze_batch(lot, geometries[: len(lot)], "AXIAL")
+        for frame, geometry, result_df in zip(lot, geometries, batch_results):
+            expected_df = axial_analysis.calculate_axial_properties(frame, geometry)
+            assert sorted(result_df.columns) == sorted(expected_df.columns)
+            pd.testing.assert_frame_equal(result_df[expected_df.columns], expected_df)
+
+    with pytest.raises(ValueError, match="geometry"):
+        batch_analysis.analyze_batch(frames, geometries[:2], "AXIAL")
+
+
+def test_extract_curve_properties_bilinear():
+    """Verify offset yield, ultimate strength and energies on a bilinear curve with a known solution."""
+    strain = np.linspace(0, 0.05, 50_001)
+    # 200 GPa up to 400 MPa at 0.2% strain, then 2 GPa hardening
+    stress = np.where(strain < 0.002, 200_000 * strain, 400 + 2000 * (strain - 0.002))
+
+    props = property_extraction.extract_curve_properties(
+        strain, stress, fit_bounds="auto", auto_fit_options={"min_span": 0.001}
+    )
+    assert np.isclose(props["modulus_mpa"], 200_000, rtol=1e-6)
+    # Offset line 200000 * (e - 0.002) meets the hardening line at e = 796 / 198000
+    assert np.isclose(props["yield_strain"], 796 / 198_000, rtol=1e-4)
+    assert np.isclose(props["yield_strength_mpa"], 400 + 2000 * (796 / 198_000 - 0.002), rtol=1e-4)
+    assert np.isclose(props["ultimate_strength_mpa"], 496)
+    assert np.isclose(props["strain_at_break"], 0.05)
+    # Elastic triangle plus plastic trapezoid
+    assert np.isclose(props["toughness_mj_m3"], 0.4 + 0.5 * (400 + 496) * 0.048, rtol=1e-6)
+    assert 0.4 < props["resilience_mj_m3"] < props["toughness_mj_m3"]
+
+    table = property_extraction.extract_properties_table(
+        {"Pull": pd.DataFrame({AXIAL_STRAIN_COL: strain, AXIAL_STRESS_MPA_COL: stress}),
+         "Hold": pd.DataFrame({TIME_COL: [0.0, 1.0]})},
+        [{"name": "Pull", "type": "AXIAL"}, {"name": "Hold", "type": "HOLD"}],
+    )
+    assert table["phase"].tolist() == ["Pull"]
+    assert np.isclose(table["ultimate_strength_mpa"].iloc[0], 496)
+
+
+def test_extract_curve_properties_with_fracture_tail():
+    """Verify that the load drop after fracture does not affect the modulus and offset yield."""
+    strain = np.linspace(0, 0.05, 5001)
+    stress = np.where(strain < 0.002, 200_000 * strain, 400 + 2000 * (strain - 0.002))
+    strain = np.concatenate([strain, np.linspace(0.05, 0.0505, 21)[1:]])
+    stress = np.concatenate([stress, np.linspace(496, 0, 21)[1:]])
+
+    props = property_extraction.extract_curve_properties(strain, stress)
+    assert np.isclose(props["modulus_mpa"], 200_000, rtol=1e-6)
+    assert props["fit_upper"] <= 0.002
+    assert np.isclose(props["yield_strain"], 796 / 198_000, rtol=1e-3)
+    assert np.isclose(props["yield_strength_mpa"], 400 + 2000 * (796 / 198_000 - 0.002), rtol=1e-3)
+    assert np.isclose(props["strain_at_break"], 0.0505)
+
+    # A fit over the unloading part only has a negative slope and is rejected
+    props = property_extraction.extract_curve_properties(strain, stress, fit_bounds=(0.0501, 0.0505))
+    assert np.isnan(props["modulus_mpa"]) and np.isnan(props["yield_strength_mpa"])
+
+
+def test_find_turning_points_ignores_reversals_below_hysteresis():
+    """Verify that small wiggles are removed while the real reversals are kept."""
+    values = np.array([0.0, 1.0, 0.9, 2.0, 2.0, 0.0, 0.05, -0.02, 2.0, 1.0])
+    assert cyclic_analysis.find_turning_points(values, 0.5).tolist() == [0, 3, 7, 8, 9]
+    assert cyclic_analysis.find_cycle_boundaries(values, 0.5).tolist() == [0, 7, 9]
+
+
+def test_calculate_cycle_properties_loop_metrics():
+    """Verify per-cycle force extremes, stiffness and loop area on a noisy elliptical loop."""
+    t = np.linspace(0, 20, 20_001)
+    noise = np.random.default_rng(0).normal(0, 0.002, len(t))
+    position = 0.5 - 0.5 * np.cos(2 * np.pi * t) + noise
+    # A load lagging behind the displacement encloses an ellipse of area pi * 50 * 0.5
+    force = 1000 * position + 50 * np.sin(2 * np.pi * t)
+    df = pd.DataFrame({TIME_COL: t, POSITION_COL: position, FORCE_COL: force})
+
+    table = cyclic_analysis.calculate_cycle_properties(df, {}, hysteresis=0.2)
+    assert table["Cycle"].tolist() == list(range(1, 21))
+    assert np.allclose(table[CYCLE_ENERGY_COL], np.pi * 50 * 0.5, rtol=0.02)
+    assert np.allclose(table[CYCLE_STIFFNESS_COL], 1000, rtol=0.05)
+
+    assert workflow.ANALYSIS_REGISTRY["CYCLIC"] is cyclic_analysis.calculate_cycle_properties
+
+
+def test_rainflow_count_cycles_matches_astm_example_and_stack_kernel():
+    """Verify the ASTM E1049 example and agreement of the vectorized passes with the sequential kernel."""
+    ranges, means, counts = rainflow.count_cycles(np.array([-2, 1, -3, 5, -1, 3, -4, 4, -2.0]))
+    counted = sorted(zip(ranges.tolist(), counts.tolist()))
+    assert counted == [(3, 0.5), (4, 0.5), (4, 1.0), (6, 0.5), (8, 0.5), (8, 0.5), (9, 0.5)]
+
+    signal = np.random.default_rng(0).normal(size=20_000).cumsum()
+    reversals = signal[cyclic_analysis.find_turning_points(signal)]
+    ranges, means, counts = rainflow.count_cycles(reversals)
+    first, second, residue = rainflow._four_point_stack(reversals)
+    assert np.allclose(np.sort(ranges[counts == 1]), np.sort(np.abs(reversals[second] - reversals[first])))
+    assert np.allclose(ranges[counts == 0.5], np.abs(np.diff(reversals[residue])))
+
+    histogram = rainflow.rainflow_histogram(ranges, means, counts, range_bins=8, mean_bins=4)
+    assert np.isclose(histogram["Cycles"].sum(), counts.sum())
+
+
+def test_true_stress_strain_stops_at_considere_necking():
+    """Verify the true curve conversion and that it ends where dσ/dε = σ (ε_t = n for a power law)."""
+    true_strain = np.linspace(1e-4, 0.4, 4000)
+    true_stress = np.minimum(200_000 * true_strain, 800 * true_strain**0.2)
+    strain = np.expm1(true_strain)
+    # A 10 mm x 2 mm section turns N into MPa by dividing by 20
+    df = pd.DataFrame({AXIAL_STRAIN_COL: strain, FORCE_COL: 20 * true_stress / (1 + strain)})
+
+    result = axial_analysis.calculate_axial_properties(
+        df, {"axial_width_mm": 10, "axial_thickness_mm": 2}, true_stress_strain=True
+    )
+    converted = result[TRUE_STRAIN_COL].notna().to_numpy()
+    assert np.allclose(result.loc[converted, TRUE_STRAIN_COL], true_strain[converted])
+    assert np.allclose(result.loc[converted, TRUE_STRESS_COL], true_stress[converted])
+    assert np.isclose(result[TRUE_STRAIN_COL].max(), 0.2, atol=1e-3)
+    assert not converted[-1]
+
+
+def test_necking_onset_with_noise_at_high_sample_count():
+    """Verify that measurement noise on 10^5 samples does not move the necking onset early."""
+    rng = np.random.default_rng(7)
+    true_strain = np.linspace(1e-4, 0.4, 100_000)
+    true_stress = np.minimum(200_000 * true_strain, 800 * true_strain**0.2)
+    strain = np.expm1(true_strain)
+    for noise in (0.2, 1.0, 5.0):
+        stress = true_stress / (1 + strain) + rng.normal(0, noise, strain.size)
+        onset = axial_analysis.find_necking_onset(np.log1p(strain), stress, 25)
+        assert np.isclose(true_strain[onset], 0.2, atol=0.005)
+
+    # A curve that still hardens at its end has not necked
+    hardening = 800 * true_strain**0.2
+    assert axial_analysis.find_necking_onset(true_strain, hardening, 25) is None
+
+
+def test_channel_preprocessor_chunked_matches_whole():
+    """Verify that filtering and decimating in chunks gives the same rows as the whole array."""
+    t = np.arange(5_003) / 1000.0
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        TIME_COL: t,
+        FORCE_COL: np.sin(2 * np.pi * 5 * t) + rng.normal(0, 0.1, len(t)),
+        POSITION_COL: t + rng.normal(0, 0.01, len(t)),
+    })
+    filter_options = {
+        "force": {"method": "savgol", "window": 31, "polyorder": 3},
+        "position": {"method": "moving_average", "window": 20},
+    }
+    whole = signal_processing.preprocess_data(df, filter_options, decimate_to_hz=100)
+    assert len(whole) == 501 and np.allclose(whole[TIME_COL], t[::10])
+
+    preprocessor = signal_processing.ChannelPreprocessor(filter_options, decimate_to_hz=100)
+    chunked = pd.concat(
+        [preprocessor.process(df.iloc[i : i + 333]) for i in range(0, len(df), 333)]
+        + [preprocessor.flush()]
+    )
+    pd.testing.assert_frame_equal(chunked, whole, rtol=1e-9)
+
+    # A NaN sample is left out of the moving averages around it instead of
+    # spreading to every later sample, in memory and in chunks alike
+    df.loc[1_234, POSITION_COL] = np.nan
+    whole = signal_processing.preprocess_data(df, {"position": filter_options["position"]})
+    assert whole[POSITION_COL].notna().all()
+    preprocessor = signal_processing.ChannelPreprocessor({"position": filter_options["position"]})
+    chunked = pd.concat(
+        [preprocessor.process(df.iloc[i : i + 333]) for i in range(0, len(df), 333)]
+        + [preprocessor.flush()]
+    )
+    pd.testing.assert_frame_equal(chunked, whole, rtol=1e-9)
+
+    # A Savitzky-Golay filter reproduces polynomials up to its order, edges included
+    cubic = np.arange(100.0) ** 3
+    np.testing.assert_allclose(signal_processing.savitzky_golay(cubic, 11, 3), cubic, atol=1e-6)
+
+
+def test_resampling_time_grid_and_monotonic_branches():
+    """Verify chunked time-grid resampling and resampling of a load-unload curve onto a strain grid."""
+    t = np.cumsum(np.random.default_rng(1).uniform(0.5e-3, 1.5e-3, 4_000))
+    df = pd.DataFrame({TIME_COL: t, FORCE_COL: 3.0 * t + 1.0})
+    whole = resampling.resample_uniform_time(df, 500)
+    assert np.allclose(np.diff(whole[TIME_COL]), 2e-3)
+    np.testing.assert_allclose(whole[FORCE_COL], 3.0 * whole[TIME_COL] + 1.0)
+
+    resampler = resampling.TimeGridResampler(500)
+    chunked = pd.concat(
+        [resampler.process(df.iloc[i : i + 97]) for i in range(0, len(df), 97)] + [resampler.flush()]
+    )
+    pd.testing.assert_frame_equal(chunked, whole)
+
+    # Loading to 2 % strain, unloading to 0.5 %, reloading to 3 %, with small noise reversals
+    strain = np.concatenate((np.linspace(0, 0.02, 201), np.linspace(0.02, 0.005, 151)[1:],
+                             np.linspace(0.005, 0.03, 251)[1:]))
+    strain = strain + 1e-5 * (np.arange(len(strain)) % 2)
+    curve = pd.DataFrame({AXIAL_STRAIN_COL: strain, AXIAL_STRESS_MPA_COL: 1000.0 * strain})
+    grid = resampling.uniform_grid(0.0, 0.03, 0.001)
+    branches = resampling.resample_on_grid(curve, AXIAL_STRAIN_COL, grid, hysteresis=1e-3)
+
+    sizes = branches.groupby(BRANCH_COL).size()
+    assert sizes.tolist() == [21, 16, 26]
+    unloading = branches[branches[BRANCH_COL] == 1][AXIAL_STRAIN_COL].to_numpy()
+    assert np.all(np.diff(unloading) < 0)
+    np.testing.assert_allclose(branches[AXIAL_STRESS_MPA_COL], 1000.0 * branches[AXIAL_STRAIN_COL], atol=0.02)
+
+
+def test_quality_checker_repairs_spikes_and_dropouts_in_chunks():
+    """Verify that spikes and dropouts are flagged, repaired, and handled the same in chunks."""
+    rng = np.random.default_rng(3)
+    t = np.arange(20_000) / 1000.0
+    force = 100.0 * np.sin(2 * np.pi * t) + rng.normal(0, 1.0, len(t))
+    spikes = rng.choice(np.arange(100, len(t) - 100), 40, replace=False)
+    clean = force.copy()
+    force[spikes] += rng.choice([-1, 1], 40) * rng.uniform(20, 200, 40)
+    force[5_000:5_030] = np.nan
+    force[-5:] = np.inf
+    position = 2.0 * t + rng.normal(0, 0.001, len(t))  # Trend-dominated: no false spikes
+    df = pd.DataFrame({TIME_COL: t, FORCE_COL: force, POSITION_COL: position})
+
+    repaired, summary = data_quality.check_data_quality(df)
+    counts = summary.set_index("Channel")
+    assert counts.loc[FORCE_COL, "Spikes"] == 40 and counts.loc[FORCE_COL, "Dropouts"] == 35
+    assert counts.loc[POSITION_COL, "Spikes"] == 0
+    # The interior gap is interpolated; the gap at the end is left as NaN
+    assert np.isfinite(repaired[FORCE_COL].to_numpy()[:-5]).all()
+    assert repaired[FORCE_COL].iloc[-5:].isna().all()
+    assert np.abs(repaired[FORCE_COL].to_numpy()[spikes] - clean[spikes]).max() < 10.0
+
+    checker = data_quality.QualityChecker()
+    chunked = pd.concat(
+        [checker.process(df.iloc[i : i + 333]) for i in range(0, len(df), 333)] + [checker.flush()]
+    )
+    pd.testing.assert_frame_equal(chunked, repaired)
+    pd.testing.assert_frame_equal(checker.summary(), summary)
+
+
+def test_quality_checker_streams_past_channel_that_stays_nan():
+    """Verify that long and trailing gaps stay NaN and do not hold rows back in chunks."""
+    rng = np.random.default_rng(4)
+    t = np.arange(30_000) / 1000.0
+    force = 50.0 * np.sin(2 * np.pi * t) + rng.normal(0, 0.5, len(t))
+    strain = 0.001 * t + rng.normal(0, 1e-6, len(t))
+    strain[8_000:8_200] = np.nan  # Longer than max_gap: not bridged
+    strain[8_500:8_510] = np.nan  # Short interior gap: interpolated
+    strain[12_000:] = np.nan  # Extensometer removed
+    df = pd.DataFrame({TIME_COL: t, FORCE_COL: force, AXIAL_STRAIN_COL: strain})
+
+    repaired, summary = data_quality.check_data_quality(df, max_gap=50)
+    assert repaired[AXIAL_STRAIN_COL].iloc[8_000:8_200].isna().all()
+    assert repaired[AXIAL_STRAIN_COL].iloc[8_500:8_510].notna().all()
+    assert repaired[AXIAL_STRAIN_COL].iloc[12_000:].isna().all()
+    assert summary.set_index("Channel").loc[AXIAL_STRAIN_COL, "Dropouts"] == 18_210
+
+    checker = data_quality.QualityChecker(max_gap=50)
+    pieces = []
+    for i in range(0, len(df), 1000):
+        pieces.append(checker.process(df.iloc[i : i + 1000]))
+        # Rows keep flowing: only a bounded number is held back
+        assert checker._tail is not None and len(checker._tail) < 1000 + 2 * checker.radius + 60
+    chunked = pd.concat(pieces + [checker.flush()])
+    pd.testing.assert_frame_equal(chunked, repaired)
+
+
+def test_aggregate_curves_mean_and_bands(tmp_path):
+    """Verify batch mean curves and bands on a shared strain grid, and the band plot output."""
+    rng = np.random.default_rng(7)
+    results = []
+    moduli = 1000.0 + 100.0 * rng.standard_normal(12)
+    for modulus in moduli:
+        # Loading to a specimen-specific strain, then unloading (a second branch)
+        strain = np.concatenate((np.linspace(0, 0.02 + 0.01 * rng.random(), 300), np.linspace(0.02, 0.01, 50)))
+        results.append({"phases": {"Load": pd.DataFrame({
+            AXIAL_STRAIN_COL: strain, AXIAL_STRESS_MPA_COL: modulus * strain,
+        })}})
+    results.append({"phases": {}})  # A specimen without the phase is skipped
+
+    band = batch_analysis.aggregate_phase_results(
+        results, "Load", grid=np.linspace(0, 0.03, 31), percentiles=(10.0, 90.0)
+    )
+    at_1pct = band.iloc[10]
+    assert at_1pct[BAND_COUNT_COL] == 12
+    assert np.isclose(at_1pct[BAND_MEAN_COL], moduli.mean() * 0.01)
+    assert np.isclose(at_1pct[BAND_STD_COL], moduli.std(ddof=1) * 0.01)
+    assert np.isclose(at_1pct["P90"], np.percentile(moduli, 90) * 0.01)
+    assert band[BAND_COUNT_COL].iloc[-1] < 2 and np.isnan(band[BAND_MEAN_COL].iloc[-1])
+
+    bands = workflow.generate_band_plots(results, ["stress_strain_band"], str(tmp_path))
+    assert list(bands) == ["Load_axial_stress_strain_band"]
+    assert (tmp_path / "Load_axial_stress_strain_band.png").exists()
+    assert (tmp_path / "Load_axial_stress_strain_band.csv").exists()
+
+
+def test_streamed_workflow_analyzes_each_phase_once_it_ends(tmp_path, monkeypatch):
+    """Test that a streamed run analyzes a phase before the file is read to the end."""
+    sample = os.path.join(os.path.dirname(__file__), "sample_data", "sample_bluehill.csv")
+    (tmp_path / "data").mkdir()
+    shutil.copy(sample, tmp_path / "data" / "sample.csv")
+    config = {
+        "software_type": "bluehill",
+        "data_file_name": "sample.csv",
+        "geometry": {"axial_width_mm": 10, "axial_thickness_mm": 2, "gauge_length_mm": 25},
+        "tare_options": {"position": True, "force": True},
+        "inversion_flags": {"force": True},
+        "test_recipe": [
+            {"name": "Load", "end_time": 20, "type": "AXIAL"},
+            {"name": "Unload", "end_time": 25, "type": "AXIAL"},
+        ],
+        "quality_options": {"enabled": False},  # Its hold-back spans this short file
+        "plots": [],
+    }
+    expected = workflow.run_analysis_workflow(str(tmp_path), config)
+
+    chunks_read = []
+    iter_csv_chunks = common_utils.iter_csv_chunks
+
+    def counting_chunks(*args, **kwargs):
+        for chunk in iter_csv_chunks(*args, **kwargs):
+            chunks_read.append(len(chunk))
+            yield chunk
+
+    analyzed_after = {}
+    analyze_phase = workflow._analyze_phase
+
+    def recording_analyze(phase_number, phase, segment_df, geometry):
+        analyzed_after[phase["name"]] = len(chunks_read)
+        return analyze_phase(phase_number, phase, segment_df, geometry)
+
+    monkeypatch.setattr(common_utils, "iter_csv_chunks", counting_chunks)
+    monkeypatch.setattr(workflow, "_analyze_phase", recording_analyze)
+    streamed = workflow.run_analysis_workflow(str(tmp_path), {**config, "stream_chunksize": 3})
+    assert analyzed_after["Load"] < len(chunks_read)
+    for name, df in expected["phases"].items():
+        pd.testing.assert_frame_equal(
+            streamed["phases"][name].reset_index(drop=True), df.reset_index(drop=True)
+        )
+    pd.testing.assert_frame_equal(streamed["properties"], expected["properties"])
+
+
+def test_follow_analysis_workflow_saves_tables_and_properties(tmp_path):
+    """Test that follow mode writes the same phase tables and properties as a full run."""
+    t = np.arange(0, 30, 0.01)
+    displacement = np.sin(2 * np.pi * t / 10)
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    pd.DataFrame({
+        "Time (s)": t, "Displacement (mm)": displacement, "Force (kN)": 2 * displacement
+    }).to_csv(data_dir / "cycles.csv", index=False)
+    config = {
+        "software_type": "bluehill",
+        "data_file_name": "cycles.csv",
+        "geometry": {"axial_width_mm": 10, "axial_thickness_mm": 2, "gauge_length_mm": 25},
+        "test_recipe": [
+            {"name": "Ramp", "end_time": 2.5, "type": "AXIAL"},
+            {"name": "Cycles", "end_time": 30, "type": "CYCLIC"},
+        ],
+        "plots": [],
+        "follow": {"poll_interval_s": 0.01, "idle_timeout_s": 0.05},
+    }
+
+    workflow.follow_analysis_workflow(str(tmp_path), config)
+    graphs_dir = tmp_path / "graphs"
+    cycles = pd.read_csv(graphs_dir / f"Cycles_{workflow.TABLE_OUTPUT_SUFFIXES['CYCLIC']}.csv")
+    assert len(cycles) >= 2
+    properties = pd.read_csv(graphs_dir / "mechanical_properties.csv")
+    assert properties["phase"].tolist() == ["Ramp"]
+
+
+def test_follow_analysis_workflow_plots_phase_in_progress(tmp_path, monkeypatch):
+    """Test that each plot update includes the rows of the phase still in progress."""
+    t = np.arange(1, 1001) * 0.01
+    raw_df = pd.DataFrame({"Time (s)": t, "Displacement (mm)": t, "Force (kN)": 2 * t})
+    (tmp_path / "data").mkdir()
+    monkeypatch.setattr(
+        common_utils, "follow_csv", lambda *args, **kwargs: iter([raw_df[:400], raw_df[400:]])
+    )
+    plotted = []
+    monkeypatch.setattr(
+        workflow,
+        "_generate_plots",
+        lambda configs, store, all_names, output_dir, phase_names=None, plot_types_filter=None:
+            plotted.append({name: len(store[name]) for name in phase_names or []}),
+    )
+    config = {
+        "software_type": "bluehill",
+        "data_file_name": "live.csv",
+        "geometry": {"axial_width_mm": 10, "axial_thickness_mm": 2, "gauge_length_mm": 25},
+        "test_recipe": [{"name": "Load", "end_time": 10, "type": "AXIAL"}],
+        "quality_options": {"enabled": False},
+        "plots": ["stress_strain_static"],
+        "follow": {"plot_interval_s": 0.0},
+    }
+
+    workflow.follow_analysis_workflow(str(tmp_path), config)
+    assert plotted[:2] == [{"Load": 400}, {"Load": 1000}]
+
+
+def test_run_batch_workflow_summary_and_failures(tmp_path):
+    """Test that a batch analyzes every file in worker processes and records failures."""
+    sample = os.path.join(os.path.dirname(__file__), "sample_data", "sample_bluehill.csv")
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    shutil.copy(sample, data_dir / "A1.csv")
+    shutil.copy(sample, data_dir / "A2.csv")
+    (data_dir / "broken.csv").write_text("a,b\n1,2\n")
+    config = {
+        "software_type": "auto",
+        "geometry": {"axial_width_mm": 10, "axial_thickness_mm": 2, "gauge_length_mm": 25},
+        "tare_options": {"position": True, "force": True},
+        "inversion_flags": {"force": True},
+        "test_recipe": [{"name": "Load", "end_time": 20, "type": "AXIAL"}],
+        "plots": [],
+        "batch": {
+            "max_workers": 2,
+            "file_overrides": {"A2*": {"geometry": {"axial_width_mm": 20}}},
+        },
+    }
+
+    batch = workflow.run_batch_workflow(str(tmp_path), config)
+    summary = batch["summary"].set_index("file")
+    assert summary.loc["broken", "status"] == "failed"
+    assert "software profile" in summary.loc["broken", "error"]
+    assert list(summary.loc[["A1", "A2"], "status"]) == ["ok", "ok"]
+    assert summary.loc["A1", "modulus_mpa"] > 0
+    # Doubling the width halves the stress, and with it the modulus
+    assert summary.loc["A2", "modulus_mpa"] == pytest.approx(summary.loc["A1", "modulus_mpa"] / 2)
+    assert batch["results"]["broken"] is None
+    assert batch["results"]["A1"]["phases"] == {}  # Not copied back unless requested
+    assert (tmp_path / "graphs" / "A1" / "mechanical_properties.csv").exists()
+    assert (tmp_path / "graphs" / "batch_summary.csv").exists()